@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import Branch, BranchAdmin
+from .models import Branch, BranchAdmin, BranchClosure
 
 
 @admin.register(Branch)
@@ -25,6 +25,25 @@ class BranchModelAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(BranchClosure)
+class BranchClosureAdmin(admin.ModelAdmin):
+    list_display = ['date', 'branch', 'start_time', 'end_time', 'reason']
+    list_filter = ['branch', 'date']
+    search_fields = ['reason']
+    ordering = ['-date', 'start_time']
+    readonly_fields = ['created_at', 'updated_at']
+    
+    fieldsets = (
+        ('휴무', {
+            'fields': ('branch', 'date', 'start_time', 'end_time', 'reason')
+        }),
+        ('시간 정보', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+
 @admin.register(BranchAdmin)
 class BranchAdminUserAdmin(UserAdmin):
     list_display = ['username', 'email', 'admin_type', 'branch', 'is_active', 'date_joined']
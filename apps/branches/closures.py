@@ -0,0 +1,197 @@
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, time
+from time import monotonic, time_ns
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from .models import BranchClosure
+
+
+logger = logging.getLogger(__name__)
+
+# 자정 기준 분 단위 휴무 구간 [start, end)
+ClosureInterval = Tuple[int, int]
+
+MINUTES_PER_DAY = 24 * 60
+FULL_DAY: ClosureInterval = (0, MINUTES_PER_DAY)
+
+# 공유 캐시를 쓸 수 없을 때 다른 프로세스에서 변경된 휴무를 반영하기까지의 최대 지연 (초)
+CLOSURE_CACHE_TTL = 60
+# 공유 캐시의 휴무 버전을 확인하는 간격 (초)
+CLOSURE_VERSION_CHECK_SECONDS = 1
+CLOSURE_VERSION_KEY = 'branch_closures:version'
+
+
+def closure_interval(start_time: Optional[time], end_time: Optional[time]) -> ClosureInterval:
+    """휴무 시간을 분 단위 구간으로 변환 (시간이 없으면 종일, 00:00 종료는 24:00)"""
+    if start_time is None or end_time is None:
+        return FULL_DAY
+    start = start_time.hour * 60 + start_time.minute
+    end = end_time.hour * 60 + end_time.minute or MINUTES_PER_DAY
+    return (start, end)
+
+
+class ClosureIndex:
+    """휴무 행으로 만든 날짜 -> 지점 -> 휴무 구간 사전 (날짜별 조회 O(1))"""
+
+    def __init__(self, rows: Iterable[Tuple[Optional[int], date, Optional[time], Optional[time]]]):
+        days = defaultdict(lambda: defaultdict(list))
+        branch_dates = defaultdict(set)
+        for branch_id, day, start_time, end_time in rows:
+            days[day][branch_id].append(closure_interval(start_time, end_time))
+            branch_dates[branch_id].add(day)
+
+        # 조회 중 키가 생기지 않도록 일반 사전으로 고정
+        self.days: Dict[date, Dict[Optional[int], List[ClosureInterval]]] = {
+            day: dict(branches) for day, branches in days.items()
+        }
+        self.branch_dates: Dict[Optional[int], Set[date]] = dict(branch_dates)
+
+    def intervals(self, branch_id: Optional[int], day: date) -> List[ClosureInterval]:
+        """지점의 날짜별 휴무 구간 (전 지점 휴무 포함, 휴무가 없으면 빈 목록)"""
+        branches = self.days.get(day)
+        if not branches:
+            return []
+        intervals = branches.get(None, [])
+        if branch_id is not None and branch_id in branches:
+            intervals = intervals + branches[branch_id]
+        return intervals
+
+    def is_closed(
+        self,
+        branch_id: Optional[int],
+        day: date,
+        start_time: Optional[time] = None,
+        end_time: Optional[time] = None
+    ) -> bool:
+        """휴무 여부 (시간이 주어지면 해당 시간대와 겹치는 휴무가 있는지 확인)"""
+        intervals = self.intervals(branch_id, day)
+        if not intervals:
+            return False
+        if start_time is None or end_time is None:
+            return True
+        start, end = closure_interval(start_time, end_time)
+        return any(closed_start < end and start < closed_end for closed_start, closed_end in intervals)
+
+    def dates(self, branch_id: Optional[int]) -> Set[date]:
+        """지점에 휴무가 있는 날짜 (전 지점 휴무 포함)"""
+        dates = set(self.branch_dates.get(None, ()))
+        if branch_id is not None:
+            dates |= self.branch_dates.get(branch_id, set())
+        return dates
+
+
+class BranchClosureCalendar:
+    """지점 휴무 캘린더 (프로세스 내 캐시)
+
+    휴무 전체를 한 번에 읽어 ClosureIndex 로 보관하므로 날짜별 조회는 데이터베이스 조회 없이 O(1)로 끝난다.
+    휴무가 변경되면 같은 프로세스의 캐시는 즉시(커밋 시 한 번 더) 비우고, 커밋 후 공유 캐시의 휴무 버전을 올린다.
+    다른 프로세스는 CLOSURE_VERSION_CHECK_SECONDS 마다 버전을 확인해 바뀌었으면 다시 읽고,
+    공유 캐시를 쓸 수 없으면 CLOSURE_CACHE_TTL 이 지나면 다시 읽는다.
+    예약 생성/점유 행 저장처럼 잘못된 값이 남는 경로는 트레이너-날짜 잠금 안에서 snapshot() 으로
+    필요한 날짜의 휴무만 원본에서 읽는다.
+    """
+
+    def __init__(self, ttl: int = CLOSURE_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._index: Optional[ClosureIndex] = None
+        self._loaded_at = 0.0
+        self._version = None
+        self._checked_at = 0.0
+
+    def _shared_version(self):
+        """공유 캐시의 휴무 버전 (캐시를 쓸 수 없으면 None)"""
+        try:
+            return cache.get(CLOSURE_VERSION_KEY)
+        except Exception:
+            logger.warning("휴무 캘린더 버전 조회 실패", exc_info=True)
+            return None
+
+    def _is_current(self) -> bool:
+        if self._index is None or monotonic() - self._loaded_at >= self.ttl:
+            return False
+        if monotonic() - self._checked_at < CLOSURE_VERSION_CHECK_SECONDS:
+            return True
+        version = self._shared_version()
+        self._checked_at = monotonic()
+        return version is None or version == self._version
+
+    def _load(self) -> ClosureIndex:
+        index = self._index
+        if self._is_current():
+            return index
+
+        with self._lock:
+            if index is not self._index and self._is_current():
+                return self._index
+
+            # 버전을 먼저 읽어, 읽는 도중 바뀐 휴무는 다음 확인 때 다시 읽게 함
+            version = self._shared_version()
+            self._index = ClosureIndex(
+                BranchClosure.objects.values_list('branch_id', 'date', 'start_time', 'end_time')
+            )
+            self._version = version
+            self._loaded_at = self._checked_at = monotonic()
+            return self._index
+
+    def snapshot(self, dates: Iterable[date], branch_ids: Optional[Iterable[int]] = None) -> ClosureIndex:
+        """날짜(와 지점)의 휴무만 원본에서 읽은 인덱스 (캐시와 무관, 쿼리 1회)
+
+        트레이너-날짜 잠금 안에서 방금 커밋된 휴무까지 확인할 때 사용한다.
+        지점을 주면 해당 지점과 전 지점 휴무만 읽는다.
+        """
+        dates = set(dates)
+        if not dates:
+            return ClosureIndex([])
+        closures = BranchClosure.objects.filter(date__in=dates)
+        if branch_ids is not None:
+            closures = closures.filter(Q(branch_id__in=set(branch_ids)) | Q(branch__isnull=True))
+        return ClosureIndex(closures.values_list('branch_id', 'date', 'start_time', 'end_time'))
+
+    def invalidate(self):
+        """캐시 비우기 (다음 조회 시 다시 읽음)"""
+        with self._lock:
+            self._index = None
+
+    def invalidate_on_commit(self):
+        """즉시 비우고, 트랜잭션 커밋 후 한 번 더 비우며 다른 프로세스에 알림 (공유 캐시 버전 증가)"""
+        self.invalidate()
+        transaction.on_commit(self._publish)
+
+    def _publish(self):
+        self.invalidate()
+        try:
+            try:
+                cache.incr(CLOSURE_VERSION_KEY)
+            except ValueError:
+                cache.set(CLOSURE_VERSION_KEY, time_ns(), timeout=None)
+        except Exception:
+            logger.warning("휴무 캘린더 버전 갱신 실패", exc_info=True)
+
+    def intervals(self, branch_id: Optional[int], day: date) -> List[ClosureInterval]:
+        """지점의 날짜별 휴무 구간 (전 지점 휴무 포함, 휴무가 없으면 빈 목록)"""
+        return self._load().intervals(branch_id, day)
+
+    def is_closed(
+        self,
+        branch_id: Optional[int],
+        day: date,
+        start_time: Optional[time] = None,
+        end_time: Optional[time] = None
+    ) -> bool:
+        """휴무 여부 (시간이 주어지면 해당 시간대와 겹치는 휴무가 있는지 확인)"""
+        return self._load().is_closed(branch_id, day, start_time, end_time)
+
+    def dates(self, branch_id: Optional[int]) -> Set[date]:
+        """지점에 휴무가 있는 날짜 (전 지점 휴무 포함)"""
+        return self._load().dates(branch_id)
+
+
+# 싱글톤 인스턴스
+closure_calendar = BranchClosureCalendar()
@@ -89,8 +89,8 @@ class Command(BaseCommand):
             TrainerSchedule.objects.get_or_create(
                 trainer=trainer1,
                 day_of_week=day,
+                start_time=time(9, 0),
                 defaults={
-                    'start_time': time(9, 0),
                     'end_time': time(18, 0)
                 }
             )
@@ -98,8 +98,8 @@ class Command(BaseCommand):
             TrainerSchedule.objects.get_or_create(
                 trainer=trainer2,
                 day_of_week=day,
+                start_time=time(10, 0),
                 defaults={
-                    'start_time': time(10, 0),
                     'end_time': time(19, 0)
                 }
             )
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.23 on 2026-10-18 05:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('branches', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BranchClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('start_time', models.TimeField(blank=True, null=True, verbose_name='시작 시간')),
+                ('end_time', models.TimeField(blank=True, null=True, verbose_name='종료 시간')),
+                ('reason', models.CharField(blank=True, max_length=200, verbose_name='휴무 사유')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('branch', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='branches.branch', verbose_name='지점')),
+            ],
+            options={
+                'verbose_name': '지점 휴무',
+                'verbose_name_plural': '지점 휴무들',
+                'ordering': ['date', 'start_time'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='branchclosure',
+            index=models.Index(fields=['date', 'branch'], name='closure_date_branch_idx'),
+        ),
+    ]
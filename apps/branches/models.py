@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
+from model_utils import FieldTracker
 
 
 class Branch(models.Model):
@@ -81,3 +82,40 @@ class BranchAdmin(AbstractUser):
             return '본사'
         return self.branch.name if self.branch else '지점미지정'
 
+
+class BranchClosure(models.Model):
+    """지점 휴무 모델 (명절/시설 점검 등)
+
+    지점이 없으면 전 지점 휴무, 시간이 없으면 종일 휴무로 처리한다.
+    휴무 시간대는 해당 지점 모든 트레이너의 근무 구간에서 제외된다.
+    """
+    branch = models.ForeignKey(
+        Branch, 
+        on_delete=models.CASCADE, 
+        verbose_name='지점',
+        null=True, 
+        blank=True
+    )
+    date = models.DateField(verbose_name='날짜')
+    start_time = models.TimeField(verbose_name='시작 시간', null=True, blank=True)
+    end_time = models.TimeField(verbose_name='종료 시간', null=True, blank=True)
+    reason = models.CharField(max_length=200, verbose_name='휴무 사유', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        verbose_name = '지점 휴무'
+        verbose_name_plural = '지점 휴무들'
+        ordering = ['date', 'start_time']
+        indexes = [
+            models.Index(fields=['date', 'branch'], name='closure_date_branch_idx'),
+        ]
+
+    def __str__(self):
+        branch_name = self.branch.name if self.branch else '전 지점'
+        if self.start_time is None or self.end_time is None:
+            return f"{branch_name} - {self.date} 종일 휴무"
+        return f"{branch_name} - {self.date} {self.start_time}-{self.end_time} 휴무"
+    
+    # 필드 변경 추적
+    tracker = FieldTracker(fields=['branch', 'date', 'start_time', 'end_time'])
@@ -92,4 +92,28 @@ class BranchStatsPermission(permissions.BasePermission):
         if request.user.admin_type == 'branch':
             return obj.id == request.user.branch.id
         
-        return False 
\ No newline at end of file
+        return False
+
+
+class BranchClosurePermission(permissions.BasePermission):
+    """지점 휴무 관리 권한"""
+    
+    def has_permission(self, request, view):
+        # 인증된 사용자만 접근 가능
+        if not request.user.is_authenticated:
+            return False
+        
+        return request.user.admin_type in ('headquarters', 'branch')
+    
+    def has_object_permission(self, request, view, obj):
+        # 본사 어드민은 모든 휴무 관리 가능
+        if request.user.admin_type == 'headquarters':
+            return True
+        
+        # 지점 어드민은 전 지점 휴무는 조회만, 본인 지점 휴무만 수정 가능
+        if request.user.admin_type == 'branch':
+            if obj.branch_id is None:
+                return request.method in permissions.SAFE_METHODS
+            return obj.branch_id == request.user.branch_id
+        
+        return False
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Branch, BranchAdmin
+from .models import Branch, BranchAdmin, BranchClosure
+from .closures import closure_interval
 
 class BranchSerializer(serializers.ModelSerializer):
     """지점 시리얼라이저"""
@@ -65,4 +66,30 @@ class BranchAdminCreateSerializer(serializers.ModelSerializer):
         user = BranchAdmin.objects.create(**validated_data)
         user.set_password(password)
         user.save()
-        return user 
\ No newline at end of file
+        return user
+
+class BranchClosureSerializer(serializers.ModelSerializer):
+    """지점 휴무 시리얼라이저"""
+    branch_name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = BranchClosure
+        fields = '__all__'
+        read_only_fields = ('created_at', 'updated_at')
+    
+    def get_branch_name(self, obj):
+        """지점명 반환 (지점이 없으면 전 지점)"""
+        return obj.branch.name if obj.branch else '전 지점'
+    
+    def validate(self, attrs):
+        """시작/종료 시간은 함께 입력하거나 함께 생략 (생략 시 종일 휴무)"""
+        start_time = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        
+        if (start_time is None) != (end_time is None):
+            raise serializers.ValidationError("시작/종료 시간은 함께 입력해야 합니다.")
+        if start_time is not None:
+            start, end = closure_interval(start_time, end_time)
+            if end <= start:
+                raise serializers.ValidationError("종료 시간은 시작 시간 이후여야 합니다.")
+        return attrs
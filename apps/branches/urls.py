@@ -1,12 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BranchViewSet, BranchAdminViewSet
+from .views import BranchViewSet, BranchAdminViewSet, BranchClosureViewSet
 
 app_name = 'branches'
 
 router = DefaultRouter()
 router.register(r'branches', BranchViewSet)
 router.register(r'admins', BranchAdminViewSet)
+router.register(r'closures', BranchClosureViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
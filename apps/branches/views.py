@@ -5,13 +5,31 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
-from .models import Branch, BranchAdmin
+from rest_framework.exceptions import PermissionDenied
+from datetime import date
+from .models import Branch, BranchAdmin, BranchClosure
 from .serializers import (
     BranchSerializer, 
     BranchAdminSerializer, 
-    BranchAdminCreateSerializer
+    BranchAdminCreateSerializer,
+    BranchClosureSerializer
 )
-from .permissions import BranchPermission, BranchAdminPermission
+from .permissions import BranchPermission, BranchAdminPermission, BranchClosurePermission
+from django.shortcuts import get_object_or_404
+from apps.members.models import Member, MemberPTRegistration
+from apps.trainers.models import Trainer
+from apps.salaries.models import BranchRevenue
+from clamood_gym.stats import related_stat
+
+# 지점 통계 지표 (연관 테이블별 스칼라 서브쿼리, 지점 조회와 함께 1회)
+BRANCH_STATS = {
+    'total_members': related_stat(Member.objects.all(), 'branch', models.Count('pk')),
+    'total_trainers': related_stat(Trainer.objects.all(), 'branch', models.Count('pk')),
+    'active_pt_registrations': related_stat(
+        MemberPTRegistration.objects.filter(registration_status='active'), 'member__branch', models.Count('pk')
+    ),
+    'total_revenue': related_stat(BranchRevenue.objects.all(), 'branch', models.Sum('total_revenue')),
+}
 
 class CustomAuthToken(ObtainAuthToken):
     """커스텀 인증 토큰 뷰"""
@@ -55,19 +73,12 @@ class BranchViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
         """지점 통계 정보"""
-        branch = self.get_object()
+        # 지점 조회와 통계를 한 쿼리로 (get_object 와 같은 필터/권한 검사)
+        queryset = self.filter_queryset(self.get_queryset()).annotate(**BRANCH_STATS)
+        branch = get_object_or_404(queryset, pk=pk)
+        self.check_object_permissions(request, branch)
         
-        # 지점별 통계 데이터
-        stats = {
-            'total_members': branch.member_set.count(),
-            'total_trainers': branch.trainer_set.count(),
-            'active_pt_registrations': branch.memberptregistration_set.filter(
-                registration_status='active'
-            ).count(),
-            'total_revenue': branch.branchrevenue_set.aggregate(
-                total=models.Sum('total_revenue')
-            )['total'] or 0,
-        }
+        stats = {name: getattr(branch, name) for name in BRANCH_STATS}
         
         return Response(stats)
 
@@ -119,3 +130,45 @@ class BranchAdminViewSet(viewsets.ModelViewSet):
         user.save()
         
         return Response({'message': '비밀번호가 변경되었습니다.'})
+
+class BranchClosureViewSet(viewsets.ModelViewSet):
+    """지점 휴무 API 뷰셋"""
+    queryset = BranchClosure.objects.all()
+    serializer_class = BranchClosureSerializer
+    permission_classes = [BranchClosurePermission]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields = ['branch', 'date']
+    search_fields = ['reason']
+    ordering_fields = ['date', 'start_time']
+    ordering = ['date', 'start_time']
+    
+    def get_queryset(self):
+        """사용자 권한에 따른 쿼리셋 필터링 (지점 어드민은 본인 지점 + 전 지점 휴무)"""
+        user = self.request.user
+        queryset = BranchClosure.objects.select_related('branch')
+        if user.admin_type == 'headquarters':
+            return queryset
+        else:
+            return queryset.filter(models.Q(branch=user.branch) | models.Q(branch__isnull=True))
+    
+    def perform_create(self, serializer):
+        self._check_branch(serializer.validated_data.get('branch'))
+        serializer.save()
+    
+    def perform_update(self, serializer):
+        self._check_branch(serializer.validated_data.get('branch', serializer.instance.branch))
+        serializer.save()
+    
+    def _check_branch(self, branch):
+        """지점 어드민은 본인 지점 휴무만 등록/수정 가능"""
+        user = self.request.user
+        if user.admin_type != 'headquarters' and (branch is None or branch.id != user.branch_id):
+            raise PermissionDenied('본인 지점의 휴무만 등록할 수 있습니다.')
+    
+    @action(detail=False, methods=['get'])
+    def upcoming(self, request):
+        """다가오는 휴무 조회"""
+        today = date.today()
+        upcoming_closures = self.get_queryset().filter(date__gte=today).order_by('date', 'start_time')
+        serializer = self.get_serializer(upcoming_closures, many=True)
+        return Response(serializer.data)
@@ -1 +1,12 @@
 # apps.py for dashboards
+
+from django.apps import AppConfig
+
+
+class DashboardsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.dashboards'
+    verbose_name = '대시보드'
+
+    def ready(self):
+        import apps.dashboards.signals
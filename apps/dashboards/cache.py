@@ -0,0 +1,243 @@
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+
+logger = logging.getLogger(__name__)
+
+# 전체 지점 범위 (본사 어드민의 지점 미지정 조회)
+ALL_BRANCHES = 'all'
+# 캐시가 비어 있을 때 다른 요청의 계산 완료를 기다리는 최대 시간과 확인 간격 (초)
+LOCK_WAIT_SECONDS = 5
+LOCK_POLL_SECONDS = 0.05
+
+
+def _version_key(scope) -> str:
+    return f'dashboard:version:{scope}'
+
+
+class DashboardCache:
+    """대시보드 응답 캐시
+
+    키는 (엔드포인트, 지점 범위, 파라미터)로 만들고, 값에는 계산 시점의 지점 데이터 버전을 함께 저장한다.
+    회원/예약/PT 기록/급여/매출이 저장되면 해당 지점과 전체 범위의 버전이 올라가
+    기존 값은 버전이 달라져 오래된 값이 된다.
+
+    - 버전이 같고 신선 기간 안이면 캐시 값을 그대로 반환한다.
+    - 오래된 값이면 잠금을 얻은 요청 하나만 다시 계산하고, 나머지는 계산이 끝날 때까지 오래된 값을 받는다.
+    - 값이 아예 없으면 잠금을 얻은 요청이 계산하고, 나머지는 잠시 기다렸다가 그 결과를 받는다.
+
+    캐시 서버 오류 시에는 캐시 없이 바로 계산한다.
+    """
+
+    def __init__(self):
+        self.enabled = getattr(settings, 'DASHBOARD_CACHE_ENABLED', True)
+        self.fresh_seconds = getattr(settings, 'DASHBOARD_CACHE_FRESH_SECONDS', 60)
+        self.stale_seconds = getattr(settings, 'DASHBOARD_CACHE_STALE_SECONDS', 600)
+        self.lock_seconds = getattr(settings, 'DASHBOARD_CACHE_LOCK_SECONDS', 30)
+
+    # 버전
+
+    def _scopes(self, branch_ids: Optional[Iterable[int]]) -> list:
+        return [ALL_BRANCHES] if branch_ids is None else sorted({int(branch_id) for branch_id in branch_ids})
+
+    def version(self, branch_ids: Optional[Iterable[int]]) -> str:
+        """지점 범위의 현재 데이터 버전 (지점별 버전을 이어 붙인 값)"""
+        scopes = self._scopes(branch_ids)
+        keys = [_version_key(scope) for scope in scopes]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                # 버전이 없으면(최초 또는 캐시 축출) 이전 값과 겹치지 않도록 시각으로 시작
+                cache.add(key, time.time_ns(), timeout=None)
+                versions[key] = cache.get(key)
+        return '.'.join(str(versions[key]) for key in keys)
+
+    def touch(self, branch_ids: Iterable[Optional[int]]) -> None:
+        """지점 데이터 변경 알림 (트랜잭션 커밋 후 지점과 전체 범위 버전 증가)"""
+        scopes = {int(branch_id) for branch_id in branch_ids if branch_id is not None}
+        if not scopes:
+            return
+        transaction.on_commit(lambda: self._bump(scopes | {ALL_BRANCHES}))
+
+    def _bump(self, scopes) -> None:
+        for scope in scopes:
+            key = _version_key(scope)
+            try:
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.add(key, time.time_ns(), timeout=None)
+            except Exception:
+                logger.warning("대시보드 캐시 버전 갱신 실패: %s", key, exc_info=True)
+
+    # 조회
+
+    def _key(self, endpoint: str, branch_ids: Optional[Iterable[int]], params: Dict[str, Any]) -> str:
+        scope = '-'.join(str(scope) for scope in self._scopes(branch_ids))
+        digest = hashlib.md5(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        return f'dashboard:{endpoint}:{scope}:{digest}'
+
+    def get_or_compute(
+        self,
+        endpoint: str,
+        branch_ids: Optional[Sequence[int]],
+        params: Dict[str, Any],
+        compute: Callable[[], Any]
+    ) -> Any:
+        """캐시 값 또는 계산 결과 (branch_ids 가 None 이면 전체 지점)"""
+        if not self.enabled:
+            return compute()
+
+        key = self._key(endpoint, branch_ids, params)
+        lock_key = f'{key}:lock'
+        try:
+            version = self.version(branch_ids)
+            entry = cache.get(key)
+            if entry is not None and entry['version'] == version and entry['fresh_until'] > time.time():
+                return entry['value']
+            locked = cache.add(lock_key, 1, timeout=self.lock_seconds)
+        except Exception:
+            logger.warning("대시보드 캐시 조회 실패: %s", key, exc_info=True)
+            return compute()
+
+        if locked:
+            try:
+                value = compute()
+                self._store(key, version, value)
+                return value
+            finally:
+                self._release(lock_key)
+
+        # 다른 요청이 다시 계산하는 중: 오래된 값이라도 있으면 바로 반환
+        if entry is not None:
+            return entry['value']
+
+        # 값이 없으면 계산이 끝나기를 기다렸다가 그 결과를 사용
+        deadline = time.time() + LOCK_WAIT_SECONDS
+        while time.time() < deadline:
+            time.sleep(LOCK_POLL_SECONDS)
+            entry = cache.get(key)
+            if entry is not None and entry['version'] == version:
+                return entry['value']
+            if not cache.get(lock_key):
+                break
+        return compute()
+
+    def _store(self, key: str, version: str, value: Any) -> None:
+        try:
+            cache.set(key, {
+                'version': version,
+                'value': value,
+                'fresh_until': time.time() + self.fresh_seconds,
+            }, timeout=self.fresh_seconds + self.stale_seconds)
+        except Exception:
+            logger.warning("대시보드 캐시 저장 실패: %s", key, exc_info=True)
+
+    def _release(self, lock_key: str) -> None:
+        try:
+            cache.delete(lock_key)
+        except Exception:
+            logger.warning("대시보드 캐시 잠금 해제 실패: %s", lock_key, exc_info=True)
+
+    @contextmanager
+    def disabled(self):
+        """캐시 없이 계산 (쿼리 수 측정 등)"""
+        enabled = self.enabled
+        self.enabled = False
+        try:
+            yield
+        finally:
+            self.enabled = enabled
+
+    # 데코레이터
+
+    def method(self, endpoint: str):
+        """DashboardService 메서드 캐시 (branch_id 인자를 지점 범위로, 나머지 인자를 파라미터로 사용)"""
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                params = {name: value for name, value in bound.arguments.items() if name != 'self'}
+                branch_id = params.pop('branch_id', None)
+                return self.get_or_compute(
+                    endpoint,
+                    [branch_id] if branch_id else None,
+                    params,
+                    lambda: func(*args, **kwargs)
+                )
+            return wrapper
+        return decorator
+
+    def view(self, endpoint: str):
+        """대시보드 API 뷰 캐시 (@api_view 안쪽에 적용, 200 응답만 저장)
+
+        지점 어드민은 본인 지점, 본사 어드민은 branch_id 파라미터의 지점 또는 전체 지점 범위를 사용한다.
+        역할별 권한 확인은 캐시 조회 전에 끝나도록 permission_classes 로 하고,
+        키에는 역할을 넣어 다른 역할이 계산한 응답을 받지 않게 한다.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(request, *args, **kwargs):
+                branch_ids = self.request_scope(request)
+                if branch_ids is False:
+                    return func(request, *args, **kwargs)
+                role = request.user.admin_type
+                params = {key: request.query_params.getlist(key) for key in request.query_params}
+                if role != 'headquarters':
+                    # 지점 어드민의 지점 범위는 본인 지점으로 고정 (branch_id 파라미터는 사용하지 않음)
+                    params.pop('branch_id', None)
+
+                def compute():
+                    response = func(request, *args, **kwargs)
+                    if response.status_code != status.HTTP_200_OK:
+                        raise _Uncacheable(response)
+                    return response.data
+
+                try:
+                    return Response(self.get_or_compute(f'{endpoint}:{role}', branch_ids, params, compute))
+                except _Uncacheable as e:
+                    return e.response
+            return wrapper
+        return decorator
+
+    def request_scope(self, request):
+        """요청 사용자의 지점 범위 (전체면 None, 판단할 수 없으면 False)"""
+        user = request.user
+        if user.admin_type != 'headquarters':
+            return [user.branch_id] if user.branch_id else False
+        branch_id = request.query_params.get('branch_id')
+        if not branch_id:
+            return None
+        try:
+            return [int(branch_id)]
+        except ValueError:
+            return False
+
+
+class _Uncacheable(Exception):
+    """캐시하지 않을 응답 (오류 응답은 그대로 반환)"""
+
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+# 싱글톤 인스턴스
+dashboard_cache = DashboardCache()
@@ -0,0 +1,163 @@
+import calendar
+from datetime import date
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.db.models import Count, Q, Sum
+
+from apps.branches.models import Branch
+from apps.salaries.models import BranchRevenue
+from .daily_stats import daily_stats_service, RESERVATION_STATUS_FIELDS
+from .models import DailyBranchStats
+
+
+# 한 번에 비교할 수 있는 최대 기간 (일)
+MAX_COMPARISON_DAYS = 366
+# 순위/백분위를 계산하는 지표 (값이 클수록 높은 순위)
+RANKED_METRICS = [
+    'total_members',
+    'new_members',
+    'total_revenue',
+    'total_reservations',
+    'completion_rate',
+    'trainer_count',
+]
+
+
+def month_period(year: int, month: int) -> tuple:
+    """해당 월의 첫날과 마지막 날"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def rank_columns(rows: List[Dict[str, Any]], metrics: Sequence[str]) -> None:
+    """지표별 순위와 백분위를 각 행의 ranks/percentiles 에 기록
+
+    순위는 값이 큰 순서로 매기고 같은 값은 같은 순위(1, 2, 2, 4)로 둔다.
+    백분위는 자신보다 값이 작은 지점의 비율(0~100)이며 지점이 1곳이면 100 이다.
+    지표마다 한 번 정렬하므로 지점 수가 n 일 때 O(지표 수 × n log n) 이다.
+    """
+    count = len(rows)
+    for row in rows:
+        row['ranks'] = {}
+        row['percentiles'] = {}
+    for metric in metrics:
+        ordered = sorted(rows, key=lambda row: row[metric], reverse=True)
+        position = 0
+        for _, group in groupby(ordered, key=lambda row: row[metric]):
+            group = list(group)
+            rank = position + 1
+            position += len(group)
+            # 자신보다 작은 값을 가진 지점 수 = 같은 값 묶음 뒤에 남은 지점 수
+            percentile = round((count - position) / (count - 1) * 100, 1) if count > 1 else 100.0
+            for row in group:
+                row['ranks'][metric] = rank
+                row['percentiles'][metric] = percentile
+
+
+class BranchComparisonService:
+    """지점 비교 서비스 (본사 대시보드)
+
+    지점 목록(트레이너 수 포함), 기간 집계, 현재 회원 수, 매출을 각각 GROUP BY 조회 1회로 읽어
+    지점 수와 관계없이 쿼리 4회로 모든 지점의 비교 지표와 순위/백분위를 만든다.
+    """
+
+    def __init__(self):
+        pass
+
+    def compare(
+        self,
+        start_date: date,
+        end_date: date,
+        branch_ids: Optional[Sequence[int]] = None
+    ) -> Dict[str, Any]:
+        """기간 내 지점별 비교 지표
+
+        - total_members: 현재 활성 회원 수, new_members: 기간 내 가입 회원 수
+        - total_revenue: 기간에 걸친 월의 지점 매출 합계
+        - total_reservations: 기간 내 예약 수, completion_rate: 그중 완료 비율(%)
+        - trainer_count: 현재 재직 트레이너 수
+        """
+        if start_date > end_date:
+            raise ValueError("시작일이 종료일보다 늦을 수 없습니다.")
+        if (end_date - start_date).days + 1 > MAX_COMPARISON_DAYS:
+            raise ValueError(f"최대 {MAX_COMPARISON_DAYS}일까지 비교할 수 있습니다.")
+
+        # 1) 활성 지점과 재직 트레이너 수
+        branches = Branch.objects.filter(is_active=True)
+        if branch_ids is not None:
+            branches = branches.filter(id__in=branch_ids)
+        branch_rows = list(
+            branches.annotate(
+                trainer_count=Count('trainer', filter=Q(trainer__employment_status='active'))
+            ).order_by('name', 'id').values('id', 'name', 'trainer_count')
+        )
+        if not branch_rows:
+            return self._result(start_date, end_date, [])
+        ids = [branch['id'] for branch in branch_rows]
+
+        # 2) 기간 집계 (지점 일별 통계)
+        period_fields = ['new_members', *RESERVATION_STATUS_FIELDS.values(), 'completed_sessions', 'pt_revenue']
+        period_stats = {
+            row.pop('branch_id'): row
+            for row in DailyBranchStats.objects.filter(
+                branch_id__in=ids,
+                date__range=[start_date, end_date]
+            ).values('branch_id').annotate(**{field: Sum(field) for field in period_fields})
+        }
+
+        # 3) 현재 회원 수
+        member_gauges = daily_stats_service.member_gauges(ids)
+
+        # 4) 기간에 걸친 월의 매출 (월 단위 집계)
+        months = (
+            (Q(year__gt=start_date.year) | Q(year=start_date.year, month__gte=start_date.month))
+            & (Q(year__lt=end_date.year) | Q(year=end_date.year, month__lte=end_date.month))
+        )
+        revenues = {
+            row.pop('branch_id'): row
+            for row in BranchRevenue.objects.filter(months, branch_id__in=ids).values('branch_id').annotate(
+                total_revenue=Sum('total_revenue'),
+                pt_revenue=Sum('pt_revenue'),
+                membership_revenue=Sum('membership_revenue')
+            )
+        }
+
+        rows = []
+        for branch in branch_rows:
+            stats = period_stats.get(branch['id'], {})
+            gauges = member_gauges.get(branch['id'], {})
+            revenue = revenues.get(branch['id'], {})
+            total_reservations = sum(stats.get(field) or 0 for field in RESERVATION_STATUS_FIELDS.values())
+            completed = stats.get(RESERVATION_STATUS_FIELDS['completed']) or 0
+            rows.append({
+                'branch_id': branch['id'],
+                'branch_name': branch['name'],
+                'total_members': gauges.get('active_members', 0),
+                'all_members': gauges.get('total_members', 0),
+                'new_members': stats.get('new_members') or 0,
+                'total_revenue': float(revenue.get('total_revenue') or 0),
+                'pt_revenue': float(revenue.get('pt_revenue') or 0),
+                'membership_revenue': float(revenue.get('membership_revenue') or 0),
+                'pt_registration_revenue': float(stats.get('pt_revenue') or 0),
+                'total_reservations': total_reservations,
+                'completed_reservations': completed,
+                'completed_sessions': stats.get('completed_sessions') or 0,
+                'completion_rate': round(completed / total_reservations * 100, 1) if total_reservations else 0,
+                'trainer_count': branch['trainer_count'],
+            })
+
+        rank_columns(rows, RANKED_METRICS)
+        return self._result(start_date, end_date, rows)
+
+    def _result(self, start_date: date, end_date: date, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'branch_count': len(rows),
+            'ranked_metrics': RANKED_METRICS,
+            'branches': rows,
+        }
+
+
+# 싱글톤 인스턴스
+branch_comparison_service = BranchComparisonService()
@@ -0,0 +1,326 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.branches.models import Branch
+from apps.members.models import Member, MemberPTRegistration
+from apps.reservations.models import Reservation, PTRecord
+from .cache import dashboard_cache
+from .models import DailyBranchStats
+
+
+# 예약 상태별 집계 필드
+RESERVATION_STATUS_FIELDS = {
+    status: f'reservations_{status}' for status, _ in Reservation.RESERVATION_STATUS_CHOICES
+}
+# 날짜별로 더해지는 값
+COUNTER_FIELDS = [
+    'new_members',
+    *RESERVATION_STATUS_FIELDS.values(),
+    'completed_sessions',
+    'pt_registrations',
+    'pt_revenue',
+]
+# 그날 마지막 시점의 회원 수 (당일 행만 갱신)
+MEMBER_GAUGE_FIELDS = ['total_members', 'active_members']
+
+# 매일 재집계하는 기간 (지난 날짜의 늦은 수정과 미래 예약 포함)
+RECONCILE_PAST_DAYS = 35
+RECONCILE_FUTURE_DAYS = 60
+
+# (지점 ID, 날짜, 필드, 증감) 목록
+Facts = List[Tuple[Optional[int], date, str, Any]]
+# (지점 ID, 날짜) -> 필드 -> 증감
+Deltas = Dict[Tuple[int, date], Dict[str, Any]]
+
+
+def member_facts(branch_id, registration_date, membership_status) -> Facts:
+    """회원 1명이 집계에 더하는 값"""
+    today = timezone.localdate()
+    facts = [
+        (branch_id, registration_date, 'new_members', 1),
+        (branch_id, today, 'total_members', 1),
+    ]
+    if membership_status == 'active':
+        facts.append((branch_id, today, 'active_members', 1))
+    return facts
+
+
+def reservation_facts(branch_id, day, reservation_status) -> Facts:
+    """예약 1건이 집계에 더하는 값"""
+    return [(branch_id, day, RESERVATION_STATUS_FIELDS[reservation_status], 1)]
+
+
+def pt_record_facts(branch_id, workout_date, is_completed) -> Facts:
+    """PT 기록 1건이 집계에 더하는 값"""
+    return [(branch_id, workout_date, 'completed_sessions', 1)] if is_completed else []
+
+
+def registration_facts(branch_id, registration_date, total_price) -> Facts:
+    """PT 등록 1건이 집계에 더하는 값 (등록일은 현지 날짜 기준)"""
+    if registration_date is None:
+        return []
+    day = timezone.localdate(registration_date)
+    return [
+        (branch_id, day, 'pt_registrations', 1),
+        (branch_id, day, 'pt_revenue', Decimal(total_price or 0)),
+    ]
+
+
+def diff_facts(new: Facts, old: Facts = ()) -> Deltas:
+    """변경 후 값에서 변경 전 값을 뺀 (지점, 날짜)별 증감 (0 은 제외, 지점 없는 값은 무시)"""
+    deltas: Deltas = defaultdict(lambda: defaultdict(int))
+    for sign, facts in ((1, new), (-1, old)):
+        for branch_id, day, field, amount in facts:
+            if branch_id is not None and day is not None:
+                deltas[(branch_id, day)][field] += sign * amount
+    return {
+        key: {field: amount for field, amount in fields.items() if amount}
+        for key, fields in deltas.items()
+        if any(fields.values())
+    }
+
+
+class DailyBranchStatsService:
+    """지점 일별 통계 집계 서비스
+
+    증감은 원본 변경과 같은 트랜잭션에서 (지점, 날짜) 행별 UPDATE 1회로 반영한다.
+    대시보드 조회는 summarize() 로 기간 합계를 조회 1회에 계산한다.
+    """
+
+    def __init__(self):
+        pass
+
+    def apply(self, deltas: Deltas, create: bool = True) -> int:
+        """(지점, 날짜)별 증감 반영 (행이 없으면 생성, 반영한 행 수 반환)
+
+        삭제 반영은 create=False 로 호출해 있는 행만 줄인다.
+        지점 삭제로 연쇄 삭제되는 중에 이미 지운 집계 행을 다시 만들지 않기 위함이다.
+        """
+        today = timezone.localdate()
+        now = timezone.now()
+        # 같은 행을 갱신하는 트랜잭션끼리 교착하지 않도록 (지점, 날짜) 순서로 갱신
+        for (branch_id, day), fields in sorted(deltas.items()):
+            rows = DailyBranchStats.objects.filter(branch_id=branch_id, date=day)
+            increments = {field: F(field) + amount for field, amount in fields.items()}
+            if rows.update(**increments, updated_at=now) or not create:
+                continue
+            try:
+                with transaction.atomic():
+                    self._create_row(branch_id, day, fields, today)
+            except IntegrityError:
+                # 동시에 다른 요청이 먼저 생성
+                rows.update(**increments, updated_at=now)
+        return len(deltas)
+
+    def _create_row(self, branch_id: int, day: date, fields: Dict[str, Any], today: date) -> DailyBranchStats:
+        """새 행 생성 (당일 행의 회원 수는 증감 대신 현재 값으로 채움)"""
+        values = {field: amount for field, amount in fields.items() if field in COUNTER_FIELDS}
+        if day == today:
+            values.update(self.member_gauges([branch_id]).get(branch_id, {}))
+        return DailyBranchStats.objects.create(branch_id=branch_id, date=day, **values)
+
+    def member_gauges(self, branch_ids: Optional[Sequence[int]] = None) -> Dict[int, Dict[str, int]]:
+        """지점별 현재 전체/활성 회원 수"""
+        members = Member.objects.all()
+        if branch_ids is not None:
+            members = members.filter(branch_id__in=branch_ids)
+        return {
+            row['branch_id']: {'total_members': row['total_members'], 'active_members': row['active_members']}
+            for row in members.values('branch_id').annotate(
+                total_members=Count('id'),
+                active_members=Count('id', filter=Q(membership_status='active'))
+            )
+        }
+
+    def record_reservation_transition(self, reservations: Iterable[Reservation], target_status: str) -> int:
+        """시그널을 거치지 않는 예약 일괄 상태 변경 반영 (메모리의 예약은 변경 전 상태여야 함)"""
+        new: Facts = []
+        old: Facts = []
+        for reservation in reservations:
+            new += reservation_facts(reservation.branch_id, reservation.date, target_status)
+            old += reservation_facts(reservation.branch_id, reservation.date, reservation.reservation_status)
+        dashboard_cache.touch(branch_id for branch_id, *_ in new)
+        return self.apply(diff_facts(new, old))
+
+    def record_created_reservations(self, reservations: Iterable[Reservation]) -> int:
+        """bulk_create 로 생성한 예약 반영"""
+        facts: Facts = []
+        for reservation in reservations:
+            facts += reservation_facts(reservation.branch_id, reservation.date, reservation.reservation_status)
+        dashboard_cache.touch(branch_id for branch_id, *_ in facts)
+        return self.apply(diff_facts(facts))
+
+    def record_created_pt_records(self, pt_records: Iterable[PTRecord]) -> int:
+        """bulk_create 로 생성한 PT 기록 반영"""
+        facts: Facts = []
+        for pt_record in pt_records:
+            facts += pt_record_facts(pt_record.branch_id, pt_record.workout_date, pt_record.is_completed)
+        dashboard_cache.touch(branch_id for branch_id, *_ in facts)
+        return self.apply(diff_facts(facts))
+
+    def rebuild(self, start_date: date, end_date: date, branch_ids: Optional[Sequence[int]] = None) -> int:
+        """기간 집계를 원본에서 다시 계산해 덮어씀 (원본별 GROUP BY 조회 1회씩, 저장한 행 수 반환)"""
+        if start_date > end_date:
+            raise ValueError("시작일이 종료일보다 늦습니다.")
+
+        rows: Dict[Tuple[int, date], Dict[str, Any]] = defaultdict(dict)
+
+        def scoped(queryset, branch_field):
+            if branch_ids is not None:
+                queryset = queryset.filter(**{f'{branch_field}__in': branch_ids})
+            return queryset.exclude(**{f'{branch_field}__isnull': True})
+
+        members = scoped(Member.objects.filter(registration_date__range=[start_date, end_date]), 'branch_id')
+        for row in members.values('branch_id', 'registration_date').annotate(count=Count('id')):
+            rows[(row['branch_id'], row['registration_date'])]['new_members'] = row['count']
+
+        reservations = scoped(Reservation.objects.filter(date__range=[start_date, end_date]), 'branch_id')
+        for row in reservations.values('branch_id', 'date', 'reservation_status').annotate(count=Count('id')):
+            field = RESERVATION_STATUS_FIELDS.get(row['reservation_status'])
+            if field:
+                rows[(row['branch_id'], row['date'])][field] = row['count']
+
+        pt_records = scoped(
+            PTRecord.objects.filter(workout_date__range=[start_date, end_date], is_completed=True), 'branch_id'
+        )
+        for row in pt_records.values('branch_id', 'workout_date').annotate(count=Count('id')):
+            rows[(row['branch_id'], row['workout_date'])]['completed_sessions'] = row['count']
+
+        registrations = scoped(
+            MemberPTRegistration.objects.annotate(day=TruncDate('registration_date')).filter(
+                day__range=[start_date, end_date]
+            ),
+            'member__branch_id'
+        )
+        for row in registrations.values('member__branch_id', 'day').annotate(
+            count=Count('id'), revenue=Sum('total_price')
+        ):
+            key = (row['member__branch_id'], row['day'])
+            rows[key]['pt_registrations'] = row['count']
+            rows[key]['pt_revenue'] = row['revenue'] or 0
+
+        # 회원 수는 지난 날짜를 다시 계산할 수 없으므로 당일 행만 현재 값으로 갱신
+        today = timezone.localdate()
+        with_gauges = start_date <= today <= end_date
+        if with_gauges:
+            active_branches = Branch.objects.filter(is_active=True)
+            if branch_ids is not None:
+                active_branches = active_branches.filter(id__in=branch_ids)
+            gauges = self.member_gauges(branch_ids)
+            today_branch_ids = set(active_branches.values_list('id', flat=True))
+            today_branch_ids |= {branch_id for branch_id, day in rows if day == today}
+            for branch_id in today_branch_ids:
+                rows[(branch_id, today)].update(
+                    gauges.get(branch_id, {field: 0 for field in MEMBER_GAUGE_FIELDS})
+                )
+
+        stats = [
+            DailyBranchStats(
+                branch_id=branch_id,
+                date=day,
+                **{field: values.get(field, 0) for field in COUNTER_FIELDS + MEMBER_GAUGE_FIELDS}
+            )
+            for (branch_id, day), values in rows.items()
+        ]
+        with transaction.atomic():
+            # 원본이 모두 사라진 (지점, 날짜) 행의 값은 0 으로 초기화
+            stale = DailyBranchStats.objects.filter(date__range=[start_date, end_date])
+            if branch_ids is not None:
+                stale = stale.filter(branch_id__in=branch_ids)
+            stale.update(**{field: 0 for field in COUNTER_FIELDS}, updated_at=timezone.now())
+
+            # 당일 외 행은 기존 회원 수를 유지
+            for rows_to_save, fields in (
+                ([row for row in stats if row.date == today], COUNTER_FIELDS + MEMBER_GAUGE_FIELDS),
+                ([row for row in stats if row.date != today], COUNTER_FIELDS),
+            ):
+                DailyBranchStats.objects.bulk_create(
+                    rows_to_save,
+                    update_conflicts=True,
+                    unique_fields=['branch', 'date'],
+                    update_fields=fields + ['updated_at']
+                )
+            dashboard_cache.touch({branch_id for branch_id, _ in rows} | set(branch_ids or []))
+        return len(stats)
+
+    def reconcile(self, day: Optional[date] = None) -> int:
+        """최근 기간 재집계 (매일 실행해 증감 누락/중복으로 어긋난 값 보정)"""
+        today = day or timezone.localdate()
+        return self.rebuild(today - timedelta(days=RECONCILE_PAST_DAYS), today + timedelta(days=RECONCILE_FUTURE_DAYS))
+
+    def summarize(
+        self,
+        start_date: date,
+        end_date: date,
+        branch_ids: Optional[Sequence[int]] = None,
+        on_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """기간 합계와 기준일(기본 오늘) 값 (인덱스 조회 1회, 오늘 기준이면 누락 지점 회원 수 조회 추가)
+
+        반환값의 `day` 에는 기준일 하루의 예약 상태별 수와 회원 수가 들어간다.
+        기준일이 오늘이면 아직 오늘 행이 없는 지점의 회원 수를 현재 값으로 더한다
+        (자정 이후 활동이 없는 지점이 전 지점 합계에서 빠지지 않도록).
+        """
+        on_date = on_date or timezone.localdate()
+        stats = DailyBranchStats.objects.filter(
+            Q(date__range=[start_date, end_date]) | Q(date=on_date)
+        )
+        if branch_ids is not None:
+            stats = stats.filter(branch_id__in=branch_ids)
+
+        in_range = Q(date__range=[start_date, end_date])
+        on_day = Q(date=on_date)
+        aggregates = {field: Sum(field, filter=in_range) for field in COUNTER_FIELDS}
+        aggregates.update({
+            f'day_{field}': Sum(field, filter=on_day)
+            for field in MEMBER_GAUGE_FIELDS + list(RESERVATION_STATUS_FIELDS.values())
+        })
+        totals = stats.aggregate(**aggregates)
+
+        result = {field: totals[field] or 0 for field in COUNTER_FIELDS}
+        result['total_reservations'] = sum(result[field] for field in RESERVATION_STATUS_FIELDS.values())
+        day = {field: totals[f'day_{field}'] or 0 for field in MEMBER_GAUGE_FIELDS + list(RESERVATION_STATUS_FIELDS.values())}
+        if on_date == timezone.localdate():
+            covered = set(stats.filter(on_day).values_list('branch_id', flat=True))
+            gauges = [
+                gauge for branch_id, gauge in self.member_gauges(branch_ids).items() if branch_id not in covered
+            ]
+            for field in MEMBER_GAUGE_FIELDS:
+                day[field] += sum(gauge[field] for gauge in gauges)
+        result['day'] = day
+        return result
+
+    def daily_series(
+        self,
+        start_date: date,
+        end_date: date,
+        fields: Sequence[str],
+        branch_ids: Optional[Sequence[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """날짜별 합계 목록 (지점 합산, 조회 1회)"""
+        stats = DailyBranchStats.objects.filter(date__range=[start_date, end_date])
+        if branch_ids is not None:
+            stats = stats.filter(branch_id__in=branch_ids)
+        return list(
+            stats.values('date').annotate(**{field: Sum(field) for field in fields}).order_by('date')
+        )
+
+    def per_branch(self, start_date: date, end_date: date, fields: Sequence[str]) -> Dict[int, Dict[str, Any]]:
+        """지점별 기간 합계 (조회 1회)"""
+        return {
+            row.pop('branch_id'): row
+            for row in DailyBranchStats.objects.filter(date__range=[start_date, end_date]).values(
+                'branch_id'
+            ).annotate(**{field: Sum(field) for field in fields})
+        }
+
+
+# 싱글톤 인스턴스
+daily_stats_service = DailyBranchStatsService()
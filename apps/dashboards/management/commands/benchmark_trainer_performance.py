@@ -0,0 +1,166 @@
+import time as timer
+from datetime import date, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.branches.models import Branch
+from apps.members.models import Member
+from apps.trainers.models import Trainer
+from apps.reservations.models import Reservation, PTRecord
+from apps.salaries.models import Salary
+from apps.dashboards.cache import dashboard_cache
+from apps.dashboards.services import dashboard_service
+
+
+# 트레이너 수와 관계없이 허용하는 쿼리 수 (트레이너+급여, 완료 PT, 예약)
+EXPECTED_QUERIES = 3
+
+
+class Command(BaseCommand):
+    help = '트레이너 성과 데이터 쿼리 수 회귀 벤치마크 (트레이너 수와 관계없이 쿼리 수 고정 확인)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trainers', type=int, default=500, help='벤치마크 트레이너 수')
+        parser.add_argument('--reservations', type=int, default=4, help='트레이너별 예약 수')
+        parser.add_argument('--keep', action='store_true', help='벤치마크 데이터 유지')
+
+    def handle(self, *args, **options):
+        if options['trainers'] < 2:
+            raise CommandError('--trainers 는 2 이상이어야 합니다.')
+
+        today = date.today()
+        branch, member = self._create_branch()
+        try:
+            # 트레이너 1명일 때와 N명일 때의 쿼리 수 비교
+            self._create_trainers(branch, member, 1, options['reservations'], today)
+            small_queries, _, _ = self._measure(branch, today)
+
+            self._create_trainers(branch, member, options['trainers'] - 1, options['reservations'], today)
+            large_queries, elapsed, data = self._measure(branch, today)
+
+            self.stdout.write(
+                f"DB: {connection.vendor}, 트레이너 1명 → 쿼리 {small_queries}회 / "
+                f"트레이너 {len(data)}명 → 쿼리 {large_queries}회, {elapsed * 1000:.1f}ms"
+            )
+            self._verify(branch, data, options['trainers'], today)
+
+            if small_queries != EXPECTED_QUERIES or large_queries != EXPECTED_QUERIES:
+                self.stdout.write(self.style.ERROR(
+                    f"쿼리 수가 {EXPECTED_QUERIES}회로 고정되어 있지 않습니다."
+                ))
+                raise CommandError('트레이너 성과 데이터 쿼리 수 회귀')
+            self.stdout.write(self.style.SUCCESS(f"쿼리 수 {EXPECTED_QUERIES}회로 고정"))
+        finally:
+            if not options['keep']:
+                self._cleanup(branch)
+
+    def _measure(self, branch, today):
+        """성과 데이터 1회 조회의 쿼리 수와 소요 시간 (응답 캐시 미사용)"""
+        with dashboard_cache.disabled(), CaptureQueriesContext(connection) as context:
+            started = timer.perf_counter()
+            data = dashboard_service.get_trainer_performance_data(branch.id, today.month, today.year)
+            elapsed = timer.perf_counter() - started
+        return len(context.captured_queries), elapsed, data
+
+    def _verify(self, branch, data, trainer_count, today):
+        """결과 행 수와 트레이너별 집계 값 검증"""
+        if len(data) != trainer_count:
+            raise CommandError(f"트레이너 {trainer_count}명 중 {len(data)}명만 조회되었습니다.")
+
+        reservation_total = Reservation.objects.filter(
+            branch=branch, date__year=today.year, date__month=today.month
+        ).count()
+        completed_total = PTRecord.objects.filter(
+            branch=branch, workout_date__year=today.year, workout_date__month=today.month, is_completed=True
+        ).count()
+        salary_total = sum(
+            float(salary) for salary in Salary.objects.filter(
+                trainer__branch=branch, year=today.year, month=today.month
+            ).values_list('total_salary', flat=True)
+        )
+        if (
+            sum(row['total_reservations'] for row in data) != reservation_total
+            or sum(row['completed_sessions'] for row in data) != completed_total
+            or round(sum(row['salary'] for row in data), 2) != round(salary_total, 2)
+        ):
+            raise CommandError('트레이너별 집계 합계가 원본 데이터와 다릅니다.')
+
+    def _create_branch(self):
+        """벤치마크용 지점/회원 생성"""
+        branch = Branch.objects.create(
+            name=f"벤치마크 지점 {timer.time_ns()}",
+            address="벤치마크",
+            phone="02-0000-0000",
+            email="benchmark@clamood.com"
+        )
+        member = Member.objects.create(branch=branch, name="벤치마크 회원", phone="010-0000-0000")
+        return branch, member
+
+    def _create_trainers(self, branch, member, count, reservation_count, today):
+        """트레이너와 이번 달 급여/예약/PT 기록 일괄 생성
+
+        시그널을 거치지 않도록 bulk_create 를 사용하므로 지점 일별 통계에는 반영되지 않는다.
+        """
+        offset = Trainer.objects.filter(branch=branch).count()
+        trainers = Trainer.objects.bulk_create([
+            Trainer(
+                branch=branch,
+                name=f"벤치마크 트레이너 {offset + index + 1:04d}",
+                phone="010-0000-0000",
+                hire_date=today,
+                base_salary=0
+            )
+            for index in range(count)
+        ])
+        if connection.features.can_return_rows_from_bulk_insert is False:
+            trainers = list(Trainer.objects.filter(branch=branch).order_by('id')[offset:])
+
+        Salary.objects.bulk_create([
+            Salary(
+                trainer=trainer,
+                year=today.year,
+                month=today.month,
+                base_salary=1000000,
+                total_salary=1000000 + index
+            )
+            for index, trainer in enumerate(trainers)
+        ])
+
+        month_start = today.replace(day=1)
+        reservations = Reservation.objects.bulk_create([
+            Reservation(
+                member=member,
+                trainer=trainer,
+                branch=branch,
+                date=month_start + timedelta(days=slot % 28),
+                start_time=time(10, 0),
+                end_time=time(10, 30),
+                reservation_status='completed'
+            )
+            for trainer in trainers
+            for slot in range(reservation_count)
+        ])
+        if connection.features.can_return_rows_from_bulk_insert is False:
+            reservations = list(Reservation.objects.filter(trainer__in=trainers))
+
+        # 예약마다 PT 기록을 남기고 절반만 완료 처리
+        PTRecord.objects.bulk_create([
+            PTRecord(
+                reservation=reservation,
+                trainer_id=reservation.trainer_id,
+                member=member,
+                branch=branch,
+                workout_date=reservation.date,
+                workout_time=reservation.start_time,
+                duration=30,
+                content="벤치마크",
+                is_completed=index % 2 == 0
+            )
+            for index, reservation in enumerate(reservations)
+        ])
+
+    def _cleanup(self, branch):
+        """벤치마크 데이터 삭제 (트레이너/회원/예약/급여는 지점 삭제 시 함께 삭제됨)"""
+        branch.delete()
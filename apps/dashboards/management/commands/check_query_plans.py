@@ -0,0 +1,259 @@
+import random
+import re
+from datetime import date, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.branches.models import Branch
+from apps.members.models import Member, PTProgram, MemberPTRegistration
+from apps.trainers.models import Trainer
+from apps.reservations.models import Reservation, PTRecord
+from apps.notifications.models import Notification
+from apps.dashboards.models import DailyBranchStats
+
+
+# 전체 테이블 스캔을 나타내는 실행 계획 패턴 (백엔드별)
+FULL_SCAN_PATTERNS = {
+    'sqlite': r'\bSCAN {table}\b(?! USING)',
+    'postgresql': r'\bSeq Scan on {table}\b',
+}
+
+
+class Command(BaseCommand):
+    help = '주요 조회 쿼리의 실행 계획 검사 (인덱스를 타지 않고 전체 스캔하면 실패)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='테이블별 시드 데이터 규모')
+        parser.add_argument('--no-seed', action='store_true', help='시드 데이터 없이 현재 데이터로 검사')
+        parser.add_argument('--verbose-plan', action='store_true', help='실행 계획 전체 출력')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"지원하지 않는 데이터베이스입니다: {connection.vendor}")
+
+        failures = []
+        # 시드 데이터는 검사 후 롤백
+        with transaction.atomic():
+            context = self._context() if options['no_seed'] else self._seed(options['rows'])
+            if context is None:
+                raise CommandError("검사할 데이터가 없습니다. --no-seed 없이 실행하세요.")
+            self._analyze()
+
+            for name, table, queryset in self._query_shapes(*context):
+                plan = queryset.explain()
+                full_scan = re.search(
+                    FULL_SCAN_PATTERNS[connection.vendor].format(table=re.escape(table)),
+                    plan
+                )
+                if full_scan:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(f"[전체 스캔] {name}"))
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"[인덱스] {name}"))
+                if full_scan or options['verbose_plan']:
+                    self.stdout.write(plan)
+
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"전체 스캔 쿼리 {len(failures)}건: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("모든 쿼리가 인덱스를 사용합니다."))
+
+    def _analyze(self):
+        """통계 갱신 (PostgreSQL 은 작은 테이블에서도 인덱스 사용 가능 여부만 보도록 순차 스캔 비활성화)"""
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def _query_shapes(self, branch, trainer, member):
+        """서비스/태스크가 실행하는 조회 형태 (이름, 대상 테이블, 쿼리셋)"""
+        today = timezone.now().date()
+        return [
+            (
+                '트레이너 기간별 활성 예약 (가용성)',
+                Reservation._meta.db_table,
+                Reservation.objects.filter(
+                    trainer_id__in=[trainer.id],
+                    date__range=[today, today + timedelta(days=30)],
+                    reservation_status__in=['pending', 'confirmed']
+                ).values_list('trainer_id', 'date', 'start_time', 'end_time'),
+            ),
+            (
+                '트레이너 월별 완료 PT (급여)',
+                PTRecord._meta.db_table,
+                PTRecord.objects.filter(
+                    trainer=trainer,
+                    workout_date__year=today.year,
+                    workout_date__month=today.month,
+                    is_completed=True
+                ),
+            ),
+            (
+                '지점 기간별 예약',
+                Reservation._meta.db_table,
+                Reservation.objects.filter(
+                    branch=branch,
+                    date__range=[today - timedelta(days=30), today]
+                ).values('id'),
+            ),
+            (
+                '지점 월별 PT 수행 내역 (매출)',
+                PTRecord._meta.db_table,
+                PTRecord.objects.filter(
+                    branch=branch,
+                    workout_date__year=today.year,
+                    workout_date__month=today.month
+                ).values('id'),
+            ),
+            (
+                '지점 기간별 일별 통계 (대시보드)',
+                DailyBranchStats._meta.db_table,
+                DailyBranchStats.objects.filter(
+                    branch_id__in=[branch.id],
+                    date__range=[today - timedelta(days=30), today]
+                ).values('id'),
+            ),
+            (
+                '전 지점 기간별 일별 통계 (대시보드)',
+                DailyBranchStats._meta.db_table,
+                DailyBranchStats.objects.filter(
+                    date__range=[today - timedelta(days=30), today]
+                ).values('id'),
+            ),
+            (
+                '수신자별 최근 알림',
+                Notification._meta.db_table,
+                Notification.objects.filter(
+                    recipient_type='admin',
+                    recipient_id=1
+                ).order_by('-created_at')[:5],
+            ),
+            (
+                '전송 실패 알림 재전송',
+                Notification._meta.db_table,
+                Notification.objects.filter(
+                    status='failed',
+                    created_at__gte=timezone.now() - timedelta(days=1)
+                ),
+            ),
+            (
+                '전송 대기 알림',
+                Notification._meta.db_table,
+                Notification.objects.filter(status='pending').order_by('created_at')[:100],
+            ),
+            (
+                '만료 예정 PT 등록',
+                MemberPTRegistration._meta.db_table,
+                MemberPTRegistration.objects.filter(
+                    expiry_date=today + timedelta(days=7),
+                    registration_status='active'
+                ),
+            ),
+            (
+                '지점 활성 회원 수',
+                Member._meta.db_table,
+                Member.objects.filter(branch=branch, membership_status='active').values('id'),
+            ),
+        ]
+
+    def _context(self):
+        branch = Branch.objects.first()
+        trainer = Trainer.objects.first()
+        member = Member.objects.first()
+        if not (branch and trainer and member):
+            return None
+        return branch, trainer, member
+
+    def _seed(self, rows):
+        """조회 형태별 대표 데이터 생성 (bulk_create 로 시그널 없이)"""
+        rng = random.Random(0)
+        today = timezone.now().date()
+        branches = Branch.objects.bulk_create([
+            Branch(name=f"플랜 검사 지점 {index}", address="-", phone="0200000000", email="plan@clamood.com")
+            for index in range(5)
+        ])
+        trainers = Trainer.objects.bulk_create([
+            Trainer(
+                branch=branches[index % len(branches)],
+                name=f"플랜 검사 트레이너 {index}",
+                phone="01000000000",
+                hire_date=date(2024, 1, 1),
+                base_salary=0
+            )
+            for index in range(max(rows // 100, 5))
+        ])
+        members = Member.objects.bulk_create([
+            Member(
+                branch=branches[index % len(branches)],
+                name=f"플랜 검사 회원 {index}",
+                phone="01000000000",
+                membership_status=rng.choice(['active', 'active', 'expired', 'suspended'])
+            )
+            for index in range(rows)
+        ])
+        program = PTProgram.objects.create(
+            branch=branches[0], name="플랜 검사", program_type='new', sessions=10, price=0
+        )
+        MemberPTRegistration.objects.bulk_create([
+            MemberPTRegistration(
+                member=member,
+                pt_program=program,
+                total_sessions=10,
+                remaining_sessions=rng.randrange(11),
+                total_price=0,
+                registration_status=rng.choice(['active', 'completed', 'expired']),
+                expiry_date=today + timedelta(days=rng.randrange(-180, 180))
+            )
+            for member in members
+        ])
+
+        reservations = []
+        used = set()
+        while len(reservations) < rows:
+            trainer = rng.choice(trainers)
+            day = today + timedelta(days=rng.randrange(-90, 60))
+            start = time(rng.randrange(6, 22))
+            if (trainer.id, day, start) in used:
+                continue
+            used.add((trainer.id, day, start))
+            reservations.append(Reservation(
+                member=rng.choice(members),
+                trainer=trainer,
+                branch_id=trainer.branch_id,
+                date=day,
+                start_time=start,
+                end_time=time(start.hour + 1),
+                duration=60,
+                reservation_status=rng.choice(['pending', 'confirmed', 'completed', 'cancelled'])
+            ))
+        reservations = Reservation.objects.bulk_create(reservations)
+        PTRecord.objects.bulk_create([
+            PTRecord(
+                reservation=reservation,
+                trainer=reservation.trainer,
+                member=reservation.member,
+                branch_id=reservation.branch_id,
+                workout_date=reservation.date,
+                workout_time=reservation.start_time,
+                duration=60,
+                content="-",
+                is_completed=True
+            )
+            for reservation in reservations
+            if reservation.reservation_status == 'completed'
+        ])
+        Notification.objects.bulk_create([
+            Notification(
+                notification_type='system',
+                recipient_type=rng.choice(['admin', 'member', 'trainer']),
+                recipient_id=rng.randrange(1, rows),
+                title="-",
+                message="-",
+                status=rng.choice(['sent', 'sent', 'read', 'read', 'pending', 'failed'])
+            )
+            for _ in range(rows * 2)
+        ])
+        return branches[0], trainers[0], members[0]
@@ -0,0 +1,49 @@
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+
+from apps.members.models import Member
+from apps.reservations.models import Reservation
+from apps.dashboards.daily_stats import daily_stats_service, RECONCILE_FUTURE_DAYS
+
+
+class Command(BaseCommand):
+    help = '지점 일별 통계 재집계 (도입 시 전체 기간 백필/복구)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--branch', type=int, action='append', help='지점 ID (여러 번 지정 가능, 기본: 전체)')
+        parser.add_argument('--start', help='시작일 (YYYY-MM-DD, 기본: 가장 오래된 회원 가입일/예약일)')
+        parser.add_argument('--end', help=f'종료일 (YYYY-MM-DD, 기본: 오늘 + {RECONCILE_FUTURE_DAYS}일)')
+        parser.add_argument('--window', type=int, default=31, help='트랜잭션 1회당 재집계 일수')
+
+    def handle(self, *args, **options):
+        try:
+            start_date = self._parse_date(options['start']) or self._earliest_date()
+            end_date = self._parse_date(options['end']) or date.today() + timedelta(days=RECONCILE_FUTURE_DAYS)
+        except ValueError:
+            raise CommandError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+        if end_date < start_date:
+            raise CommandError("종료일은 시작일 이후여야 합니다.")
+
+        window = max(options['window'], 1)
+        count = 0
+        # 구간마다 짧은 트랜잭션으로 커밋해 집계 행 잠금을 오래 잡지 않음
+        low = start_date
+        while low <= end_date:
+            high = min(low + timedelta(days=window - 1), end_date)
+            count += daily_stats_service.rebuild(low, high, options['branch'])
+            low = high + timedelta(days=1)
+
+        self.stdout.write(f"{start_date} ~ {end_date}: {count}행 재집계")
+        self.stdout.write(self.style.SUCCESS("지점 일별 통계 재집계 완료"))
+
+    def _earliest_date(self):
+        candidates = [
+            Member.objects.aggregate(first=Min('registration_date'))['first'],
+            Reservation.objects.aggregate(first=Min('date'))['first'],
+        ]
+        return min([day for day in candidates if day is not None], default=date.today())
+
+    def _parse_date(self, value):
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-18 17:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('branches', '0002_branch_closure'),
+        ('dashboards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBranchStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('new_members', models.IntegerField(default=0, verbose_name='신규 회원')),
+                ('total_members', models.IntegerField(default=0, verbose_name='전체 회원')),
+                ('active_members', models.IntegerField(default=0, verbose_name='활성 회원')),
+                ('reservations_pending', models.IntegerField(default=0, verbose_name='대기 예약')),
+                ('reservations_confirmed', models.IntegerField(default=0, verbose_name='확정 예약')),
+                ('reservations_rejected', models.IntegerField(default=0, verbose_name='거절 예약')),
+                ('reservations_cancelled', models.IntegerField(default=0, verbose_name='취소 예약')),
+                ('reservations_completed', models.IntegerField(default=0, verbose_name='완료 예약')),
+                ('reservations_no_show', models.IntegerField(default=0, verbose_name='노쇼 예약')),
+                ('completed_sessions', models.IntegerField(default=0, verbose_name='완료 PT 세션')),
+                ('pt_registrations', models.IntegerField(default=0, verbose_name='PT 등록')),
+                ('pt_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='PT 매출')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='branches.branch', verbose_name='지점')),
+            ],
+            options={
+                'verbose_name': '지점 일별 통계',
+                'verbose_name_plural': '지점 일별 통계들',
+                'ordering': ['-date', 'branch'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='dailybranchstats',
+            index=models.Index(fields=['date'], name='daily_stats_date_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailybranchstats',
+            unique_together={('branch', 'date')},
+        ),
+    ]
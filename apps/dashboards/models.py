@@ -232,3 +232,45 @@ class ReportExecution(models.Model):
     def __str__(self):
         return f"{self.report.name} - {self.get_status_display()}"
 
+
+
+class DailyBranchStats(models.Model):
+    """지점 일별 통계 집계 모델
+
+    원본 행(회원/예약/PT 기록/PT 등록)이 바뀔 때 시그널이 해당 (지점, 날짜) 행의 값을 증감하고,
+    매일 재집계 태스크가 최근 기간을 원본에서 다시 계산해 어긋난 값을 바로잡는다.
+    대시보드는 기간 통계를 원본 대신 이 표에서 인덱스 조회 1회로 합산한다.
+    """
+    branch = models.ForeignKey(
+        Branch, 
+        on_delete=models.CASCADE, 
+        verbose_name='지점'
+    )
+    date = models.DateField(verbose_name='날짜')
+    new_members = models.IntegerField(default=0, verbose_name='신규 회원')
+    # 회원 수는 그날 마지막 시점의 값 (당일 행은 실시간 반영)
+    total_members = models.IntegerField(default=0, verbose_name='전체 회원')
+    active_members = models.IntegerField(default=0, verbose_name='활성 회원')
+    reservations_pending = models.IntegerField(default=0, verbose_name='대기 예약')
+    reservations_confirmed = models.IntegerField(default=0, verbose_name='확정 예약')
+    reservations_rejected = models.IntegerField(default=0, verbose_name='거절 예약')
+    reservations_cancelled = models.IntegerField(default=0, verbose_name='취소 예약')
+    reservations_completed = models.IntegerField(default=0, verbose_name='완료 예약')
+    reservations_no_show = models.IntegerField(default=0, verbose_name='노쇼 예약')
+    completed_sessions = models.IntegerField(default=0, verbose_name='완료 PT 세션')
+    pt_registrations = models.IntegerField(default=0, verbose_name='PT 등록')
+    pt_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0, verbose_name='PT 매출')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        verbose_name = '지점 일별 통계'
+        verbose_name_plural = '지점 일별 통계들'
+        ordering = ['-date', 'branch']
+        unique_together = ['branch', 'date']
+        indexes = [
+            # 전 지점 기간 합산
+            models.Index(fields=['date'], name='daily_stats_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.branch.name} - {self.date}"
@@ -106,4 +106,15 @@ class ReportExecutionPermission(permissions.BasePermission):
         if request.user.admin_type == 'headquarters':
             return True
         
-        return obj.executed_by == request.user 
\ No newline at end of file
+        return obj.executed_by == request.user 
+
+class HeadquartersDashboardPermission(permissions.BasePermission):
+    """본사 어드민 전용 대시보드 권한 클래스 (응답 캐시 조회 전에 확인)"""
+    
+    message = '본사 어드민만 접근 가능합니다.'
+    
+    def has_permission(self, request, view):
+        if not request.user.is_authenticated:
+            return False
+        
+        return request.user.admin_type == 'headquarters'
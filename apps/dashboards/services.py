@@ -1,45 +1,49 @@
+import calendar
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Any, Optional
-from django.db.models import Count, Sum, Avg, Q
+from django.db.models import Count, Sum, Avg, Q, OuterRef, Subquery
 from django.db.models.functions import TruncDate, TruncMonth
 from apps.branches.models import Branch
 from apps.members.models import Member, MemberPTRegistration
 from apps.trainers.models import Trainer
 from apps.reservations.models import Reservation, PTRecord
 from apps.salaries.models import Salary, BranchRevenue
+from .daily_stats import daily_stats_service, RESERVATION_STATUS_FIELDS
+from .comparison import branch_comparison_service, month_period
+from .cache import dashboard_cache
 
 
 class DashboardService:
-    """대시보드 서비스"""
+    """대시보드 서비스 (통계 메서드는 지점 데이터 버전 기반 캐시를 거침)"""
     
     def __init__(self):
         pass
     
+    def _branch_ids(self, branch_id: Optional[int]) -> Optional[List[int]]:
+        """지점 일별 통계 조회 범위 (지점을 지정하지 않으면 전체)"""
+        return [branch_id] if branch_id else None
+    
+    @dashboard_cache.method('service:overview')
     def get_overview_statistics(self, branch_id: Optional[int] = None) -> Dict[str, Any]:
-        """전체 통계 개요"""
+        """전체 통계 개요 (회원/예약 수는 지점 일별 통계에서 조회)"""
         queryset_filters = {}
         if branch_id:
             queryset_filters['branch_id'] = branch_id
         
-        # 회원 통계
-        total_members = Member.objects.filter(**queryset_filters, membership_status='active').count()
-        new_members_this_month = Member.objects.filter(
-            **queryset_filters,
-            registration_date__month=datetime.now().month,
-            registration_date__year=datetime.now().year
-        ).count()
+        # 회원/예약 통계 (이번 달 합계와 오늘 값)
+        today = date.today()
+        summary = daily_stats_service.summarize(
+            today.replace(day=1),
+            today.replace(day=calendar.monthrange(today.year, today.month)[1]),
+            self._branch_ids(branch_id)
+        )
+        total_members = summary['day']['active_members']
+        new_members_this_month = summary['new_members']
+        today_reservations = summary['day']['reservations_confirmed']
         
         # 트레이너 통계
         total_trainers = Trainer.objects.filter(**queryset_filters, employment_status='active').count()
         
-        # 예약 통계
-        today = date.today()
-        today_reservations = Reservation.objects.filter(
-            **queryset_filters,
-            date=today,
-            reservation_status='confirmed'
-        ).count()
-        
         # 매출 통계 (이번 달)
         current_month = datetime.now().month
         current_year = datetime.now().year
@@ -65,6 +69,7 @@ class DashboardService:
             'monthly_revenue': monthly_revenue_amount,
         }
     
+    @dashboard_cache.method('service:weekly')
     def get_weekly_statistics(self, branch_id: Optional[int] = None, 
                             start_date: Optional[date] = None, 
                             end_date: Optional[date] = None) -> Dict[str, Any]:
@@ -74,27 +79,11 @@ class DashboardService:
         if not end_date:
             end_date = date.today()
         
-        queryset_filters = {}
-        if branch_id:
-            queryset_filters['branch_id'] = branch_id
-        
-        # 신규 회원
-        new_members = Member.objects.filter(
-            **queryset_filters,
-            registration_date__range=[start_date, end_date]
-        ).count()
-        
-        # PT 예약
-        total_reservations = Reservation.objects.filter(
-            **queryset_filters,
-            date__range=[start_date, end_date]
-        ).count()
-        
-        completed_reservations = Reservation.objects.filter(
-            **queryset_filters,
-            date__range=[start_date, end_date],
-            reservation_status='completed'
-        ).count()
+        # 신규 회원/PT 예약 (지점 일별 통계 기간 합계)
+        summary = daily_stats_service.summarize(start_date, end_date, self._branch_ids(branch_id))
+        new_members = summary['new_members']
+        total_reservations = summary['total_reservations']
+        completed_reservations = summary['reservations_completed']
         
         # 매출
         if branch_id:
@@ -117,38 +106,22 @@ class DashboardService:
             'completion_rate': (completed_reservations / total_reservations * 100) if total_reservations > 0 else 0
         }
     
+    @dashboard_cache.method('service:monthly')
     def get_monthly_statistics(self, year: int, month: int, 
                              branch_id: Optional[int] = None) -> Dict[str, Any]:
         """월간 통계"""
-        queryset_filters = {}
-        if branch_id:
-            queryset_filters['branch_id'] = branch_id
-        
-        # 회원 통계
-        total_members = Member.objects.filter(**queryset_filters, membership_status='active').count()
-        new_members = Member.objects.filter(
-            **queryset_filters,
-            registration_date__year=year,
-            registration_date__month=month
-        ).count()
-        
-        # PT 등록 통계
-        pt_registrations = MemberPTRegistration.objects.filter(
-            **queryset_filters,
-            registration_date__year=year,
-            registration_date__month=month
-        )
-        total_pt_registrations = pt_registrations.count()
-        total_pt_revenue = pt_registrations.aggregate(total=Sum('total_price'))['total'] or 0
-        
-        # 예약 통계
-        reservations = Reservation.objects.filter(
-            **queryset_filters,
-            date__year=year,
-            date__month=month
+        # 회원/PT 등록/예약 통계 (지점 일별 통계 월 합계, 회원 수는 현재 값)
+        summary = daily_stats_service.summarize(
+            date(year, month, 1),
+            date(year, month, calendar.monthrange(year, month)[1]),
+            self._branch_ids(branch_id)
         )
-        total_reservations = reservations.count()
-        completed_reservations = reservations.filter(reservation_status='completed').count()
+        total_members = summary['day']['active_members']
+        new_members = summary['new_members']
+        total_pt_registrations = summary['pt_registrations']
+        total_pt_revenue = summary['pt_revenue']
+        total_reservations = summary['total_reservations']
+        completed_reservations = summary['reservations_completed']
         
         # 매출 통계
         if branch_id:
@@ -175,6 +148,7 @@ class DashboardService:
             'completion_rate': (completed_reservations / total_reservations * 100) if total_reservations > 0 else 0
         }
     
+    @dashboard_cache.method('service:revenue-chart')
     def get_revenue_chart_data(self, branch_id: Optional[int] = None, 
                              months: int = 12) -> Dict[str, Any]:
         """매출 차트 데이터"""
@@ -205,32 +179,25 @@ class DashboardService:
             'type': 'line'
         }
     
+    @dashboard_cache.method('service:reservation-chart')
     def get_reservation_chart_data(self, branch_id: Optional[int] = None, 
                                  days: int = 30) -> Dict[str, Any]:
         """예약 차트 데이터"""
         end_date = date.today()
         start_date = end_date - timedelta(days=days)
         
-        queryset_filters = {}
-        if branch_id:
-            queryset_filters['branch_id'] = branch_id
-        
-        # 일별 예약 데이터
-        reservations = Reservation.objects.filter(
-            **queryset_filters,
-            date__range=[start_date, end_date]
-        ).annotate(
-            day=TruncDate('date')
-        ).values('day').annotate(
-            count=Count('id')
-        ).order_by('day')
+        # 일별 예약 데이터 (지점 일별 통계)
+        status_fields = list(RESERVATION_STATUS_FIELDS.values())
+        series = daily_stats_service.daily_series(start_date, end_date, status_fields, self._branch_ids(branch_id))
         
         labels = []
         data = []
         
-        for item in reservations:
-            labels.append(item['day'].strftime('%m/%d'))
-            data.append(item['count'])
+        for item in series:
+            count = sum(item[field] or 0 for field in status_fields)
+            if count:
+                labels.append(item['date'].strftime('%m/%d'))
+                data.append(count)
         
         return {
             'labels': labels,
@@ -238,32 +205,27 @@ class DashboardService:
             'type': 'bar'
         }
     
+    @dashboard_cache.method('service:member-growth')
     def get_member_growth_data(self, branch_id: Optional[int] = None, 
                              months: int = 12) -> Dict[str, Any]:
         """회원 증가 데이터"""
         end_date = date.today()
         start_date = end_date - timedelta(days=months * 30)
         
-        queryset_filters = {}
-        if branch_id:
-            queryset_filters['branch_id'] = branch_id
-        
-        # 월별 신규 회원 데이터
-        new_members = Member.objects.filter(
-            **queryset_filters,
-            registration_date__range=[start_date, end_date]
-        ).annotate(
-            month=TruncMonth('registration_date')
-        ).values('month').annotate(
-            count=Count('id')
-        ).order_by('month')
+        # 월별 신규 회원 데이터 (지점 일별 통계를 월별로 합산)
+        series = daily_stats_service.daily_series(start_date, end_date, ['new_members'], self._branch_ids(branch_id))
+        monthly = {}
+        for item in series:
+            if item['new_members']:
+                month = item['date'].replace(day=1)
+                monthly[month] = monthly.get(month, 0) + item['new_members']
         
         labels = []
         data = []
         
-        for item in new_members:
-            labels.append(item['month'].strftime('%Y년 %m월'))
-            data.append(item['count'])
+        for month, count in sorted(monthly.items()):
+            labels.append(month.strftime('%Y년 %m월'))
+            data.append(count)
         
         return {
             'labels': labels,
@@ -271,103 +233,76 @@ class DashboardService:
             'type': 'line'
         }
     
+    @dashboard_cache.method('service:trainer-performance')
     def get_trainer_performance_data(self, branch_id: Optional[int] = None, 
                                    month: Optional[int] = None, 
                                    year: Optional[int] = None) -> List[Dict[str, Any]]:
-        """트레이너 성과 데이터"""
+        """트레이너 성과 데이터
+        
+        트레이너 목록(급여 포함), 완료 PT 수, 예약 수를 각각 GROUP BY 조회 1회로 읽어
+        메모리에서 합치므로 트레이너 수와 관계없이 쿼리는 3회다.
+        """
         if not month:
             month = datetime.now().month
         if not year:
             year = datetime.now().year
+        month_start = date(year, month, 1)
+        month_end = date(year, month, calendar.monthrange(year, month)[1])
         
         queryset_filters = {}
         if branch_id:
             queryset_filters['branch_id'] = branch_id
         
+        # 트레이너 목록과 해당 월 급여 (트레이너-년-월은 유일)
         trainers = Trainer.objects.filter(**queryset_filters, employment_status='active')
+        salaries = Salary.objects.filter(trainer=OuterRef('pk'), year=year, month=month).values('total_salary')[:1]
+        trainer_rows = list(
+            trainers.annotate(month_salary=Subquery(salaries)).order_by('name', 'id').values('id', 'name', 'month_salary')
+        )
+        if not trainer_rows:
+            return []
+        
+        # 트레이너별 완료된 PT 세션 수
+        completed_sessions = dict(
+            PTRecord.objects.filter(
+                trainer__in=trainers,
+                workout_date__range=[month_start, month_end]
+            ).values('trainer_id').annotate(
+                count=Count('id', filter=Q(is_completed=True))
+            ).values_list('trainer_id', 'count')
+        )
+        
+        # 트레이너별 총 예약 수
+        total_reservations = dict(
+            Reservation.objects.filter(
+                trainer__in=trainers,
+                date__range=[month_start, month_end]
+            ).values('trainer_id').annotate(count=Count('id')).values_list('trainer_id', 'count')
+        )
         
         performance_data = []
         
-        for trainer in trainers:
-            # 완료된 PT 세션 수
-            completed_sessions = PTRecord.objects.filter(
-                trainer=trainer,
-                workout_date__year=year,
-                workout_date__month=month,
-                is_completed=True
-            ).count()
-            
-            # 총 예약 수
-            total_reservations = Reservation.objects.filter(
-                trainer=trainer,
-                date__year=year,
-                date__month=month
-            ).count()
+        for trainer in trainer_rows:
+            completed = completed_sessions.get(trainer['id'], 0)
+            reservations = total_reservations.get(trainer['id'], 0)
             
             # 완료율
-            completion_rate = (completed_sessions / total_reservations * 100) if total_reservations > 0 else 0
-            
-            # 급여
-            salary = Salary.objects.filter(
-                trainer=trainer,
-                year=year,
-                month=month
-            ).first()
+            completion_rate = (completed / reservations * 100) if reservations > 0 else 0
             
             performance_data.append({
-                'trainer_name': trainer.name,
-                'completed_sessions': completed_sessions,
-                'total_reservations': total_reservations,
+                'trainer_name': trainer['name'],
+                'completed_sessions': completed,
+                'total_reservations': reservations,
                 'completion_rate': round(completion_rate, 1),
-                'salary': float(salary.total_salary) if salary else 0
+                'salary': float(trainer['month_salary']) if trainer['month_salary'] is not None else 0
             })
         
         return performance_data
     
+    @dashboard_cache.method('service:branch-comparison')
     def get_branch_comparison_data(self, year: int, month: int) -> List[Dict[str, Any]]:
-        """지점별 비교 데이터"""
-        branches = Branch.objects.filter(is_active=True)
-        
-        comparison_data = []
-        
-        for branch in branches:
-            # 회원 수
-            total_members = Member.objects.filter(
-                branch=branch,
-                membership_status='active'
-            ).count()
-            
-            # 신규 회원
-            new_members = Member.objects.filter(
-                branch=branch,
-                registration_date__year=year,
-                registration_date__month=month
-            ).count()
-            
-            # 매출
-            revenue = BranchRevenue.objects.filter(
-                branch=branch,
-                year=year,
-                month=month
-            ).first()
-            total_revenue = revenue.total_revenue if revenue else 0
-            
-            # 예약 수
-            total_reservations = Reservation.objects.filter(
-                Q(member__branch=branch) | Q(trainer__branch=branch),
-                date__year=year,
-                date__month=month
-            ).count()
-            
-            comparison_data.append({
-                'branch_name': branch.name,
-                'total_members': total_members,
-                'new_members': new_members,
-                'total_revenue': float(total_revenue),
-                'total_reservations': total_reservations
-            })
-        
-        return comparison_data
+        """지점별 비교 데이터 (월 단위, 지점 비교 서비스 사용)"""
+        return branch_comparison_service.compare(*month_period(year, month))['branches']
     
     def get_dashboard_widgets(self, user_type: str, user_id: int) -> List[Dict[str, Any]]:
         """사용자별 대시보드 위젯"""
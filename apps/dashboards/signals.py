@@ -0,0 +1,150 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.members.models import Member, MemberPTRegistration
+from apps.trainers.models import Trainer
+from apps.reservations.models import Reservation, PTRecord
+from apps.salaries.models import Salary, BranchRevenue
+from apps.dashboards.cache import dashboard_cache
+from apps.dashboards.daily_stats import (
+    daily_stats_service, diff_facts,
+    member_facts, reservation_facts, pt_record_facts, registration_facts
+)
+
+
+@receiver(post_save, sender=Member)
+def handle_member_stats_save(sender, instance, created, **kwargs):
+    """회원 저장 시 지점 일별 통계 반영 (가입/지점 이동/상태 변경)"""
+    if not created and not instance.tracker.changed():
+        return
+    new = member_facts(instance.branch_id, instance.registration_date, instance.membership_status)
+    old = [] if created else member_facts(
+        instance.tracker.previous('branch'),
+        instance.tracker.previous('registration_date'),
+        instance.tracker.previous('membership_status')
+    )
+    daily_stats_service.apply(diff_facts(new, old))
+
+
+@receiver(post_delete, sender=Member)
+def handle_member_stats_delete(sender, instance, **kwargs):
+    """회원 삭제 시 지점 일별 통계 반영"""
+    daily_stats_service.apply(
+        diff_facts([], member_facts(instance.branch_id, instance.registration_date, instance.membership_status)),
+        create=False
+    )
+
+
+@receiver(post_save, sender=Reservation)
+def handle_reservation_stats_save(sender, instance, created, **kwargs):
+    """예약 저장 시 지점 일별 통계 반영 (생성/상태/날짜/지점 변경)"""
+    if not created and not instance.tracker.changed():
+        return
+    new = reservation_facts(instance.branch_id, instance.date, instance.reservation_status)
+    old = [] if created else reservation_facts(
+        instance.tracker.previous('branch'),
+        instance.tracker.previous('date'),
+        instance.tracker.previous('reservation_status')
+    )
+    daily_stats_service.apply(diff_facts(new, old))
+
+
+@receiver(post_delete, sender=Reservation)
+def handle_reservation_stats_delete(sender, instance, **kwargs):
+    """예약 삭제 시 지점 일별 통계 반영"""
+    daily_stats_service.apply(
+        diff_facts([], reservation_facts(instance.branch_id, instance.date, instance.reservation_status)),
+        create=False
+    )
+
+
+@receiver(post_save, sender=PTRecord)
+def handle_pt_record_stats_save(sender, instance, created, **kwargs):
+    """PT 기록 저장 시 지점 일별 통계 반영 (완료 세션)"""
+    if not created and not instance.tracker.changed():
+        return
+    new = pt_record_facts(instance.branch_id, instance.workout_date, instance.is_completed)
+    old = [] if created else pt_record_facts(
+        instance.tracker.previous('branch'),
+        instance.tracker.previous('workout_date'),
+        instance.tracker.previous('is_completed')
+    )
+    daily_stats_service.apply(diff_facts(new, old))
+
+
+@receiver(post_delete, sender=PTRecord)
+def handle_pt_record_stats_delete(sender, instance, **kwargs):
+    """PT 기록 삭제 시 지점 일별 통계 반영"""
+    daily_stats_service.apply(
+        diff_facts([], pt_record_facts(instance.branch_id, instance.workout_date, instance.is_completed)),
+        create=False
+    )
+
+
+def _member_branch_id(member_id):
+    if member_id is None:
+        return None
+    return Member.objects.filter(id=member_id).values_list('branch_id', flat=True).first()
+
+
+@receiver(post_save, sender=MemberPTRegistration)
+def handle_registration_stats_save(sender, instance, created, **kwargs):
+    """PT 등록 저장 시 지점 일별 통계 반영 (등록 수/PT 매출)"""
+    if not created and not instance.tracker.changed():
+        return
+    new = registration_facts(instance.member.branch_id, instance.registration_date, instance.total_price)
+    old = [] if created else registration_facts(
+        _member_branch_id(instance.tracker.previous('member')),
+        instance.registration_date,
+        instance.tracker.previous('total_price')
+    )
+    daily_stats_service.apply(diff_facts(new, old))
+
+
+@receiver(post_delete, sender=MemberPTRegistration)
+def handle_registration_stats_delete(sender, instance, **kwargs):
+    """PT 등록 삭제 시 지점 일별 통계 반영"""
+    daily_stats_service.apply(
+        diff_facts([], registration_facts(
+            _member_branch_id(instance.member_id), instance.registration_date, instance.total_price
+        )),
+        create=False
+    )
+
+
+# 대시보드 캐시 버전 (변경된 데이터가 속한 지점의 캐시 값을 오래된 값으로 만듦)
+
+@receiver(post_save, sender=Member)
+@receiver(post_save, sender=Reservation)
+@receiver(post_save, sender=PTRecord)
+def handle_branch_data_save(sender, instance, created, **kwargs):
+    """회원/예약/PT 기록 저장 시 대시보드 캐시 버전 증가 (지점 이동이면 이전 지점 포함)"""
+    previous = None if created else instance.tracker.previous('branch')
+    dashboard_cache.touch([instance.branch_id, previous])
+
+
+@receiver(post_delete, sender=Member)
+@receiver(post_delete, sender=Reservation)
+@receiver(post_delete, sender=PTRecord)
+@receiver(post_save, sender=Trainer)
+@receiver(post_delete, sender=Trainer)
+@receiver(post_save, sender=BranchRevenue)
+@receiver(post_delete, sender=BranchRevenue)
+def handle_branch_data_change(sender, instance, **kwargs):
+    """지점 데이터 변경/삭제 시 대시보드 캐시 버전 증가"""
+    dashboard_cache.touch([instance.branch_id])
+
+
+@receiver(post_save, sender=Salary)
+@receiver(post_delete, sender=Salary)
+def handle_salary_change(sender, instance, **kwargs):
+    """급여 변경/삭제 시 트레이너 지점의 대시보드 캐시 버전 증가"""
+    dashboard_cache.touch(
+        Trainer.objects.filter(id=instance.trainer_id).values_list('branch_id', flat=True)
+    )
+
+
+@receiver(post_save, sender=MemberPTRegistration)
+@receiver(post_delete, sender=MemberPTRegistration)
+def handle_registration_change(sender, instance, **kwargs):
+    """PT 등록 변경/삭제 시 회원 지점의 대시보드 캐시 버전 증가"""
+    dashboard_cache.touch([_member_branch_id(instance.member_id)])
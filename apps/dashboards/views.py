@@ -1,3 +1,4 @@
+import calendar
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -24,7 +25,8 @@ from .permissions import (
     UserDashboardPermission,
     UserDashboardWidgetPermission,
     ReportPermission,
-    ReportExecutionPermission
+    ReportExecutionPermission,
+    HeadquartersDashboardPermission
 )
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -41,6 +43,37 @@ from apps.trainers.models import Trainer
 from apps.reservations.models import Reservation, PTRecord
 from apps.salaries.models import Salary, BranchRevenue
 from apps.notifications.models import Notification
+from .daily_stats import daily_stats_service
+from .comparison import branch_comparison_service, month_period
+from .cache import dashboard_cache
+from clamood_gym.stats import StatsQuery, count, total, breakdown
+
+# 대시보드 통계 지표 (기준 쿼리셋별 aggregate() 1회)
+REVENUE_STATS = StatsQuery(
+    total_pt_revenue=total('pt_revenue'),
+    total_membership_revenue=total('membership_revenue'),
+    total_additional_revenue=total('additional_revenue'),
+    total_revenue=total('total_revenue'),
+)
+SALARY_STATS = StatsQuery(
+    total_base_salary=total('base_salary'),
+    total_incentive=total('incentive_amount'),
+    total_additional_revenue=total('additional_revenue'),
+    total_other_costs=total('other_costs'),
+    total_salary=total('total_salary'),
+)
+# 연령대 구간 (만 나이가 아닌 출생 연도 기준)
+AGE_RANGES = [(20, 29), (30, 39), (40, 49), (50, 59), (60, 69), (70, 79)]
+MEMBER_STATS = StatsQuery(
+    membership_stats=breakdown('membership_status'),
+    gender_stats=breakdown('gender'),
+)
+# 요일은 기존 응답과 같이 0=일요일 ~ 6=토요일 (Django week_day 는 1=일요일)
+RESERVATION_STATS = StatsQuery(
+    reservation_status_stats=breakdown('reservation_status'),
+    weekday_stats=breakdown('date__week_day', {day: day - 1 for day in range(1, 8)}, label='weekday'),
+    time_slot_stats=breakdown('start_time__hour', range(24), label='hour'),
+)
 
 
 class DashboardWidgetViewSet(viewsets.ModelViewSet):
@@ -212,80 +245,90 @@ class ReportExecutionViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(serializer.data)
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def dashboard_overview(request):
-    """대시보드 개요 통계"""
-    user = request.user
-    branch_id = request.GET.get('branch_id')
-    
-    # 권한에 따른 지점 필터링
-    if user.admin_type == 'headquarters':
-        # 본사 어드민: 전체 지점 또는 특정 지점
-        if branch_id:
-            branches = Branch.objects.filter(id=branch_id, is_active=True)
-        else:
-            branches = Branch.objects.filter(is_active=True)
-    else:
-        # 지점 어드민: 본인 지점만
-        branches = Branch.objects.filter(id=user.branch.id, is_active=True)
-    
+def _overview_statistics(branches):
+    """지점 범위의 개요 통계 (사용자와 무관한 부분, 지점 범위별로 캐시)"""
     # 현재 월
     current_date = timezone.now().date()
     current_year = current_date.year
     current_month = current_date.month
     
-    # 기본 통계
-    total_members = Member.objects.filter(branch__in=branches).count()
-    active_members = Member.objects.filter(
-        branch__in=branches, 
-        membership_status='active'
-    ).count()
+    # 회원/예약 통계 (지점 일별 통계의 이번 달 합계와 오늘 값)
+    month_end = current_date.replace(day=calendar.monthrange(current_year, current_month)[1])
+    summary = daily_stats_service.summarize(current_date.replace(day=1), month_end, branches.values('id'))
+    total_members = summary['day']['total_members']
+    active_members = summary['day']['active_members']
     
     total_trainers = Trainer.objects.filter(
         branch__in=branches, 
         employment_status='active'
     ).count()
     
-    # 이번 달 예약 통계
-    monthly_reservations = Reservation.objects.filter(
-        trainer__branch__in=branches,
-        date__year=current_year,
-        date__month=current_month
-    )
-    
-    confirmed_reservations = monthly_reservations.filter(
-        reservation_status='confirmed'
-    ).count()
-    
-    completed_reservations = monthly_reservations.filter(
-        reservation_status='completed'
-    ).count()
+    confirmed_reservations = summary['reservations_confirmed']
+    completed_reservations = summary['reservations_completed']
     
     # 이번 달 매출 통계
-    monthly_revenue = BranchRevenue.objects.filter(
+    monthly_revenue = REVENUE_STATS.collect(BranchRevenue.objects.filter(
         branch__in=branches,
         year=current_year,
         month=current_month
-    ).aggregate(
-        total_pt_revenue=Sum('pt_revenue'),
-        total_membership_revenue=Sum('membership_revenue'),
-        total_additional_revenue=Sum('additional_revenue'),
-        total_revenue=Sum('total_revenue')
-    )
+    ))
     
     # 이번 달 급여 통계
-    monthly_salary = Salary.objects.filter(
+    monthly_salary = SALARY_STATS.collect(Salary.objects.filter(
         trainer__branch__in=branches,
         year=current_year,
         month=current_month
-    ).aggregate(
-        total_base_salary=Sum('base_salary'),
-        total_incentive=Sum('incentive_amount'),
-        total_additional_revenue=Sum('additional_revenue'),
-        total_other_costs=Sum('other_costs'),
-        total_salary=Sum('total_salary')
-    )
+    ))
+    
+    return {
+        'total_members': total_members,
+        'active_members': active_members,
+        'total_trainers': total_trainers,
+        'monthly_reservations': {
+            'confirmed': confirmed_reservations,
+            'completed': completed_reservations,
+            'total': summary['total_reservations']
+        },
+        'monthly_revenue': {
+            'pt_revenue': float(monthly_revenue['total_pt_revenue']),
+            'membership_revenue': float(monthly_revenue['total_membership_revenue']),
+            'additional_revenue': float(monthly_revenue['total_additional_revenue']),
+            'total_revenue': float(monthly_revenue['total_revenue'])
+        },
+        'monthly_salary': {
+            'base_salary': float(monthly_salary['total_base_salary']),
+            'incentive': float(monthly_salary['total_incentive']),
+            'additional_revenue': float(monthly_salary['total_additional_revenue']),
+            'other_costs': float(monthly_salary['total_other_costs']),
+            'total_salary': float(monthly_salary['total_salary'])
+        }
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard_overview(request):
+    """대시보드 개요 통계"""
+    user = request.user
+    branch_id = request.GET.get('branch_id')
+    
+    # 권한에 따른 지점 필터링
+    if user.admin_type == 'headquarters':
+        # 본사 어드민: 전체 지점 또는 특정 지점
+        if branch_id:
+            branches = Branch.objects.filter(id=branch_id, is_active=True)
+        else:
+            branches = Branch.objects.filter(is_active=True)
+    else:
+        # 지점 어드민: 본인 지점만
+        branches = Branch.objects.filter(id=user.branch.id, is_active=True)
+    
+    # 지점 통계는 지점 범위별 캐시를 공유하고, 최근 알림은 사용자별로 매번 조회
+    scope = dashboard_cache.request_scope(request)
+    if scope is False:
+        overview = _overview_statistics(branches)
+    else:
+        overview = dashboard_cache.get_or_compute('overview', scope, {}, lambda: _overview_statistics(branches))
     
     # 최근 알림
     recent_notifications = Notification.objects.filter(
@@ -305,35 +348,14 @@ def dashboard_overview(request):
         })
     
     return Response({
-        'overview': {
-            'total_members': total_members,
-            'active_members': active_members,
-            'total_trainers': total_trainers,
-            'monthly_reservations': {
-                'confirmed': confirmed_reservations,
-                'completed': completed_reservations,
-                'total': monthly_reservations.count()
-            },
-            'monthly_revenue': {
-                'pt_revenue': float(monthly_revenue['total_pt_revenue'] or 0),
-                'membership_revenue': float(monthly_revenue['total_membership_revenue'] or 0),
-                'additional_revenue': float(monthly_revenue['total_additional_revenue'] or 0),
-                'total_revenue': float(monthly_revenue['total_revenue'] or 0)
-            },
-            'monthly_salary': {
-                'base_salary': float(monthly_salary['total_base_salary'] or 0),
-                'incentive': float(monthly_salary['total_incentive'] or 0),
-                'additional_revenue': float(monthly_salary['total_additional_revenue'] or 0),
-                'other_costs': float(monthly_salary['total_other_costs'] or 0),
-                'total_salary': float(monthly_salary['total_salary'] or 0)
-            }
-        },
+        'overview': overview,
         'recent_notifications': notification_data
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@dashboard_cache.view('revenue-chart')
 def revenue_chart(request):
     """매출 차트 데이터"""
     user = request.user
@@ -385,7 +407,7 @@ def revenue_chart(request):
             
             # 해당 날짜의 PT 매출 계산
             pt_revenue = PTRecord.objects.filter(
-                trainer__branch__in=branches,
+                branch__in=branches,
                 workout_date=target_date,
                 is_completed=True
             ).aggregate(
@@ -408,6 +430,7 @@ def revenue_chart(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@dashboard_cache.view('member-stats')
 def member_stats(request):
     """회원 통계"""
     user = request.user
@@ -422,56 +445,35 @@ def member_stats(request):
     else:
         branches = Branch.objects.filter(id=user.branch.id, is_active=True)
     
-    # 회원 상태별 통계
-    membership_stats = Member.objects.filter(
-        branch__in=branches
-    ).values('membership_status').annotate(
-        count=Count('id')
-    )
-    
-    # 성별 통계
-    gender_stats = Member.objects.filter(
-        branch__in=branches
-    ).values('gender').annotate(
-        count=Count('id')
+    # 회원 상태별/성별/연령대별 통계와 최근 가입 회원 수 (조회 1회)
+    current_date = timezone.now().date()
+    age_counts = {
+        f"age_{min_age}_{max_age}": count(Q(
+            birth_date__year__gte=current_date.year - max_age,
+            birth_date__year__lte=current_date.year - min_age
+        ))
+        for min_age, max_age in AGE_RANGES
+    }
+    stats = MEMBER_STATS.collect(
+        Member.objects.filter(branch__in=branches),
+        recent_members=count(Q(registration_date__gte=current_date - timedelta(days=30))),
+        **age_counts
     )
     
-    # 연령대별 통계 (생년월일 기준)
-    current_year = timezone.now().year
-    age_stats = []
-    
-    for age_range in [(20, 29), (30, 39), (40, 49), (50, 59), (60, 69), (70, 79)]:
-        min_age, max_age = age_range
-        min_birth_year = current_year - max_age
-        max_birth_year = current_year - min_age
-        
-        count = Member.objects.filter(
-            branch__in=branches,
-            birth_date__year__gte=min_birth_year,
-            birth_date__year__lte=max_birth_year
-        ).count()
-        
-        age_stats.append({
-            'age_range': f"{min_age}-{max_age}",
-            'count': count
-        })
-    
-    # 최근 가입 회원 (최근 30일)
-    recent_members = Member.objects.filter(
-        branch__in=branches,
-        registration_date__gte=timezone.now().date() - timedelta(days=30)
-    ).count()
-    
     return Response({
-        'membership_stats': list(membership_stats),
-        'gender_stats': list(gender_stats),
-        'age_stats': age_stats,
-        'recent_members': recent_members
+        'membership_stats': stats['membership_stats'],
+        'gender_stats': stats['gender_stats'],
+        'age_stats': [
+            {'age_range': f"{min_age}-{max_age}", 'count': stats[f"age_{min_age}_{max_age}"]}
+            for min_age, max_age in AGE_RANGES
+        ],
+        'recent_members': stats['recent_members']
     })
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@dashboard_cache.view('trainer-stats')
 def trainer_stats(request):
     """트레이너 통계"""
     user = request.user
@@ -489,7 +491,7 @@ def trainer_stats(request):
     # 트레이너별 PT 완료 통계 (이번 달)
     current_date = timezone.now().date()
     trainer_pt_stats = PTRecord.objects.filter(
-        trainer__branch__in=branches,
+        branch__in=branches,
         workout_date__year=current_date.year,
         workout_date__month=current_date.month,
         is_completed=True
@@ -526,6 +528,7 @@ def trainer_stats(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@dashboard_cache.view('reservation-stats')
 def reservation_stats(request):
     """예약 통계"""
     user = request.user
@@ -540,85 +543,57 @@ def reservation_stats(request):
     else:
         branches = Branch.objects.filter(id=user.branch.id, is_active=True)
     
-    # 예약 상태별 통계 (이번 달)
+    # 이번 달 예약 상태별/요일별/시간대별 통계 (조회 1회)
     current_date = timezone.now().date()
-    reservation_status_stats = Reservation.objects.filter(
-        trainer__branch__in=branches,
-        date__year=current_date.year,
-        date__month=current_date.month
-    ).values('reservation_status').annotate(
-        count=Count('id')
-    )
-    
-    # 요일별 예약 통계
-    weekday_stats = Reservation.objects.filter(
-        trainer__branch__in=branches,
-        date__year=current_date.year,
-        date__month=current_date.month
-    ).extra(
-        select={'weekday': "EXTRACT(dow FROM date)"}
-    ).values('weekday').annotate(
-        count=Count('id')
-    ).order_by('weekday')
-    
-    # 시간대별 예약 통계
-    time_slot_stats = Reservation.objects.filter(
-        trainer__branch__in=branches,
+    stats = RESERVATION_STATS.collect(Reservation.objects.filter(
+        branch__in=branches,
         date__year=current_date.year,
         date__month=current_date.month
-    ).extra(
-        select={'hour': "EXTRACT(hour FROM start_time)"}
-    ).values('hour').annotate(
-        count=Count('id')
-    ).order_by('hour')
+    ))
     
-    return Response({
-        'reservation_status_stats': list(reservation_status_stats),
-        'weekday_stats': list(weekday_stats),
-        'time_slot_stats': list(time_slot_stats)
-    })
+    return Response(stats)
 
 
 @api_view(['GET'])
-@permission_classes([IsAuthenticated])
+@permission_classes([IsAuthenticated, HeadquartersDashboardPermission])
+@dashboard_cache.view('branch-comparison')
 def branch_comparison(request):
     """지점별 비교 통계 (본사 어드민만)"""
-    user = request.user
-    
-    if user.admin_type != 'headquarters':
-        return Response(
-            {'error': '본사 어드민만 접근 가능합니다.'},
-            status=status.HTTP_403_FORBIDDEN
-        )
-    
-    current_date = timezone.now().date()
-    
-    # 지점별 회원 수
-    branch_member_stats = Member.objects.filter(
-        membership_status='active'
-    ).values('branch__name').annotate(
-        member_count=Count('id')
-    ).order_by('-member_count')
-    
-    # 지점별 트레이너 수
-    branch_trainer_stats = Trainer.objects.filter(
-        employment_status='active'
-    ).values('branch__name').annotate(
-        trainer_count=Count('id')
-    ).order_by('-trainer_count')
-    
-    # 지점별 매출 (이번 달)
-    branch_revenue_stats = BranchRevenue.objects.filter(
-        year=current_date.year,
-        month=current_date.month
-    ).values('branch__name').annotate(
-        total_revenue=Sum('total_revenue'),
-        pt_revenue=Sum('pt_revenue'),
-        membership_revenue=Sum('membership_revenue')
-    ).order_by('-total_revenue')
-    
-    return Response({
-        'branch_member_stats': list(branch_member_stats),
-        'branch_trainer_stats': list(branch_trainer_stats),
-        'branch_revenue_stats': list(branch_revenue_stats)
-    })
+    params = request.query_params
+    current_date = timezone.localdate()
+    
+    # 기간: ?start=YYYY-MM-DD&end=YYYY-MM-DD 또는 ?year=&month= (기본 이번 달)
+    try:
+        if params.get('start') or params.get('end'):
+            start_date = date.fromisoformat(params.get('start') or current_date.replace(day=1).isoformat())
+            end_date = date.fromisoformat(params['end']) if params.get('end') else current_date
+        else:
+            start_date, end_date = month_period(
+                int(params.get('year', current_date.year)),
+                int(params.get('month', current_date.month))
+            )
+        comparison = branch_comparison_service.compare(start_date, end_date)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    branches = comparison['branches']
+    
+    # 기존 응답 형식 (지점별 회원/트레이너/매출 순위 목록) 유지
+    comparison['branch_member_stats'] = [
+        {'branch__name': branch['branch_name'], 'member_count': branch['total_members']}
+        for branch in sorted(branches, key=lambda branch: branch['ranks']['total_members'])
+    ]
+    comparison['branch_trainer_stats'] = [
+        {'branch__name': branch['branch_name'], 'trainer_count': branch['trainer_count']}
+        for branch in sorted(branches, key=lambda branch: branch['ranks']['trainer_count'])
+    ]
+    comparison['branch_revenue_stats'] = [
+        {
+            'branch__name': branch['branch_name'],
+            'total_revenue': branch['total_revenue'],
+            'pt_revenue': branch['pt_revenue'],
+            'membership_revenue': branch['membership_revenue']
+        }
+        for branch in sorted(branches, key=lambda branch: branch['ranks']['total_revenue'])
+    ]
+    return Response(comparison)
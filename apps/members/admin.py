@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Member, PTProgram, MemberPTRegistration
+from clamood_gym.concurrency import VersionedAdminMixin
 
 
 @admin.register(Member)
@@ -56,12 +57,12 @@ class PTProgramAdmin(admin.ModelAdmin):
 
 
 @admin.register(MemberPTRegistration)
-class MemberPTRegistrationAdmin(admin.ModelAdmin):
+class MemberPTRegistrationAdmin(VersionedAdminMixin, admin.ModelAdmin):
     list_display = ['member', 'pt_program', 'trainer', 'total_sessions', 'remaining_sessions', 'registration_status', 'registration_date']
     list_filter = ['registration_status', 'registration_date', 'pt_program']
     search_fields = ['member__name', 'pt_program__name', 'trainer__name']
     ordering = ['-registration_date']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['registration_date', 'created_at', 'updated_at']
     
     fieldsets = (
         ('등록 정보', {
@@ -71,7 +72,7 @@ class MemberPTRegistrationAdmin(admin.ModelAdmin):
             'fields': ('total_sessions', 'remaining_sessions', 'total_price', 'paid_amount')
         }),
         ('상태', {
-            'fields': ('registration_status', 'registration_date', 'expiry_date')
+            'fields': ('registration_status', 'registration_date', 'expiry_date', 'version')
         }),
         ('메모', {
             'fields': ('notes',)
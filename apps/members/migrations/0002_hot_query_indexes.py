@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['branch', 'membership_status'], name='member_branch_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='memberptregistration',
+            index=models.Index(fields=['expiry_date', 'registration_status'], name='ptreg_expiry_status_idx'),
+        ),
+    ]
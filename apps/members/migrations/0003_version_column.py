@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-18 16:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memberptregistration',
+            name='version',
+            field=models.PositiveIntegerField(default=1, verbose_name='버전'),
+        ),
+    ]
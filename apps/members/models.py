@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.validators import RegexValidator
+from model_utils import FieldTracker
 from apps.branches.models import Branch
+from clamood_gym.concurrency import OptimisticLockMixin
 
 
 class Member(models.Model):
@@ -57,6 +59,8 @@ class Member(models.Model):
     registration_date = models.DateField(auto_now_add=True, verbose_name='가입일')
     expiry_date = models.DateField(verbose_name='만료일', null=True, blank=True)
     notes = models.TextField(verbose_name='메모', blank=True)
+    # 캘린더 구독 토큰 버전 (구독 URL 재발급 시 1 증가, 이전 URL 무효화)
+    calendar_token_version = models.PositiveIntegerField(default=1, editable=False, verbose_name='캘린더 토큰 버전')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
@@ -64,9 +68,16 @@ class Member(models.Model):
         verbose_name = '회원'
         verbose_name_plural = '회원들'
         ordering = ['-created_at']
+        indexes = [
+            # 지점별 활성 회원 집계
+            models.Index(fields=['branch', 'membership_status'], name='member_branch_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.branch.name})"
+    
+    # 필드 변경 추적 (지점 일별 통계 증감)
+    tracker = FieldTracker(fields=['branch', 'membership_status', 'registration_date'])
 
 
 class PTProgram(models.Model):
@@ -108,7 +119,7 @@ class PTProgram(models.Model):
         return f"{self.name} ({self.get_program_type_display()})"
 
 
-class MemberPTRegistration(models.Model):
+class MemberPTRegistration(OptimisticLockMixin, models.Model):
     """회원 PT 등록 모델"""
     REGISTRATION_STATUS_CHOICES = [
         ('active', '활성'),
@@ -156,6 +167,8 @@ class MemberPTRegistration(models.Model):
     registration_date = models.DateTimeField(auto_now_add=True, verbose_name='등록일')
     expiry_date = models.DateField(verbose_name='만료일', null=True, blank=True)
     notes = models.TextField(verbose_name='메모', blank=True)
+    # 낙관적 동시성 제어 버전 (저장할 때마다 1씩 증가)
+    version = models.PositiveIntegerField(default=1, verbose_name='버전')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
@@ -163,6 +176,10 @@ class MemberPTRegistration(models.Model):
         verbose_name = '회원 PT 등록'
         verbose_name_plural = '회원 PT 등록들'
         ordering = ['-registration_date']
+        indexes = [
+            # 만료 예정/만료 처리 태스크
+            models.Index(fields=['expiry_date', 'registration_status'], name='ptreg_expiry_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.member.name} - {self.pt_program.name}"
@@ -173,4 +190,7 @@ class MemberPTRegistration(models.Model):
             return 0
         completed = self.total_sessions - self.remaining_sessions
         return (completed / self.total_sessions) * 100
+    
+    # 필드 변경 추적 (지점 일별 통계 증감)
+    tracker = FieldTracker(fields=['member', 'total_price'])
 
@@ -29,7 +29,7 @@ class MemberPTRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = MemberPTRegistration
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('version', 'created_at', 'updated_at')
 
 class MemberDetailSerializer(serializers.ModelSerializer):
     """회원 상세 정보 시리얼라이저"""
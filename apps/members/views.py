@@ -1,8 +1,11 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
+from django.urls import reverse
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Sum
+from django.db.models import Q, Sum
+from django.utils import timezone
 from .models import Member, PTProgram, MemberPTRegistration
 from .serializers import (
     MemberSerializer, 
@@ -12,6 +15,31 @@ from .serializers import (
     PTProgramDetailSerializer
 )
 from .permissions import MemberPermission, PTProgramPermission, MemberPTRegistrationPermission
+from apps.reservations.ics import ICSRenderer, feed_token, rotate_feed_token, member_calendar_response
+from clamood_gym.concurrency import VersionedViewSetMixin
+from clamood_gym.stats import StatsQuery, count, total, breakdown, Stat
+
+# 통계 액션 지표 (각각 aggregate() 1회)
+MEMBER_STATS = StatsQuery(
+    total_members=count(),
+    active_members=count(Q(membership_status='active')),
+    expired_members=count(Q(membership_status='expired')),
+    gender_distribution=breakdown('gender'),
+)
+# 프로그램-등록 JOIN 으로 프로그램 행이 반복되므로 프로그램 수는 중복 없이 센다
+PT_PROGRAM_STATS = StatsQuery(
+    total_programs=count(distinct=True),
+    active_programs=count(Q(is_active=True), distinct=True),
+    program_types=breakdown('program_type', distinct=True),
+    total_revenue=total('memberptregistration__total_price'),
+)
+PT_REGISTRATION_STATS = StatsQuery(
+    total_registrations=count(),
+    active_registrations=count(Q(registration_status='active')),
+    completed_registrations=count(Q(registration_status='completed')),
+    total_revenue=total('total_price'),
+    average_completion_rate=Stat(Sum('remaining_sessions') * 100.0 / Sum('total_sessions')),
+)
 
 class MemberViewSet(viewsets.ModelViewSet):
     """회원 API 뷰셋"""
@@ -41,25 +69,15 @@ class MemberViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """회원 통계 정보"""
-        queryset = self.get_queryset()
-        
-        # 현재 월의 신규 회원 수 계산
-        from django.utils import timezone
-        current_month = timezone.now().month
-        current_year = timezone.now().year
-        
-        monthly_registrations = queryset.filter(
-            registration_date__year=current_year,
-            registration_date__month=current_month
-        ).count()
-        
-        stats = {
-            'total_members': queryset.count(),
-            'active_members': queryset.filter(membership_status='active').count(),
-            'expired_members': queryset.filter(membership_status='expired').count(),
-            'gender_distribution': queryset.values('gender').annotate(count=Count('id')),
-            'monthly_registrations': monthly_registrations,
-        }
+        # 현재 월의 신규 회원 수 포함
+        current_date = timezone.now()
+        stats = MEMBER_STATS.collect(
+            self.get_queryset(),
+            monthly_registrations=count(Q(
+                registration_date__year=current_date.year,
+                registration_date__month=current_date.month
+            ))
+        )
         
         return Response(stats)
     
@@ -71,6 +89,19 @@ class MemberViewSet(viewsets.ModelViewSet):
         serializer = MemberPTRegistrationSerializer(registrations, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['get'], renderer_classes=[JSONRenderer, ICSRenderer])
+    def calendar(self, request, pk=None):
+        """회원 예약 캘린더 (ICS, If-None-Match 지원)"""
+        return member_calendar_response(request, self.get_object())
+    
+    @action(detail=True, methods=['get', 'post'], url_path='calendar-link')
+    def calendar_link(self, request, pk=None):
+        """회원 캘린더 구독 URL (로그인 없이 캘린더 앱에서 구독, POST 는 재발급 후 이전 URL 무효화)"""
+        member = self.get_object()
+        token = rotate_feed_token('member', member) if request.method == 'POST' else feed_token('member', member)
+        url = reverse('reservations:calendar-feed', args=[token])
+        return Response({'url': request.build_absolute_uri(url)})
+
 class PTProgramViewSet(viewsets.ModelViewSet):
     """PT 프로그램 API 뷰셋"""
     queryset = PTProgram.objects.all()
@@ -99,21 +130,12 @@ class PTProgramViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """PT 프로그램 통계 정보"""
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total_programs': queryset.count(),
-            'active_programs': queryset.filter(is_active=True).count(),
-            'program_types': queryset.values('program_type').annotate(count=Count('id')),
-            'total_revenue': queryset.aggregate(
-                total=Sum('memberptregistration__total_price')
-            )['total'] or 0,
-        }
+        stats = PT_PROGRAM_STATS.collect(self.get_queryset())
         
         return Response(stats)
 
-class MemberPTRegistrationViewSet(viewsets.ModelViewSet):
-    """회원 PT 등록 API 뷰셋"""
+class MemberPTRegistrationViewSet(VersionedViewSetMixin, viewsets.ModelViewSet):
+    """회원 PT 등록 API 뷰셋 (수정 시 버전 충돌이면 409)"""
     queryset = MemberPTRegistration.objects.all()
     serializer_class = MemberPTRegistrationSerializer
     permission_classes = [MemberPTRegistrationPermission]
@@ -134,16 +156,6 @@ class MemberPTRegistrationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """PT 등록 통계 정보"""
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total_registrations': queryset.count(),
-            'active_registrations': queryset.filter(registration_status='active').count(),
-            'completed_registrations': queryset.filter(registration_status='completed').count(),
-            'total_revenue': queryset.aggregate(total=Sum('total_price'))['total'] or 0,
-            'average_completion_rate': queryset.aggregate(
-                avg_rate=Sum('remaining_sessions') * 100.0 / Sum('total_sessions')
-            )['avg_rate'] or 0,
-        }
+        stats = PT_REGISTRATION_STATS.collect(self.get_queryset())
         
         return Response(stats)
@@ -0,0 +1,145 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+
+from clamood_gym.transactions import SavepointBuffers
+
+logger = logging.getLogger(__name__)
+
+
+# 브로커 발행 재시도 정책 (Redis 가 느릴 때 요청이 오래 묶이지 않도록 짧게)
+PUBLISH_RETRY_POLICY = {
+    'max_retries': 1,
+    'interval_start': 0,
+    'interval_step': 0.2,
+    'interval_max': 0.2,
+}
+
+
+class TaskIntent:
+    """발행 예정 태스크
+
+    같은 key 의 의도가 한 트랜잭션에서 여러 번 쌓이면 merge 로 하나로 합친다.
+    """
+
+    def __init__(self, task_name: str, args: Sequence[Any] = (), key: Optional[Hashable] = None):
+        self.task_name = task_name
+        self.args = list(args)
+        self.key = key if key is not None else (task_name, tuple(self.args))
+
+    def merge(self, later: 'TaskIntent') -> 'TaskIntent':
+        """같은 key 의 나중 의도와 병합 (기본: 중복 제거)"""
+        return self
+
+    def resolve(self) -> Optional[Tuple[str, List[Any]]]:
+        """발행할 (태스크 이름, 인자), 보낼 것이 없으면 None"""
+        return self.task_name, self.args
+
+
+class ReservationNotificationIntent(TaskIntent):
+    """예약 알림 의도 (생성/상태 변경을 예약별로 하나로 병합)"""
+
+    def __init__(self, reservation_id: int, created: bool, previous_status: str, status: str):
+        super().__init__(
+            'apps.notifications.tasks.send_reservation_request_notification',
+            [reservation_id],
+            key=('reservation', reservation_id)
+        )
+        self.reservation_id = reservation_id
+        self.created = created
+        self.previous_status = previous_status
+        self.status = status
+
+    def merge(self, later: 'ReservationNotificationIntent') -> 'ReservationNotificationIntent':
+        # 처음 상태는 유지하고 마지막 상태만 반영 (생성 후 확정 → 확정 알림 1건)
+        return ReservationNotificationIntent(
+            self.reservation_id,
+            self.created or later.created,
+            self.previous_status,
+            later.status
+        )
+
+    def resolve(self):
+        if self.status != self.previous_status:
+            return 'apps.notifications.tasks.send_reservation_status_notification', [self.reservation_id, self.status]
+        if self.created:
+            return self.task_name, self.args
+        # 상태가 바뀌었다가 원래대로 돌아온 경우
+        return None
+
+
+class NotificationBatchIntent(TaskIntent):
+    """생성된 알림 일괄 전송 의도 (트랜잭션 내 알림 ID 를 하나로 합침)"""
+
+    def __init__(self, notification_ids: Sequence[int]):
+        super().__init__(
+            'apps.notifications.tasks.send_notifications_batch',
+            [list(notification_ids)],
+            key='notifications_batch'
+        )
+
+    def merge(self, later: 'NotificationBatchIntent') -> 'NotificationBatchIntent':
+        return NotificationBatchIntent(self.args[0] + later.args[0])
+
+
+class TaskDispatcher:
+    """트랜잭션 인지 태스크 발행기
+
+    트랜잭션 안에서 쌓인 태스크 의도를 커밋 시점에 병합해 메시지 1건으로 발행하고,
+    브로커에 연결할 수 없으면 NotificationOutbox 에 보관해 주기 태스크가 처리하게 한다.
+    의도는 세이브포인트별로 모으므로 롤백된 트랜잭션이나 세이브포인트에서 쌓인 의도는 발행하지 않는다.
+    """
+
+    def __init__(self):
+        self._pending = SavepointBuffers(self._flush)
+
+    def enqueue(self, intent: TaskIntent):
+        """태스크 의도 등록 (트랜잭션 밖이면 즉시 발행)"""
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            self.publish([intent])
+            return
+
+        self._pending.add(intent)
+
+    def _flush(self, intents: List[TaskIntent]):
+        """커밋된 트랜잭션의 의도를 등록 순서대로 병합해 발행"""
+        buffer: 'OrderedDict[Hashable, TaskIntent]' = OrderedDict()
+        for intent in intents:
+            if intent.key in buffer:
+                buffer[intent.key] = buffer[intent.key].merge(intent)
+            else:
+                buffer[intent.key] = intent
+        self.publish(list(buffer.values()))
+
+    def publish(self, intents: Sequence[TaskIntent]) -> bool:
+        """의도 목록을 메시지 1건으로 발행 (실패 시 아웃박스에 보관)"""
+        batch = [resolved for resolved in (intent.resolve() for intent in intents) if resolved]
+        if not batch:
+            return True
+
+        from .tasks import run_task_batch
+
+        try:
+            run_task_batch.apply_async(args=[batch], retry=True, retry_policy=PUBLISH_RETRY_POLICY)
+            return True
+        except Exception as e:
+            logger.warning(f"태스크 발행 실패, 아웃박스에 보관: {str(e)}")
+            self._spill(batch, str(e))
+            return False
+
+    def _spill(self, batch: Sequence[Tuple[str, List[Any]]], error: str):
+        from .models import NotificationOutbox
+
+        try:
+            NotificationOutbox.objects.bulk_create([
+                NotificationOutbox(task_name=task_name, args=args, last_error=error)
+                for task_name, args in batch
+            ])
+        except Exception as e:
+            logger.error(f"아웃박스 보관 실패, 태스크 {len(batch)}건 유실: {str(e)}")
+
+
+task_dispatcher = TaskDispatcher()
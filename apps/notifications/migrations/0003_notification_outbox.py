@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(max_length=200, verbose_name='태스크')),
+                ('args', models.JSONField(default=list, verbose_name='인자')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='처리 시도 횟수')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '알림 아웃박스',
+                'verbose_name_plural': '알림 아웃박스들',
+                'ordering': ['id'],
+            },
+        ),
+    ]
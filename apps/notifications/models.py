@@ -81,6 +81,22 @@ class Notification(models.Model):
         verbose_name = '알림'
         verbose_name_plural = '알림들'
         ordering = ['-created_at']
+        indexes = [
+            # 수신자별 최근 알림 조회
+            models.Index(fields=['recipient_type', 'recipient_id', '-created_at'], name='notif_recipient_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='notif_status_created_idx'),
+            # 전송 대기/실패 알림 큐 (부분 인덱스)
+            models.Index(
+                fields=['created_at'],
+                name='notif_pending_created_idx',
+                condition=models.Q(status='pending')
+            ),
+            models.Index(
+                fields=['created_at'],
+                name='notif_failed_created_idx',
+                condition=models.Q(status='failed')
+            ),
+        ]
 
     def __str__(self):
         return f"{self.get_notification_type_display()} - {self.title}"
@@ -96,6 +112,23 @@ class Notification(models.Model):
         return None
 
 
+class NotificationOutbox(models.Model):
+    """알림 태스크 아웃박스 모델 (브로커 장애 시 발행하지 못한 태스크 보관)"""
+    task_name = models.CharField(max_length=200, verbose_name='태스크')
+    args = models.JSONField(default=list, verbose_name='인자')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='처리 시도 횟수')
+    last_error = models.TextField(verbose_name='마지막 오류', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+
+    class Meta:
+        verbose_name = '알림 아웃박스'
+        verbose_name_plural = '알림 아웃박스들'
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.task_name} ({self.created_at})"
+
+
 class NotificationTemplate(models.Model):
     """알림 템플릿 모델"""
     NOTIFICATION_TYPE_CHOICES = [
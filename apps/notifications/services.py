@@ -1,9 +1,10 @@
 import requests
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 from django.conf import settings
 from django.utils import timezone
 from .models import Notification, NotificationLog
+from .dispatch import task_dispatcher, NotificationBatchIntent
 
 logger = logging.getLogger(__name__)
 
@@ -198,6 +199,22 @@ class NotificationService:
         recipient_id: int
     ):
         """예약 관련 알림 전송"""
+        content = self._reservation_message(reservation, notification_type)
+        if content is None:
+            return None
+        title, message = content
+        
+        return self.create_notification(
+            notification_type=notification_type,
+            recipient_type=recipient_type,
+            recipient_id=recipient_id,
+            title=title,
+            message=message,
+            related_reservation=reservation.id
+        )
+    
+    def _reservation_message(self, reservation, notification_type: str) -> Optional[Tuple[str, str]]:
+        """예약 알림 유형별 제목/메시지"""
         if notification_type == 'reservation_request':
             title = "새로운 PT 예약 요청"
             message = f"{reservation.member.name} 회원님이 {reservation.date} {reservation.start_time}에 PT 예약을 요청했습니다."
@@ -215,11 +232,63 @@ class NotificationService:
             message = f"내일 {reservation.start_time}에 PT 예약이 있습니다. 준비해주세요."
         else:
             return None
+        return title, message
+    
+    def send_reservation_notifications(
+        self,
+        notification_type: str,
+        recipients: Sequence[Tuple[Any, str, int]]
+    ) -> List[Notification]:
+        """예약 관련 알림 일괄 생성 후 커밋 시 한 번에 전송 요청
+        
+        recipients 는 (예약, 수신자 유형, 수신자 ID) 목록
+        """
+        notifications = []
+        for reservation, recipient_type, recipient_id in recipients:
+            content = self._reservation_message(reservation, notification_type)
+            if content is None:
+                continue
+            title, message = content
+            notifications.append(Notification(
+                notification_type=notification_type,
+                recipient_type=recipient_type,
+                recipient_id=recipient_id,
+                title=title,
+                message=message,
+                related_reservation_id=reservation.id
+            ))
+        if not notifications:
+            return []
+        
+        notifications = Notification.objects.bulk_create(notifications)
+        # 커밋 시 같은 트랜잭션의 다른 알림과 합쳐 태스크 1건으로 발행
+        task_dispatcher.enqueue(NotificationBatchIntent([notification.id for notification in notifications]))
+        return notifications
+    
+    def send_notifications(self, notification_ids: Sequence[int]) -> int:
+        """대기중인 알림 일괄 전송"""
+        sent_count = 0
+        for notification in Notification.objects.filter(id__in=notification_ids, status='pending'):
+            if self.send_notification(notification):
+                sent_count += 1
+        return sent_count
+    
+    def send_repeat_reservation_notification(self, reservation, created_count: int, skipped_count: int = 0):
+        """반복 예약 요청 알림 전송 (반복 예약 시리즈당 1건)"""
+        title = "새로운 PT 반복 예약 요청"
+        message = (
+            f"{reservation.member.name} 회원님이 {reservation.date}부터 {reservation.repeat_end_date}까지 "
+            f"{reservation.start_time} PT 반복 예약을 요청했습니다. "
+            f"(총 {created_count + 1}건"
+        )
+        if skipped_count:
+            message += f", 충돌로 제외된 {skipped_count}건"
+        message += ")"
         
         return self.create_notification(
-            notification_type=notification_type,
-            recipient_type=recipient_type,
-            recipient_id=recipient_id,
+            notification_type='reservation_request',
+            recipient_type='trainer',
+            recipient_id=reservation.trainer.id,
             title=title,
             message=message,
             related_reservation=reservation.id
@@ -239,6 +308,23 @@ class NotificationService:
             related_reservation=pt_record.reservation.id
         )
     
+    def send_pt_completion_notifications(self, pt_records) -> List[Notification]:
+        """PT 완료 알림 일괄 생성 후 커밋 시 한 번에 전송 요청"""
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                notification_type='pt_completed',
+                recipient_type='trainer',
+                recipient_id=pt_record.trainer_id,
+                title="PT 세션이 완료되었습니다",
+                message=f"{pt_record.member.name} 회원님의 PT 세션이 성공적으로 완료되었습니다. 수행 내역을 확인해주세요.",
+                related_reservation_id=pt_record.reservation_id
+            )
+            for pt_record in pt_records
+        ])
+        if notifications:
+            task_dispatcher.enqueue(NotificationBatchIntent([notification.id for notification in notifications]))
+        return notifications
+    
     def send_salary_notification(self, salary):
         """급여 지급 알림 전송"""
         title = "급여 지급 완료"
@@ -1,17 +1,23 @@
 import logging
 from datetime import datetime, date, timedelta
-from celery import shared_task
+from celery import shared_task, current_app
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import F, Q
 from django.db import transaction
-from apps.notifications.models import Notification, NotificationTemplate, NotificationLog
-from apps.reservations.models import Reservation, PTRecord
+from apps.notifications.models import Notification, NotificationTemplate, NotificationLog, NotificationOutbox
+from apps.reservations.models import Reservation, PTRecord, TrainerDayOccupancy
+from apps.reservations.occupancy import rebuild_occupancy, OCCUPANCY_HORIZON_DAYS
+from apps.reservations.idempotency import cleanup_idempotency_keys
+from apps.reservations.today_board import today_board_service
+from apps.reservations.inbox import pending_inbox_service
+from apps.branches.closures import closure_calendar
 from apps.trainers.models import Trainer
 from apps.members.models import Member
 from apps.salaries.models import Salary, BranchRevenue
 from apps.salaries.services import salary_calculation_service, branch_revenue_service
 from apps.members.models import MemberPTRegistration
 from apps.dashboards.services import dashboard_service
+from apps.dashboards.daily_stats import daily_stats_service
 from apps.notifications.services import notification_service
 
 
@@ -31,6 +37,9 @@ def send_reservation_reminders():
     
     sent_count = 0
     for reservation in reservations:
+        # 지점 휴무 시간대의 예약은 알림 제외
+        if closure_calendar.is_closed(reservation.branch_id, reservation.date, reservation.start_time, reservation.end_time):
+            continue
         try:
             # 트레이너에게 알림
             notification_service.send_reservation_notification(
@@ -67,6 +76,10 @@ def send_daily_notifications():
     )
     
     for reservation in reservations:
+        # 지점 휴무 시간대의 예약은 알림 제외
+        if closure_calendar.is_closed(reservation.branch_id, reservation.date, reservation.start_time, reservation.end_time):
+            continue
+        
         # PT 시작 1시간 전 알림
         start_time = datetime.combine(today, reservation.start_time)
         if start_time - timezone.now() <= timedelta(hours=1):
@@ -144,6 +157,95 @@ def cleanup_old_notifications():
     return f"오래된 알림 {deleted_count}건 삭제 완료"
 
 
+@shared_task
+def run_task_batch(batch):
+    """트랜잭션 커밋 시 묶어서 발행된 태스크들을 순서대로 실행"""
+    succeeded = 0
+    for task_name, args in batch:
+        try:
+            current_app.tasks[task_name](*args)
+            succeeded += 1
+        except Exception as e:
+            logger.error(f"묶음 태스크 실행 실패 ({task_name}): {str(e)}")
+    
+    return f"묶음 태스크 {len(batch)}건 중 {succeeded}건 실행 완료"
+
+
+@shared_task
+def flush_notification_outbox(limit=500):
+    """아웃박스에 보관된 태스크 처리 (매분 실행)"""
+    with transaction.atomic():
+        # 여러 워커가 동시에 실행해도 같은 행을 중복 처리하지 않도록 잠긴 행은 건너뜀
+        entries = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True).order_by('id')[:limit]
+        )
+        done_ids = []
+        failed = []
+        for entry in entries:
+            try:
+                with transaction.atomic():
+                    current_app.tasks[entry.task_name](*entry.args)
+                done_ids.append(entry.id)
+            except Exception as e:
+                entry.attempts += 1
+                entry.last_error = str(e)
+                failed.append(entry)
+        
+        NotificationOutbox.objects.filter(id__in=done_ids).delete()
+        if failed:
+            NotificationOutbox.objects.bulk_update(failed, ['attempts', 'last_error'])
+    
+    return f"아웃박스 {len(done_ids)}건 처리, {len(failed)}건 실패"
+
+
+@shared_task
+def send_notifications_batch(notification_ids):
+    """알림 일괄 전송 태스크"""
+    sent_count = notification_service.send_notifications(notification_ids)
+    return f"알림 {len(notification_ids)}건 중 {sent_count}건 전송 완료"
+
+
+@shared_task
+def rebuild_trainer_occupancy():
+    """트레이너 일별 점유 비트마스크 재생성 태스크 (매일 실행)"""
+    # 예약 시 행을 저장하는 기간(오늘부터 30일 뒤까지)을 재생성하고 지난 날짜 행은 삭제
+    today = timezone.localdate()
+    trainer_ids = list(Trainer.objects.filter(employment_status='active').values_list('id', flat=True))
+    rebuilt_count = rebuild_occupancy(trainer_ids, today, today + timedelta(days=OCCUPANCY_HORIZON_DAYS))
+    deleted_count = TrainerDayOccupancy.objects.filter(date__lt=today).delete()[0]
+    
+    return f"점유 비트마스크 {rebuilt_count}행 재생성, {deleted_count}행 삭제 완료"
+
+
+@shared_task
+def reconcile_daily_branch_stats():
+    """지점 일별 통계 재집계 태스크 (매일 실행, 증감 반영 중 어긋난 값 보정)"""
+    count = daily_stats_service.reconcile()
+    return f"지점 일별 통계 {count}행 재집계 완료"
+
+
+@shared_task
+def build_today_boards():
+    """지점 당일 예약 보드 생성 태스크 (매일 실행)"""
+    built_count = today_board_service.prebuild()
+    deleted_count = today_board_service.cleanup()
+    return f"당일 예약 보드 {built_count}건 생성, 지난 보드 항목 {deleted_count}건 삭제 완료"
+
+
+@shared_task
+def expire_stale_pending_reservations():
+    """응답 기한이 지난 대기 예약 요청 일괄 만료 태스크 (매시간 실행)"""
+    expired_count = pending_inbox_service.expire_stale()
+    return f"대기 예약 요청 {expired_count}건 만료 처리 완료"
+
+
+@shared_task
+def cleanup_expired_idempotency_keys():
+    """보관 기간이 지난 멱등성 키 정리 태스크 (매시간 실행)"""
+    deleted_count = cleanup_idempotency_keys()
+    return f"만료된 멱등성 키 {deleted_count}건 삭제 완료"
+
+
 @shared_task
 def retry_failed_notifications():
     """실패한 알림 재전송 태스크 (매시간 실행)"""
@@ -291,7 +393,7 @@ def update_expired_pt_registrations():
     expired_count = MemberPTRegistration.objects.filter(
         expiry_date__lt=timezone.now().date(),
         registration_status='active'
-    ).update(registration_status='expired')
+    ).update(registration_status='expired', version=F('version') + 1, updated_at=timezone.now())
     
     return f"만료된 PT 등록 {expired_count}건 상태 업데이트 완료"
 
@@ -366,6 +468,10 @@ def send_reservation_status_notification(reservation_id, new_status):
     try:
         reservation = Reservation.objects.get(id=reservation_id)
         
+        # 발행 후 상태가 다시 바뀐 경우 마지막 상태 알림만 전송
+        if reservation.reservation_status != new_status:
+            return f"예약 상태가 이미 변경되어 알림을 건너뜁니다 (예약 ID: {reservation_id})"
+        
         status_messages = {
             'confirmed': '예약이 확정되었습니다.',
             'rejected': '예약이 거절되었습니다.',
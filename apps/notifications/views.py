@@ -17,6 +17,21 @@ from .permissions import (
     NotificationTemplatePermission,
     NotificationLogPermission
 )
+from clamood_gym.stats import StatsQuery, count, breakdown, related_stat
+
+# 통계 액션 지표 (각각 aggregate() 1회)
+NOTIFICATION_STATS = StatsQuery(
+    total_notifications=count(),
+    sent_notifications=count(Q(status='sent')),
+    pending_notifications=count(Q(status='pending')),
+    failed_notifications=count(Q(status='failed')),
+    type_distribution=breakdown('notification_type'),
+)
+NOTIFICATION_TEMPLATE_STATS = StatsQuery(
+    total_templates=count(),
+    active_templates=count(Q(is_active=True)),
+    type_distribution=breakdown('notification_type'),
+)
 
 class NotificationViewSet(viewsets.ModelViewSet):
     """알림 API 뷰셋"""
@@ -46,19 +61,12 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """알림 통계 정보"""
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total_notifications': queryset.count(),
-            'sent_notifications': queryset.filter(status='sent').count(),
-            'pending_notifications': queryset.filter(status='pending').count(),
-            'failed_notifications': queryset.filter(status='failed').count(),
-            'today_notifications': queryset.filter(created_at__date=date.today()).count(),
-            'this_week_notifications': queryset.filter(
-                created_at__date__gte=date.today() - timedelta(days=7)
-            ).count(),
-            'type_distribution': queryset.values('notification_type').annotate(count=Count('id')),
-        }
+        today = date.today()
+        stats = NOTIFICATION_STATS.collect(
+            self.get_queryset(),
+            today_notifications=count(Q(created_at__date=today)),
+            this_week_notifications=count(Q(created_at__date__gte=today - timedelta(days=7))),
+        )
         
         return Response(stats)
     
@@ -113,14 +121,11 @@ class NotificationTemplateViewSet(viewsets.ModelViewSet):
         """알림 템플릿 통계 정보"""
         queryset = self.get_queryset()
         
-        stats = {
-            'total_templates': queryset.count(),
-            'active_templates': queryset.filter(is_active=True).count(),
-            'type_distribution': queryset.values('notification_type').annotate(count=Count('id')),
-            'most_used_templates': queryset.annotate(
-                usage_count=Count('notification')
-            ).order_by('-usage_count')[:5],
-        }
+        stats = NOTIFICATION_TEMPLATE_STATS.collect(queryset)
+        # 사용 횟수(같은 유형의 알림 수) 상위 템플릿은 정렬이 필요해 따로 조회
+        stats['most_used_templates'] = queryset.annotate(
+            usage_count=related_stat(Notification.objects.all(), 'notification_type', Count('pk'), outer='notification_type')
+        ).order_by('-usage_count').values('id', 'name', 'notification_type', 'usage_count')[:5]
         
         return Response(stats)
     
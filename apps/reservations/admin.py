@@ -1,9 +1,10 @@
 from django.contrib import admin
 from .models import Reservation, PTRecord, PTRecordImage, ReservationChangeLog
+from clamood_gym.concurrency import VersionedAdminMixin
 
 
 @admin.register(Reservation)
-class ReservationAdmin(admin.ModelAdmin):
+class ReservationAdmin(VersionedAdminMixin, admin.ModelAdmin):
     list_display = ['member', 'trainer', 'date', 'start_time', 'duration', 'reservation_status', 'repeat_type']
     list_filter = ['reservation_status', 'repeat_type', 'date', 'trainer']
     search_fields = ['member__name', 'trainer__name', 'notes']
@@ -18,7 +19,7 @@ class ReservationAdmin(admin.ModelAdmin):
             'fields': ('date', 'start_time', 'end_time', 'duration')
         }),
         ('상태', {
-            'fields': ('reservation_status',)
+            'fields': ('reservation_status', 'version')
         }),
         ('반복', {
             'fields': ('repeat_type', 'repeat_end_date')
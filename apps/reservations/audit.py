@@ -0,0 +1,205 @@
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Hashable, Iterable, List, Optional
+
+from celery.signals import task_prerun, task_postrun
+from django.db import DataError, IntegrityError, transaction
+
+from clamood_gym.transactions import SavepointBuffers
+from .models import ReservationChangeLog
+
+logger = logging.getLogger(__name__)
+
+
+# 시그널이 기록하는 변경자 (실제 변경자가 기록되면 대체됨)
+SYSTEM_ACTOR = 'system'
+
+
+class ChangeLogEntry:
+    """버퍼에 쌓이는 변경 로그 1건"""
+
+    __slots__ = ('reservation_id', 'change_type', 'changed_by', 'previous_status', 'new_status', 'reason')
+
+    def __init__(self, reservation_id, change_type, changed_by, previous_status, new_status, reason):
+        self.reservation_id = reservation_id
+        self.change_type = change_type
+        self.changed_by = changed_by
+        self.previous_status = previous_status
+        self.new_status = new_status
+        self.reason = reason
+
+    @property
+    def key(self) -> Hashable:
+        """같은 전이를 가리키는 로그를 묶는 키 (생성은 1건, 상태 변경은 새 상태별 1건)"""
+        if self.change_type == 'created':
+            return (self.reservation_id, 'created')
+        return (self.reservation_id, 'status', self.new_status)
+
+    @property
+    def is_system(self) -> bool:
+        return self.changed_by == SYSTEM_ACTOR
+
+    def merge(self, other: 'ChangeLogEntry') -> 'ChangeLogEntry':
+        """같은 전이의 두 로그를 1건으로 병합 (실제 변경자와 구체적인 변경 유형 우선)"""
+        primary, secondary = (other, self) if self.is_system and not other.is_system else (self, other)
+        change_type = primary.change_type
+        if change_type == 'modified' and secondary.change_type != 'modified':
+            change_type = secondary.change_type
+        return ChangeLogEntry(
+            self.reservation_id,
+            change_type,
+            primary.changed_by,
+            self.previous_status or other.previous_status,
+            primary.new_status or secondary.new_status,
+            primary.reason or secondary.reason
+        )
+
+    def to_model(self) -> ReservationChangeLog:
+        return ReservationChangeLog(
+            reservation_id=self.reservation_id,
+            change_type=self.change_type,
+            changed_by=self.changed_by,
+            previous_status=self.previous_status or '',
+            new_status=self.new_status or '',
+            reason=self.reason or ''
+        )
+
+
+class ChangeLogWriter:
+    """예약 변경 로그 단일 기록기
+
+    서비스/뷰와 시그널이 같은 전이를 각각 기록해도 1건으로 합치고,
+    트랜잭션이 커밋된 로그만 요청/태스크 범위가 끝날 때 bulk_create 로 한 번에 저장한다.
+    범위 밖에서는 커밋 직후 바로 저장한다.
+    트랜잭션 안의 로그는 세이브포인트별로 모으므로 롤백된 세이브포인트에서 기록한 로그는 저장하지 않는다.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._pending = SavepointBuffers(self._promote)
+
+    def record(
+        self,
+        reservation,
+        change_type: str,
+        changed_by,
+        previous_status: Optional[str] = None,
+        new_status: Optional[str] = None,
+        reason: str = ''
+    ):
+        """변경 로그 기록 (커밋 후 저장)"""
+        entry = ChangeLogEntry(
+            getattr(reservation, 'pk', reservation),
+            change_type,
+            str(changed_by),
+            previous_status,
+            new_status,
+            reason
+        )
+
+        connection = transaction.get_connection()
+        if connection.in_atomic_block:
+            self._pending.add(entry)
+        else:
+            self._add(self._ready(), entry)
+            self._flush_if_unscoped()
+
+    def record_many(self, entries: Iterable[dict]):
+        """여러 변경 로그 기록"""
+        for entry in entries:
+            self.record(**entry)
+
+    def _add(self, buffer, entry: ChangeLogEntry):
+        existing = buffer.get(entry.key)
+        buffer[entry.key] = existing.merge(entry) if existing else entry
+
+    def _ready(self) -> 'OrderedDict[Hashable, ChangeLogEntry]':
+        ready = getattr(self._local, 'ready', None)
+        if ready is None:
+            ready = self._local.ready = OrderedDict()
+        return ready
+
+    def _promote(self, entries: List[ChangeLogEntry]):
+        """커밋된 트랜잭션의 로그를 저장 대기 버퍼로 이동 (기록 순서대로 같은 전이끼리 병합)"""
+        ready = self._ready()
+        for entry in entries:
+            self._add(ready, entry)
+        self._flush_if_unscoped()
+
+    def _flush_if_unscoped(self):
+        if not getattr(self._local, 'depth', 0):
+            self.flush()
+
+    def flush(self) -> int:
+        """커밋된 로그 저장 (bulk_create 1회)
+
+        제약을 위반한 로그(저장 전에 삭제된 예약 등)가 있으면 한 건씩 다시 저장해 그 로그만 제외한다.
+        그 밖의 데이터베이스 오류는 저장하지 못한 로그를 버퍼에 되돌리고 그대로 전파한다 (다음 저장 때 재시도).
+        """
+        ready = self._ready()
+        if not ready:
+            return 0
+        entries = list(ready.values())
+        ready.clear()
+        try:
+            with transaction.atomic():
+                ReservationChangeLog.objects.bulk_create([entry.to_model() for entry in entries])
+            return len(entries)
+        except (IntegrityError, DataError):
+            pass
+        except Exception:
+            self._restore(entries)
+            raise
+
+        saved = 0
+        for index, entry in enumerate(entries):
+            try:
+                with transaction.atomic():
+                    entry.to_model().save()
+                saved += 1
+            except (IntegrityError, DataError) as e:
+                logger.warning(f"예약 {entry.reservation_id} 변경 로그 저장 제외: {str(e)}")
+            except Exception:
+                self._restore(entries[index:])
+                raise
+        return saved
+
+    def _restore(self, entries: Iterable[ChangeLogEntry]):
+        """저장하지 못한 로그를 버퍼에 되돌림"""
+        ready = self._ready()
+        for entry in entries:
+            self._add(ready, entry)
+
+    def begin(self):
+        """버퍼 범위 시작 (요청/태스크 단위)"""
+        self._local.depth = getattr(self._local, 'depth', 0) + 1
+
+    def end(self):
+        """버퍼 범위 종료 (가장 바깥 범위에서 저장)"""
+        self._local.depth = max(getattr(self._local, 'depth', 0) - 1, 0)
+        if not self._local.depth:
+            self.flush()
+
+    @contextmanager
+    def scope(self):
+        """요청/태스크 동안 로그를 모아 마지막에 한 번에 저장"""
+        self.begin()
+        try:
+            yield self
+        finally:
+            self.end()
+
+
+change_log_writer = ChangeLogWriter()
+
+
+@task_prerun.connect
+def _begin_task_scope(**kwargs):
+    change_log_writer.begin()
+
+
+@task_postrun.connect
+def _end_task_scope(**kwargs):
+    change_log_writer.end()
@@ -0,0 +1,444 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from apps.branches.closures import closure_calendar
+from apps.trainers.models import Trainer, TrainerSchedule, TrainerScheduleOverride, TrainerBlockedTime
+from .models import Reservation
+
+
+# 시간대를 점유하는 예약 상태
+ACTIVE_RESERVATION_STATUSES = ['pending', 'confirmed']
+
+MINUTES_PER_DAY = 24 * 60
+
+Interval = Tuple[int, int]
+
+
+def to_minutes(value: time) -> int:
+    """시각을 자정 기준 분으로 변환"""
+    return value.hour * 60 + value.minute
+
+
+def end_to_minutes(value: time) -> int:
+    """종료 시각을 분으로 변환 (00:00 종료는 24:00으로 처리)"""
+    minutes = to_minutes(value)
+    return minutes if minutes > 0 else MINUTES_PER_DAY
+
+
+def from_minutes(minutes: int) -> time:
+    """자정 기준 분을 시각으로 변환"""
+    minutes = minutes % MINUTES_PER_DAY
+    return time(minutes // 60, minutes % 60)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """구간 목록을 정렬하고 겹치거나 맞닿은 구간을 병합"""
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_intervals(intervals: Iterable[Interval], removed: Iterable[Interval]) -> List[Interval]:
+    """구간 목록에서 제외 구간을 뺀 나머지 구간"""
+    removed = merge_intervals(removed)
+    result = []
+    for start, end in merge_intervals(intervals):
+        for removed_start, removed_end in removed:
+            if removed_end <= start or end <= removed_start:
+                continue
+            if start < removed_start:
+                result.append((start, removed_start))
+            start = max(start, removed_end)
+            if start >= end:
+                break
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+class IntervalIndex:
+    """병합된 정렬 구간 인덱스
+
+    구간이 서로 겹치지 않도록 병합해 두므로 시작/종료 목록이 모두 정렬되어
+    겹침 및 포함 여부를 이진 탐색(O(log n))으로 판정할 수 있다.
+    """
+
+    __slots__ = ('_starts', '_ends')
+
+    def __init__(self, intervals: Iterable[Interval] = ()):
+        merged = merge_intervals(intervals)
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+    def __iter__(self):
+        return iter(zip(self._starts, self._ends))
+
+    def __len__(self):
+        return len(self._starts)
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """[start, end) 와 겹치는 구간이 있는지 확인"""
+        index = bisect_left(self._starts, end)
+        return index > 0 and self._ends[index - 1] > start
+
+    def covers(self, start: int, end: int) -> bool:
+        """[start, end) 전체를 포함하는 구간이 있는지 확인"""
+        index = bisect_right(self._starts, start)
+        return index > 0 and self._ends[index - 1] >= end
+
+    def add(self, start: int, end: int):
+        """구간 추가 (인접 구간과 병합)"""
+        if end <= start:
+            return
+        index = bisect_left(self._starts, start)
+        # 앞쪽 구간과 겹치거나 맞닿으면 병합 대상에 포함
+        if index > 0 and self._ends[index - 1] >= start:
+            index -= 1
+            start = self._starts[index]
+        stop = index
+        while stop < len(self._starts) and self._starts[stop] <= end:
+            end = max(end, self._ends[stop])
+            stop += 1
+        self._starts[index:stop] = [start]
+        self._ends[index:stop] = [end]
+
+
+class WorkSchedule:
+    """트레이너 근무 구간 (요일별 근무 구간 + 날짜별 예외 일정 - 지점 휴무)
+
+    같은 요일의 여러 근무 구간(오전/오후 근무 등)은 병합된 구간 인덱스 1개로 만들고,
+    요일/예외 날짜별로 한 번 만든 인덱스를 재사용한다.
+    지점 휴무는 프로세스 내 휴무 캘린더(또는 잠금 안에서 읽은 closures)에서 날짜별 O(1)로 조회해
+    근무 구간에서 제외한다.
+    """
+
+    __slots__ = ('weekly', 'overrides', 'branch_id', 'closures', '_indexes')
+
+    def __init__(
+        self,
+        weekly: Optional[Dict[int, List[Interval]]] = None,
+        overrides: Optional[Dict[date, List[Interval]]] = None,
+        branch_id: Optional[int] = None,
+        closures=None
+    ):
+        self.weekly = weekly or {}
+        # 예외 일정이 있는 날짜 -> 근무 구간 (빈 목록이면 휴무)
+        self.overrides = overrides or {}
+        self.branch_id = branch_id
+        self.closures = closures or closure_calendar
+        self._indexes = {}
+
+    def windows(self, day: date) -> List[Interval]:
+        """날짜의 근무 구간 목록"""
+        if day in self.overrides:
+            windows = self.overrides[day]
+        else:
+            windows = self.weekly.get(day.weekday(), [])
+        closed = self.closures.intervals(self.branch_id, day)
+        if closed and windows:
+            windows = subtract_intervals(windows, closed)
+        return windows
+
+    def key(self, day: date):
+        """근무 구간이 같은 날짜를 묶는 키 (예외 일정/휴무 날짜는 날짜, 나머지는 요일)"""
+        if day in self.overrides or self.closures.intervals(self.branch_id, day):
+            return day
+        return day.weekday()
+
+    def index(self, day: date) -> IntervalIndex:
+        """날짜의 근무 구간 인덱스 (읽기 전용으로 공유)"""
+        key = self.key(day)
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = IntervalIndex(self.windows(day))
+        return index
+
+    def exception_dates(self, start_date: date, end_date: date) -> List[date]:
+        """기간 내 요일 근무 구간과 다른 날짜 (예외 일정/지점 휴무)"""
+        dates = set(self.overrides)
+        dates |= self.closures.dates(self.branch_id)
+        return sorted(day for day in dates if start_date <= day <= end_date)
+
+
+def fetch_weekly_schedules(trainer_ids: Sequence[int]) -> Tuple[Dict[int, Dict[int, List[Interval]]], Dict[int, int]]:
+    """트레이너별 요일 근무 구간과 소속 지점 조회 (쿼리 1회)"""
+    weekly: Dict[int, Dict[int, List[Interval]]] = defaultdict(lambda: defaultdict(list))
+    branches: Dict[int, int] = {}
+    schedule_rows = TrainerSchedule.objects.filter(
+        trainer_id__in=trainer_ids,
+        is_available=True
+    ).values_list('trainer_id', 'trainer__branch_id', 'day_of_week', 'start_time', 'end_time')
+    for trainer_id, branch_id, day_of_week, start_time, end_time in schedule_rows:
+        branches[trainer_id] = branch_id
+        weekly[trainer_id][day_of_week].append(
+            (to_minutes(start_time), end_to_minutes(end_time))
+        )
+    return weekly, branches
+
+
+def fetch_schedules(
+    trainer_ids: Sequence[int],
+    start_date: date,
+    end_date: date,
+    closures=None
+) -> Dict[int, WorkSchedule]:
+    """트레이너별 근무 구간 조회 (요일 일정/예외 일정 각 1회, 쿼리 2회, closures 가 없으면 휴무 캘린더 사용)"""
+    weekly, branches = fetch_weekly_schedules(trainer_ids)
+
+    overrides: Dict[int, Dict[date, List[Interval]]] = defaultdict(dict)
+    override_rows = TrainerScheduleOverride.objects.filter(
+        trainer_id__in=trainer_ids,
+        date__range=[start_date, end_date]
+    ).values_list('trainer_id', 'trainer__branch_id', 'date', 'start_time', 'end_time', 'is_available')
+    for trainer_id, branch_id, day, start_time, end_time, is_available in override_rows:
+        branches[trainer_id] = branch_id
+        windows = overrides[trainer_id].setdefault(day, [])
+        if is_available and start_time is not None and end_time is not None:
+            windows.append((to_minutes(start_time), end_to_minutes(end_time)))
+
+    return {
+        trainer_id: WorkSchedule(
+            dict(weekly.get(trainer_id, {})),
+            overrides.get(trainer_id, {}),
+            branches.get(trainer_id),
+            closures
+        )
+        for trainer_id in trainer_ids
+    }
+
+
+class TrainerDayAvailability:
+    """트레이너의 하루 가용성 (근무 구간 + 점유 구간)"""
+
+    __slots__ = ('date', 'work', 'busy')
+
+    def __init__(self, day: date, work: IntervalIndex, busy: IntervalIndex):
+        self.date = day
+        self.work = work
+        self.busy = busy
+
+    @property
+    def is_working(self) -> bool:
+        """근무 구간 존재 여부"""
+        return bool(self.work)
+
+    def is_available(self, start_time: time, end_time: time) -> bool:
+        """시간대 예약 가능 여부"""
+        start = to_minutes(start_time)
+        end = end_to_minutes(end_time)
+        return self.is_available_minutes(start, end)
+
+    def is_available_minutes(self, start: int, end: int) -> bool:
+        """분 단위 시간대 예약 가능 여부"""
+        return self.work.covers(start, end) and not self.busy.overlaps(start, end)
+
+    def reserve(self, start_time: time, end_time: time):
+        """시간대를 점유 처리 (같은 요청 내에서 생성된 예약 반영용)"""
+        self.busy.add(to_minutes(start_time), end_to_minutes(end_time))
+
+
+class TrainerAvailability:
+    """트레이너 기간 가용성
+
+    일정, 예외 일정, 차단 시간, 활성 예약을 기간 단위로 한 번에 로드한 뒤
+    날짜별 구간 인덱스로 데이터베이스 조회 없이 가용 여부를 판정한다.
+    """
+
+    def __init__(
+        self,
+        trainer_id: int,
+        start_date: date,
+        end_date: date,
+        schedule: WorkSchedule,
+        busy: Dict[date, List[Interval]]
+    ):
+        self.trainer_id = trainer_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.schedule = schedule
+        self._busy = busy
+        self._days: Dict[date, TrainerDayAvailability] = {}
+
+    @classmethod
+    def load(
+        cls,
+        trainer: Trainer,
+        start_date: date,
+        end_date: Optional[date] = None,
+        exclude_reservation_ids: Sequence[int] = ()
+    ) -> 'TrainerAvailability':
+        """트레이너 한 명의 기간 가용성 로드 (쿼리 4회)"""
+        trainer_id = trainer.pk if isinstance(trainer, Trainer) else trainer
+        return load_availability(
+            [trainer_id], start_date, end_date, exclude_reservation_ids
+        )[trainer_id]
+
+    def for_date(self, day: date) -> TrainerDayAvailability:
+        """날짜별 가용성"""
+        if not self.start_date <= day <= self.end_date:
+            raise ValueError(f"로드되지 않은 날짜입니다: {day}")
+
+        day_availability = self._days.get(day)
+        if day_availability is None:
+            day_availability = TrainerDayAvailability(
+                day,
+                self.schedule.index(day),
+                IntervalIndex(self._busy.get(day, ()))
+            )
+            self._days[day] = day_availability
+        return day_availability
+
+    def dates(self) -> Iterable[date]:
+        """로드된 기간의 날짜 목록"""
+        current = self.start_date
+        while current <= self.end_date:
+            yield current
+            current += timedelta(days=1)
+
+    def is_available(self, day: date, start_time: time, end_time: time) -> bool:
+        """시간대 예약 가능 여부"""
+        return self.for_date(day).is_available(start_time, end_time)
+
+    def reserve(self, day: date, start_time: time, end_time: time):
+        """시간대를 점유 처리"""
+        self.for_date(day).reserve(start_time, end_time)
+
+
+def fetch_intervals(
+    trainer_ids: Sequence[int],
+    start_date: date,
+    end_date: date,
+    exclude_reservation_ids: Sequence[int] = ()
+) -> Tuple[Dict[int, WorkSchedule], Dict[int, Dict[date, List[Interval]]]]:
+    """트레이너별 근무 구간과 날짜별 점유 구간 조회 (쿼리 4회)"""
+    schedules = fetch_schedules(trainer_ids, start_date, end_date)
+
+    # 날짜별 점유 구간 (차단 시간 + 활성 예약)
+    busy: Dict[int, Dict[date, List[Interval]]] = defaultdict(lambda: defaultdict(list))
+    blocked_rows = TrainerBlockedTime.objects.filter(
+        trainer_id__in=trainer_ids,
+        date__range=[start_date, end_date]
+    ).values_list('trainer_id', 'date', 'start_time', 'end_time')
+
+    reservations = Reservation.objects.filter(
+        trainer_id__in=trainer_ids,
+        date__range=[start_date, end_date],
+        reservation_status__in=ACTIVE_RESERVATION_STATUSES
+    )
+    if exclude_reservation_ids:
+        reservations = reservations.exclude(id__in=exclude_reservation_ids)
+    reservation_rows = reservations.values_list('trainer_id', 'date', 'start_time', 'end_time')
+
+    for rows in (blocked_rows, reservation_rows):
+        for trainer_id, day, start_time, end_time in rows:
+            busy[trainer_id][day].append((to_minutes(start_time), end_to_minutes(end_time)))
+
+    return schedules, busy
+
+
+def load_availability(
+    trainer_ids: Sequence[int],
+    start_date: date,
+    end_date: Optional[date] = None,
+    exclude_reservation_ids: Sequence[int] = ()
+) -> Dict[int, TrainerAvailability]:
+    """여러 트레이너의 기간 가용성을 일괄 로드
+
+    트레이너 수나 기간 길이와 무관하게 일정/예외 일정/차단 시간/예약 각 1회씩,
+    총 4회의 쿼리만 실행한다.
+    """
+    if end_date is None:
+        end_date = start_date
+    if end_date < start_date:
+        raise ValueError("종료일은 시작일 이후여야 합니다.")
+
+    trainer_ids = list(trainer_ids)
+    schedules, busy = fetch_intervals(trainer_ids, start_date, end_date, exclude_reservation_ids)
+
+    return {
+        trainer_id: TrainerAvailability(
+            trainer_id,
+            start_date,
+            end_date,
+            schedules[trainer_id],
+            dict(busy.get(trainer_id, {}))
+        )
+        for trainer_id in trainer_ids
+    }
+
+
+# 슬롯 그리드 제한
+DEFAULT_SLOT_MINUTES = 30
+MIN_SLOT_MINUTES = 10
+MAX_SLOT_MINUTES = 240
+MAX_SLOT_GRID_DAYS = 31
+
+
+def validate_slot_minutes(slot_minutes: int) -> int:
+    """슬롯 길이 검증"""
+    slot_minutes = int(slot_minutes)
+    if not MIN_SLOT_MINUTES <= slot_minutes <= MAX_SLOT_MINUTES:
+        raise ValueError(
+            f"슬롯 길이는 {MIN_SLOT_MINUTES}~{MAX_SLOT_MINUTES}분 사이여야 합니다."
+        )
+    return slot_minutes
+
+
+def build_day_slots(
+    day_availability: TrainerDayAvailability,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES
+) -> List[Dict[str, object]]:
+    """하루 근무 구간을 슬롯 단위로 나누어 예약 가능 상태 계산"""
+    slots = []
+    for window_start, window_end in day_availability.work:
+        current = window_start
+        # 근무 종료 시각을 넘는 마지막 자투리 슬롯은 만들지 않음
+        while current + slot_minutes <= window_end:
+            slot_end = current + slot_minutes
+            available = day_availability.is_available_minutes(current, slot_end)
+            slots.append({
+                'start_time': from_minutes(current).strftime('%H:%M'),
+                'end_time': from_minutes(slot_end).strftime('%H:%M'),
+                'available': available,
+                'status': 'free' if available else 'busy',
+            })
+            current = slot_end
+    return slots
+
+
+def build_slot_grid(
+    availability: TrainerAvailability,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    slot_minutes: int = DEFAULT_SLOT_MINUTES
+) -> List[Dict[str, object]]:
+    """미리 로드된 가용성으로 기간 전체의 슬롯 그리드 생성 (추가 쿼리 없음)"""
+    slot_minutes = validate_slot_minutes(slot_minutes)
+    start_date = start_date or availability.start_date
+    end_date = end_date or availability.end_date
+
+    grid = []
+    current = start_date
+    while current <= end_date:
+        day_availability = availability.for_date(current)
+        slots = build_day_slots(day_availability, slot_minutes)
+        grid.append({
+            'date': current.isoformat(),
+            'day_of_week': current.weekday(),
+            'is_working': day_availability.is_working,
+            'available_count': sum(1 for slot in slots if slot['available']),
+            'slots': slots,
+        })
+        current += timedelta(days=1)
+    return grid
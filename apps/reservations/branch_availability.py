@@ -0,0 +1,183 @@
+from datetime import date, time, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .availability import (
+    MINUTES_PER_DAY,
+    fetch_intervals,
+    from_minutes,
+    to_minutes,
+    end_to_minutes,
+    validate_slot_minutes,
+)
+
+
+class BranchOccupancyMatrix:
+    """지점 트레이너 × 슬롯 가용 행렬
+
+    free[t, d, s] 는 t번째 트레이너가 d번째 날짜의 s번째 슬롯에 예약 가능한지를 나타낸다.
+    슬롯은 자정부터 slot_minutes 간격으로 나뉘며, 근무 구간에 완전히 포함되고
+    차단 시간/활성 예약과 겹치지 않는 슬롯만 True 이다.
+    """
+
+    def __init__(
+        self,
+        trainers: Sequence[Dict[str, Any]],
+        start_date: date,
+        end_date: date,
+        slot_minutes: int,
+        free: np.ndarray
+    ):
+        self.trainers = list(trainers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.slot_minutes = slot_minutes
+        self.free = free
+
+    @classmethod
+    def build(
+        cls,
+        trainers: Sequence[Dict[str, Any]],
+        start_date: date,
+        end_date: date,
+        slot_minutes: int = 30
+    ) -> 'BranchOccupancyMatrix':
+        """트레이너 목록의 일정/예외 일정/차단 시간/예약을 한 번에 로드해 행렬 생성 (쿼리 4회)"""
+        slot_minutes = validate_slot_minutes(slot_minutes)
+        if MINUTES_PER_DAY % slot_minutes:
+            raise ValueError("슬롯 길이는 하루(1440분)를 나누어 떨어지게 설정해야 합니다.")
+        if end_date < start_date:
+            raise ValueError("종료일은 시작일 이후여야 합니다.")
+
+        trainer_ids = [trainer['id'] for trainer in trainers]
+        slots_per_day = MINUTES_PER_DAY // slot_minutes
+        day_count = (end_date - start_date).days + 1
+        schedules, busy = fetch_intervals(trainer_ids, start_date, end_date)
+
+        # 요일별 근무 슬롯 (트레이너 × 요일 × 슬롯)
+        weekly = np.zeros((len(trainer_ids), 7, slots_per_day), dtype=bool)
+        for row, trainer_id in enumerate(trainer_ids):
+            for day_of_week, windows in schedules[trainer_id].weekly.items():
+                cls._mark_windows(weekly[row, day_of_week], windows, slot_minutes)
+
+        weekdays = np.array([
+            (start_date + timedelta(days=offset)).weekday() for offset in range(day_count)
+        ], dtype=np.intp)
+        free = weekly[:, weekdays, :]
+
+        # 예외 일정/지점 휴무가 있는 날짜는 요일 근무 슬롯 대신 해당 날짜의 근무 구간으로 교체
+        for row, trainer_id in enumerate(trainer_ids):
+            schedule = schedules[trainer_id]
+            for day in schedule.exception_dates(start_date, end_date):
+                offset = (day - start_date).days
+                free[row, offset, :] = False
+                cls._mark_windows(free[row, offset], schedule.windows(day), slot_minutes)
+
+        # 차단 시간/예약과 조금이라도 겹치는 슬롯 제외
+        for row, trainer_id in enumerate(trainer_ids):
+            for day, intervals in busy.get(trainer_id, {}).items():
+                offset = (day - start_date).days
+                for busy_start, busy_end in intervals:
+                    first = busy_start // slot_minutes
+                    last = -(-busy_end // slot_minutes)
+                    free[row, offset, first:last] = False
+
+        return cls(trainers, start_date, end_date, slot_minutes, free)
+
+    @staticmethod
+    def _mark_windows(slots: np.ndarray, windows, slot_minutes: int):
+        """근무 구간에 완전히 포함되는 슬롯만 근무 슬롯으로 처리"""
+        for window_start, window_end in windows:
+            first = -(-window_start // slot_minutes)
+            last = window_end // slot_minutes
+            slots[first:last] = True
+
+    def _slot_range(self, start_time: time, end_time: time):
+        """시각 구간을 포함하는 슬롯 범위 (정렬되지 않은 시각은 걸치는 슬롯 전체)"""
+        start = to_minutes(start_time) // self.slot_minutes
+        end = -(-end_to_minutes(end_time) // self.slot_minutes)
+        if end <= start:
+            raise ValueError("종료 시간은 시작 시간 이후여야 합니다.")
+        return start, end
+
+    def _day_offset(self, day: date) -> int:
+        if not self.start_date <= day <= self.end_date:
+            raise ValueError(f"조회 기간을 벗어난 날짜입니다: {day}")
+        return (day - self.start_date).days
+
+    def _date_at(self, offset: int) -> date:
+        return self.start_date + timedelta(days=int(offset))
+
+    def free_slot_counts(
+        self,
+        start_time: Optional[time] = None,
+        end_time: Optional[time] = None
+    ) -> List[Dict[str, Any]]:
+        """날짜/슬롯별 예약 가능한 트레이너 수 (1명 이상인 슬롯만)"""
+        first, last = (0, self.free.shape[2])
+        if start_time and end_time:
+            first, last = self._slot_range(start_time, end_time)
+
+        counts = self.free[:, :, first:last].sum(axis=0)
+        day_offsets, slot_offsets = np.nonzero(counts)
+
+        return [
+            {
+                'date': self._date_at(day_offset).isoformat(),
+                'start_time': from_minutes((first + slot) * self.slot_minutes).strftime('%H:%M'),
+                'end_time': from_minutes((first + slot + 1) * self.slot_minutes).strftime('%H:%M'),
+                'free_trainers': int(counts[day_offset, slot]),
+            }
+            for day_offset, slot in zip(day_offsets.tolist(), slot_offsets.tolist())
+        ]
+
+    def fully_free_trainers(self, day: date, start_time: time, end_time: time) -> List[Dict[str, Any]]:
+        """지정 시간대 전체가 비어 있는 트레이너 목록"""
+        offset = self._day_offset(day)
+        first, last = self._slot_range(start_time, end_time)
+        mask = self.free[:, offset, first:last].all(axis=1)
+        return [self.trainers[row] for row in np.flatnonzero(mask).tolist()]
+
+    def earliest_available(
+        self,
+        duration_minutes: int,
+        not_before: Optional[time] = None,
+        not_after: Optional[time] = None
+    ) -> List[Dict[str, Any]]:
+        """트레이너별 가장 빠른 예약 가능 시작 시각 (빠른 순 정렬)
+
+        not_before/not_after 로 하루 중 검색할 시간대를 제한할 수 있다.
+        """
+        length = -(-int(duration_minutes) // self.slot_minutes)
+        slots_per_day = self.free.shape[2]
+        if length <= 0 or length > slots_per_day:
+            raise ValueError("PT 시간이 올바르지 않습니다.")
+
+        first = to_minutes(not_before) // self.slot_minutes if not_before else 0
+        last = -(-end_to_minutes(not_after) // self.slot_minutes) if not_after else slots_per_day
+        window = self.free[:, :, first:last]
+        if window.shape[2] < length:
+            return []
+
+        # 연속된 length 개 슬롯이 모두 비어 있는 시작 위치 (날짜 경계를 넘지 않음)
+        runs = sliding_window_view(window, length, axis=2).all(axis=3)
+        flat = runs.reshape(runs.shape[0], -1)
+        has_run = flat.any(axis=1)
+        positions = flat.argmax(axis=1)
+        per_day = runs.shape[2]
+
+        results = []
+        for row in np.flatnonzero(has_run).tolist():
+            day_offset, slot = divmod(int(positions[row]), per_day)
+            start = (first + slot) * self.slot_minutes
+            results.append({
+                **self.trainers[row],
+                'date': self._date_at(day_offset).isoformat(),
+                'start_time': from_minutes(start).strftime('%H:%M'),
+                'end_time': from_minutes(start + length * self.slot_minutes).strftime('%H:%M'),
+            })
+
+        results.sort(key=lambda item: (item['date'], item['start_time']))
+        return results
@@ -0,0 +1,219 @@
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Iterator, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Count, F, Max
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from .models import Reservation
+from .services import reservation_service
+
+
+# 캘린더 클라이언트 갱신 주기 안내 (대부분 15분마다 조회)
+FEED_REFRESH_INTERVAL = 'PT15M'
+FEED_ITERATOR_CHUNK_SIZE = 500
+FEED_TOKEN_SALT = 'reservations.calendar-feed'
+FEED_KINDS = ('trainer', 'member')
+
+# 예약 상태 → iCalendar STATUS (취소/거절도 내보내 이미 동기화된 일정을 지우게 함)
+EVENT_STATUS = {
+    'pending': 'TENTATIVE',
+    'confirmed': 'CONFIRMED',
+    'completed': 'CONFIRMED',
+    'no_show': 'CONFIRMED',
+    'rejected': 'CANCELLED',
+    'cancelled': 'CANCELLED',
+}
+
+
+class ICSRenderer(BaseRenderer):
+    """text/calendar 요청 허용용 렌더러 (피드 본문은 StreamingHttpResponse 로 직접 반환)"""
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # 오류 응답 등 피드가 아닌 데이터는 JSON 으로 표시
+        if isinstance(data, (str, bytes)):
+            return data
+        return JSONRenderer().render(data)
+
+
+def feed_token(kind: str, owner) -> str:
+    """캘린더 구독 URL 용 서명 토큰 (로그인 없이 캘린더 앱에서 조회)
+
+    토큰 버전을 함께 서명하므로 버전을 올리면 이전에 발급한 URL 은 더 이상 열리지 않는다.
+    """
+    return signing.Signer(salt=FEED_TOKEN_SALT).sign(f"{kind}.{owner.id}.{owner.calendar_token_version}")
+
+
+def resolve_feed_token(token: str) -> Optional[Tuple[str, int, int]]:
+    """서명 토큰 → (종류, ID, 토큰 버전), 위조/손상된 토큰이면 None
+
+    버전이 없는 이전 형식 토큰은 버전 1로 본다 (첫 재발급 전까지 기존 구독 유지).
+    """
+    try:
+        kind, object_id, *version = signing.Signer(salt=FEED_TOKEN_SALT).unsign(token).split('.')
+        object_id = int(object_id)
+        version = int(version[0]) if version else 1
+    except (signing.BadSignature, ValueError):
+        return None
+    if kind not in FEED_KINDS:
+        return None
+    return kind, object_id, version
+
+
+def rotate_feed_token(kind: str, owner) -> str:
+    """토큰 버전을 올려 이전 구독 URL 을 무효화하고 새 토큰 반환"""
+    model = type(owner)
+    model.objects.filter(pk=owner.pk).update(calendar_token_version=F('calendar_token_version') + 1)
+    owner.calendar_token_version = model.objects.values_list('calendar_token_version', flat=True).get(pk=owner.pk)
+    return feed_token(kind, owner)
+
+
+def feed_etag(queryset) -> str:
+    """피드 ETag (최근 수정 시각 + 건수, 집계 쿼리 1회)
+
+    예약이 수정되면 updated_at 이, 삭제되면 건수가 바뀐다.
+    """
+    state = queryset.order_by().aggregate(latest=Max('updated_at'), count=Count('id'))
+    latest = state['latest'].isoformat() if state['latest'] else ''
+    digest = hashlib.md5(f"{queryset.query}|{latest}|{state['count']}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _escape(value: str) -> str:
+    """TEXT 값 이스케이프 (RFC 5545 3.3.11)"""
+    return (
+        value.replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line: str) -> str:
+    """75 옥텟 단위 줄 접기 (UTF-8 문자 중간에서 자르지 않음)"""
+    if len(line.encode()) <= 75:
+        return line + '\r\n'
+    parts = []
+    current = ''
+    limit = 75
+    for char in line:
+        if len((current + char).encode()) > limit:
+            parts.append(current)
+            current = ''
+            # 이어지는 줄은 앞의 공백 1자를 포함해 75 옥텟
+            limit = 74
+        current += char
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+
+def _utc(value: datetime) -> str:
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _event(reservation: Reservation, summary: str, local_zone: ZoneInfo) -> str:
+    start = datetime.combine(reservation.date, reservation.start_time, tzinfo=local_zone)
+    end = datetime.combine(reservation.date, reservation.end_time, tzinfo=local_zone)
+    if end <= start:
+        # 자정을 넘기는 예약
+        end += timedelta(days=1)
+
+    description = f"상태: {reservation.get_reservation_status_display()}"
+    if reservation.notes:
+        description += f"\n{reservation.notes}"
+
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:reservation-{reservation.id}@clamood-gym",
+        f"DTSTAMP:{_utc(reservation.updated_at)}",
+        f"LAST-MODIFIED:{_utc(reservation.updated_at)}",
+        f"DTSTART:{_utc(start)}",
+        f"DTEND:{_utc(end)}",
+        f"SUMMARY:{_escape(summary)}",
+        f"DESCRIPTION:{_escape(description)}",
+        f"STATUS:{EVENT_STATUS.get(reservation.reservation_status, 'CONFIRMED')}",
+        'END:VEVENT',
+    ]
+    return ''.join(_fold(line) for line in lines)
+
+
+def iter_calendar(queryset, name: str, kind: str) -> Iterator[str]:
+    """예약 쿼리셋을 VCALENDAR 로 스트리밍
+
+    iterator() 로 청크 단위로 읽어 예약 건수와 관계없이 메모리 사용량이 일정하다.
+    kind 가 'trainer' 면 일정 제목에 회원 이름을, 'member' 면 트레이너 이름을 표시한다.
+    """
+    local_zone = ZoneInfo(settings.TIME_ZONE)
+    yield ''.join(_fold(line) for line in [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Clamood Gym//PT Reservations//KO',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f"X-WR-CALNAME:{_escape(name)}",
+        f"X-WR-TIMEZONE:{settings.TIME_ZONE}",
+        f"X-PUBLISHED-TTL:{FEED_REFRESH_INTERVAL}",
+        f"REFRESH-INTERVAL;VALUE=DURATION:{FEED_REFRESH_INTERVAL}",
+    ])
+
+    related = 'member' if kind == 'trainer' else 'trainer'
+    # 변경 추적 대상 외래키(trainer, branch)는 지연 로딩 시 행마다 재조회되므로 함께 읽음
+    reservations = queryset.select_related(related).only(
+        'id', 'date', 'start_time', 'end_time', 'reservation_status', 'notes', 'updated_at',
+        'trainer', 'branch', f"{related}__name"
+    )
+    for reservation in reservations.iterator(chunk_size=FEED_ITERATOR_CHUNK_SIZE):
+        if kind == 'trainer':
+            summary = f"PT - {reservation.member.name} 회원님"
+        else:
+            summary = f"PT - {reservation.trainer.name} 트레이너"
+        yield _event(reservation, summary, local_zone)
+
+    yield 'END:VCALENDAR\r\n'
+
+
+def calendar_response(request, queryset, name: str, kind: str):
+    """ICS 피드 응답 (If-None-Match 가 같으면 본문 없이 304)"""
+    etag = feed_etag(queryset)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        not_modified['ETag'] = etag
+        return not_modified
+
+    response = StreamingHttpResponse(
+        iter_calendar(queryset, name, kind),
+        content_type='text/calendar; charset=utf-8'
+    )
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    response['Content-Disposition'] = f'inline; filename="{kind}-calendar.ics"'
+    return response
+
+
+def trainer_calendar_response(request, trainer):
+    """트레이너 예약 피드"""
+    return calendar_response(
+        request,
+        reservation_service.get_trainer_reservations(trainer),
+        f"{trainer.name} 트레이너 PT 일정",
+        'trainer'
+    )
+
+
+def member_calendar_response(request, member):
+    """회원 예약 피드"""
+    return calendar_response(
+        request,
+        reservation_service.get_member_reservations(member),
+        f"{member.name} 회원님 PT 일정",
+        'member'
+    )
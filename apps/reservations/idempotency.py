@@ -0,0 +1,106 @@
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+
+IDEMPOTENCY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+# 재시도 응답을 보관하는 기간 (정리 태스크가 이후 삭제)
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+
+def request_fingerprint(request) -> str:
+    """요청 지문 (메서드 + 경로 + 정렬된 본문)"""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+    return hashlib.sha256(f"{request.method}|{request.path}|{body}".encode()).hexdigest()
+
+
+def _claim(request, key: str, fingerprint: str):
+    """키 선점 (새로 선점하면 (키, True), 이미 있으면 (기존 키, False))"""
+    try:
+        return IdempotencyKey.objects.create(
+            key=key,
+            user=request.user,
+            fingerprint=fingerprint,
+            path=request.path
+        ), True
+    except IntegrityError:
+        existing = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if existing is None:
+            # 선점 직후 정리된 경우
+            return _claim(request, key, fingerprint)
+        if existing.created_at < timezone.now() - IDEMPOTENCY_KEY_TTL:
+            # 만료된 키는 새 요청으로 처리
+            existing.delete()
+            return _claim(request, key, fingerprint)
+        return existing, False
+
+
+def idempotent(view_method):
+    """Idempotency-Key 헤더가 있는 POST 를 한 번만 실행
+    
+    같은 키로 재시도하면 저장된 첫 응답을 예약 테이블 조회 없이 그대로 반환한다.
+    같은 키에 다른 요청 본문이면 422, 첫 요청이 아직 처리 중이면 409 를 반환한다.
+    5xx 응답이나 예외는 저장하지 않고 키를 해제해 다시 시도할 수 있게 한다.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.META.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            return Response(
+                {'error': f'Idempotency-Key 는 {MAX_IDEMPOTENCY_KEY_LENGTH}자 이하여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        fingerprint = request_fingerprint(request)
+        record, claimed = _claim(request, key, fingerprint)
+        if not claimed:
+            if record.fingerprint != fingerprint:
+                return Response(
+                    {'error': '같은 Idempotency-Key 로 다른 요청을 보낼 수 없습니다.'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+            if record.completed_at is None:
+                return Response(
+                    {'error': '같은 Idempotency-Key 의 요청을 처리하고 있습니다.'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            response = Response(record.response_body, status=record.status_code)
+            response['Idempotent-Replayed'] = 'true'
+            return response
+        
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        
+        if response.status_code >= 500 or not hasattr(response, 'data'):
+            record.delete()
+            return response
+        
+        record.status_code = response.status_code
+        record.response_body = response.data
+        record.completed_at = timezone.now()
+        record.save(update_fields=['status_code', 'response_body', 'completed_at'])
+        return response
+    
+    return wrapper
+
+
+def cleanup_idempotency_keys() -> int:
+    """보관 기간이 지난 멱등성 키 삭제"""
+    return IdempotencyKey.objects.filter(
+        created_at__lt=timezone.now() - IDEMPOTENCY_KEY_TTL
+    ).delete()[0]
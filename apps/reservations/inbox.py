@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.pagination import CursorPagination
+
+from .models import Reservation
+from .services import reservation_service, MAX_BULK_TRANSITION
+
+
+# 응답 없이 이 시간이 지난 대기 요청은 자동 만료
+PENDING_REQUEST_TTL_HOURS = 72
+# 자동 만료 처리자/사유 (변경 로그와 거절 메모에 기록)
+EXPIRY_ACTOR = '시스템'
+EXPIRY_REASON = '응답 기한 만료'
+
+
+class PendingInboxPagination(CursorPagination):
+    """대기 요청함 커서 페이지네이션 (먼저 들어온 요청부터)
+
+    (trainer, reservation_status, created_at) 인덱스를 그대로 따라가므로
+    페이지가 뒤로 가도 OFFSET 없이 인덱스 범위 조회 1회로 끝난다.
+    """
+    ordering = ('created_at', 'id')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class PendingInboxService:
+    """트레이너 대기 요청함 서비스"""
+
+    def __init__(self):
+        pass
+
+    def queryset(self, trainer_id: int):
+        """트레이너의 대기 요청 (목록 표시용 연관 객체 포함)"""
+        return Reservation.objects.filter(
+            trainer_id=trainer_id,
+            reservation_status='pending'
+        ).select_related('member__branch', 'trainer', 'pt_registration__pt_program')
+
+    def count(self, trainer_id: int) -> int:
+        """배지 표시용 대기 요청 수 (인덱스만 읽는 COUNT 1회)"""
+        return Reservation.objects.filter(trainer_id=trainer_id, reservation_status='pending').count()
+
+    def stale(self, now: Optional[datetime] = None):
+        """만료 대상 대기 요청 (예약 시작 시각이 지났거나 응답 기한이 지난 요청)"""
+        now = timezone.localtime(now or timezone.now())
+        today = now.date()
+        return Reservation.objects.filter(reservation_status='pending').filter(
+            Q(date__lt=today)
+            | Q(date=today, start_time__lte=now.time())
+            | Q(created_at__lt=now - timedelta(hours=PENDING_REQUEST_TTL_HOURS))
+        )
+
+    def expire_stale(self, now: Optional[datetime] = None) -> int:
+        """만료 대상 대기 요청을 묶음 단위로 일괄 거절 (거절된 건수 반환)
+
+        묶음마다 일괄 상태 변경을 그대로 사용하므로 변경 로그, 점유 비트,
+        당일 보드, 회원 알림이 단건 거절과 같게 처리된다.
+        """
+        stale = self.stale(now).order_by('id')
+        expired = 0
+        last_id = 0
+        while True:
+            reservation_ids = list(
+                stale.filter(id__gt=last_id).values_list('id', flat=True)[:MAX_BULK_TRANSITION]
+            )
+            if not reservation_ids:
+                return expired
+            last_id = reservation_ids[-1]
+            # 조회 후 다른 요청이 먼저 확정/거절한 예약은 invalid_status 로 건너뜀
+            outcome = reservation_service.bulk_transition(
+                reservation_ids, 'rejected', EXPIRY_ACTOR, EXPIRY_REASON
+            )
+            expired += outcome['updated']
+
+
+# 싱글톤 인스턴스
+pending_inbox_service = PendingInboxService()
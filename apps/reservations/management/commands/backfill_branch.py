@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min, OuterRef, Subquery
+
+from apps.trainers.models import Trainer
+from apps.reservations.models import Reservation, PTRecord
+
+
+class Command(BaseCommand):
+    help = '예약/PT 수행 내역의 지점 컬럼 백필 (ID 구간별로 나누어 UPDATE)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk', type=int, default=5000, help='UPDATE 1회당 ID 구간 크기')
+        parser.add_argument('--all', action='store_true', help='이미 채워진 행도 트레이너 지점으로 다시 기록')
+
+    def handle(self, *args, **options):
+        chunk = max(options['chunk'], 1)
+        trainer_branch = Subquery(
+            Trainer.objects.filter(id=OuterRef('trainer_id')).values('branch_id')[:1]
+        )
+
+        for model in (Reservation, PTRecord):
+            queryset = model.objects.all() if options['all'] else model.objects.filter(branch__isnull=True)
+            bounds = queryset.aggregate(low=Min('id'), high=Max('id'))
+            if bounds['low'] is None:
+                self.stdout.write(f"{model._meta.verbose_name}: 백필할 행 없음")
+                continue
+
+            updated = 0
+            for low in range(bounds['low'], bounds['high'] + 1, chunk):
+                # 구간마다 짧은 트랜잭션으로 커밋해 잠금을 오래 잡지 않음
+                with transaction.atomic():
+                    updated += queryset.filter(id__gte=low, id__lt=low + chunk).update(branch_id=trainer_branch)
+            self.stdout.write(f"{model._meta.verbose_name}: {updated}행 백필")
+
+        self.stdout.write(self.style.SUCCESS("지점 컬럼 백필 완료"))
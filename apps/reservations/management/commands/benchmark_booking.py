@@ -0,0 +1,174 @@
+import random
+import threading
+import time as timer
+from collections import defaultdict
+from datetime import date, time, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.branches.models import Branch
+from apps.members.models import Member
+from apps.trainers.models import Trainer, TrainerSchedule
+from apps.reservations.models import Reservation
+from apps.reservations.availability import ACTIVE_RESERVATION_STATUSES, to_minutes, end_to_minutes
+from apps.reservations.services import reservation_service, ReservationConflictError
+from clamood_gym.celery import app as celery_app
+
+
+class Command(BaseCommand):
+    help = '동시 예약 생성 벤치마크 (초당 예약 수 및 중복 예약 검사)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='동시 실행 스레드 수')
+        parser.add_argument('--attempts', type=int, default=50, help='스레드별 예약 시도 횟수')
+        parser.add_argument('--trainers', type=int, default=2, help='예약 대상 트레이너 수')
+        parser.add_argument('--days', type=int, default=1, help='예약 대상 날짜 수')
+        parser.add_argument('--seed', type=int, default=None, help='난수 시드')
+        parser.add_argument('--keep', action='store_true', help='벤치마크 데이터 유지')
+
+    def handle(self, *args, **options):
+        # 알림 태스크는 브로커 없이 동기 실행
+        celery_app.conf.task_always_eager = True
+        rng = random.Random(options['seed'])
+
+        branch, trainers, members = self._create_fixtures(options['threads'], options['trainers'])
+        days = [date.today() + timedelta(days=offset + 1) for offset in range(options['days'])]
+        self.stdout.write(
+            f"DB: {connection.vendor}, 스레드 {options['threads']}개 × {options['attempts']}회, "
+            f"트레이너 {len(trainers)}명, {len(days)}일"
+        )
+
+        # 스레드별 시도 목록을 미리 만들어 두고 동시에 시작
+        # 시작 시각을 10분 단위로 섞어 시작 시간이 다른 겹치는 예약이 발생하도록 함
+        plans = [
+            [
+                (
+                    rng.choice(trainers),
+                    rng.choice(days),
+                    time(rng.randrange(9, 21), rng.choice([0, 10, 20, 30, 40, 50])),
+                    rng.choice([30, 50, 60])
+                )
+                for _ in range(options['attempts'])
+            ]
+            for _ in range(options['threads'])
+        ]
+        counts = defaultdict(int)
+        errors = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['threads'])
+
+        def worker(member, plan):
+            barrier.wait()
+            try:
+                for trainer, day, start_time, duration in plan:
+                    try:
+                        reservation_service.create_reservation(
+                            member=member,
+                            trainer=trainer,
+                            date=day,
+                            start_time=start_time,
+                            duration=duration
+                        )
+                        result = 'created'
+                    except ReservationConflictError:
+                        result = 'conflict'
+                    except Exception as e:
+                        result = 'error'
+                        with lock:
+                            errors.append(str(e))
+                    with lock:
+                        counts[result] += 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(member, plan))
+            for member, plan in zip(members, plans)
+        ]
+        started = timer.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = timer.perf_counter() - started
+
+        try:
+            overlaps = self._find_overlaps(trainers)
+            total = sum(counts.values())
+            self.stdout.write(
+                f"시도 {total}건 / 생성 {counts['created']}건 / 충돌 {counts['conflict']}건 / "
+                f"오류 {counts['error']}건 / {elapsed:.2f}초"
+            )
+            self.stdout.write(
+                f"처리량: {total / elapsed:.1f}건/초 (생성 {counts['created'] / elapsed:.1f}건/초)"
+            )
+            for message in sorted(set(errors))[:5]:
+                self.stdout.write(self.style.WARNING(f"오류: {message}"))
+
+            if overlaps:
+                for trainer_id, day, first, second in overlaps[:10]:
+                    self.stdout.write(self.style.ERROR(
+                        f"중복 예약: 트레이너 {trainer_id} {day} {first} ↔ {second}"
+                    ))
+                self.stdout.write(self.style.ERROR(f"중복 예약 {len(overlaps)}건 발견"))
+            else:
+                self.stdout.write(self.style.SUCCESS("중복 예약 없음"))
+        finally:
+            if not options['keep']:
+                self._cleanup(branch)
+
+    def _create_fixtures(self, member_count, trainer_count):
+        """벤치마크용 지점/트레이너/회원 생성"""
+        branch = Branch.objects.create(
+            name=f"벤치마크 지점 {timer.time_ns()}",
+            address="벤치마크",
+            phone="02-0000-0000",
+            email="benchmark@clamood.com"
+        )
+        trainers = []
+        for index in range(trainer_count):
+            trainer = Trainer.objects.create(
+                branch=branch,
+                name=f"벤치마크 트레이너 {index + 1}",
+                phone="010-0000-0000",
+                hire_date=date.today(),
+                base_salary=0
+            )
+            TrainerSchedule.objects.bulk_create([
+                TrainerSchedule(
+                    trainer=trainer,
+                    day_of_week=day_of_week,
+                    start_time=time(9, 0),
+                    end_time=time(22, 0)
+                )
+                for day_of_week in range(7)
+            ])
+            trainers.append(trainer)
+        members = [
+            Member.objects.create(branch=branch, name=f"벤치마크 회원 {index + 1}", phone="010-0000-0000")
+            for index in range(member_count)
+        ]
+        return branch, trainers, members
+
+    def _cleanup(self, branch):
+        """벤치마크 데이터 삭제 (회원/트레이너/예약은 지점 삭제 시 함께 삭제됨)"""
+        branch.delete()
+
+    def _find_overlaps(self, trainers):
+        """트레이너-날짜별 활성 예약 중 시간이 겹치는 쌍 검사"""
+        rows = Reservation.objects.filter(
+            trainer__in=trainers,
+            reservation_status__in=ACTIVE_RESERVATION_STATUSES
+        ).order_by('trainer_id', 'date', 'start_time').values_list(
+            'trainer_id', 'date', 'start_time', 'end_time'
+        )
+
+        overlaps = []
+        previous = None
+        for trainer_id, day, start_time, end_time in rows:
+            if previous and previous[:2] == (trainer_id, day) and to_minutes(start_time) < previous[3]:
+                overlaps.append((trainer_id, day, previous[2], start_time))
+            if not previous or previous[:2] != (trainer_id, day) or end_to_minutes(end_time) > previous[3]:
+                previous = (trainer_id, day, start_time, end_to_minutes(end_time))
+        return overlaps
@@ -0,0 +1,47 @@
+from datetime import date, datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.trainers.models import Trainer
+from apps.reservations.models import TrainerDayOccupancy
+from apps.reservations.occupancy import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = '트레이너 일별 점유 비트마스크 재생성 (백필/복구)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trainer', type=int, action='append', help='트레이너 ID (여러 번 지정 가능, 기본: 재직 중인 전체)')
+        parser.add_argument('--start', help='시작일 (YYYY-MM-DD, 기본: 오늘)')
+        parser.add_argument('--end', help='종료일 (YYYY-MM-DD, 기본: 시작일 + 30일)')
+        parser.add_argument('--purge', action='store_true', help='시작일 이전 행 삭제')
+
+    def handle(self, *args, **options):
+        try:
+            start_date = self._parse_date(options['start']) or date.today()
+            end_date = self._parse_date(options['end']) or start_date + timedelta(days=30)
+        except ValueError:
+            raise CommandError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+        if end_date < start_date:
+            raise CommandError("종료일은 시작일 이후여야 합니다.")
+
+        if options['trainer']:
+            trainer_ids = options['trainer']
+        else:
+            trainer_ids = list(
+                Trainer.objects.filter(employment_status='active').values_list('id', flat=True)
+            )
+
+        count = rebuild_occupancy(trainer_ids, start_date, end_date)
+        self.stdout.write(
+            f"트레이너 {len(trainer_ids)}명, {start_date} ~ {end_date}: {count}행 재생성"
+        )
+
+        if options['purge']:
+            deleted, _ = TrainerDayOccupancy.objects.filter(date__lt=start_date).delete()
+            self.stdout.write(f"{start_date} 이전 {deleted}행 삭제")
+
+        self.stdout.write(self.style.SUCCESS("점유 비트마스크 재생성 완료"))
+
+    def _parse_date(self, value):
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
@@ -0,0 +1,15 @@
+from .audit import change_log_writer
+
+
+class ChangeLogBufferMiddleware:
+    """요청 단위 예약 변경 로그 버퍼
+
+    요청 동안 커밋된 변경 로그를 모아 응답 직전에 bulk_create 1회로 저장한다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with change_log_writer.scope():
+            return self.get_response(request)
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0001_initial'),
+        ('reservations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainerDayLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('locked_at', models.DateTimeField(auto_now=True, verbose_name='최근 잠금일시')),
+                ('trainer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='trainers.trainer', verbose_name='트레이너')),
+            ],
+            options={
+                'verbose_name': '트레이너 날짜 잠금',
+                'verbose_name_plural': '트레이너 날짜 잠금들',
+                'unique_together': {('trainer', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0001_initial'),
+        ('reservations', '0002_trainer_day_lock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainerDayOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('schedule_mask', models.BigIntegerField(default=0, verbose_name='근무 슬롯')),
+                ('schedule_aligned', models.BooleanField(default=True, verbose_name='근무 시간 30분 단위 여부')),
+                ('blocked_mask', models.BigIntegerField(default=0, verbose_name='차단 슬롯')),
+                ('reserved_mask', models.BigIntegerField(default=0, verbose_name='예약 슬롯')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('trainer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='trainers.trainer', verbose_name='트레이너')),
+            ],
+            options={
+                'verbose_name': '트레이너 일별 점유',
+                'verbose_name_plural': '트레이너 일별 점유들',
+                'unique_together': {('trainer', 'date')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0003_trainer_day_occupancy'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ptrecord',
+            index=models.Index(fields=['trainer', 'workout_date', 'is_completed'], name='ptrec_trainer_date_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['trainer', 'date', 'reservation_status'], name='resv_trainer_date_status_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('branches', '0001_initial'),
+        ('reservations', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ptrecord',
+            name='branch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='branches.branch', verbose_name='지점'),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='branch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='branches.branch', verbose_name='지점'),
+        ),
+        migrations.AddIndex(
+            model_name='ptrecord',
+            index=models.Index(fields=['branch', 'workout_date'], name='ptrec_branch_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['branch', 'date'], name='resv_branch_date_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.23 on 2026-10-18 05:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('branches', '0002_branch_closure'),
+        ('reservations', '0006_idempotency_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TodayBoard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('base_version', models.PositiveBigIntegerField(default=1, verbose_name='생성 버전')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='현재 버전')),
+                ('built_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+                ('branch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='branches.branch', verbose_name='지점')),
+            ],
+            options={
+                'verbose_name': '당일 예약 보드',
+                'verbose_name_plural': '당일 예약 보드들',
+            },
+        ),
+        migrations.CreateModel(
+            name='TodayBoardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reservation_id', models.BigIntegerField(verbose_name='예약 ID')),
+                ('version', models.PositiveBigIntegerField(verbose_name='변경 버전')),
+                ('removed', models.BooleanField(default=False, verbose_name='제거 여부')),
+                ('data', models.JSONField(default=dict, verbose_name='표시 데이터')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='reservations.todayboard', verbose_name='보드')),
+            ],
+            options={
+                'verbose_name': '당일 예약 보드 항목',
+                'verbose_name_plural': '당일 예약 보드 항목들',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='todayboardentry',
+            index=models.Index(fields=['board', 'version'], name='board_entry_version_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='todayboardentry',
+            unique_together={('board', 'reservation_id')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='todayboard',
+            unique_together={('branch', 'date')},
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0007_today_board'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['trainer', 'reservation_status', 'created_at'], name='resv_trainer_inbox_idx'),
+        ),
+    ]
@@ -1,11 +1,15 @@
+from django.conf import settings
 from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
 from model_utils import FieldTracker
+from apps.branches.models import Branch
 from apps.members.models import Member, MemberPTRegistration
 from apps.trainers.models import Trainer
+from clamood_gym.concurrency import OptimisticLockMixin
 
 
-class Reservation(models.Model):
+class Reservation(OptimisticLockMixin, models.Model):
     """PT 예약 모델"""
     RESERVATION_STATUS_CHOICES = [
         ('pending', '대기중'),
@@ -33,6 +37,14 @@ class Reservation(models.Model):
         on_delete=models.CASCADE, 
         verbose_name='트레이너'
     )
+    # 트레이너 지점 (저장 시 기록, 지점 필터를 회원/트레이너 조인 없이 처리)
+    branch = models.ForeignKey(
+        Branch, 
+        on_delete=models.CASCADE, 
+        verbose_name='지점',
+        null=True, 
+        blank=True
+    )
     pt_registration = models.ForeignKey(
         MemberPTRegistration, 
         on_delete=models.CASCADE, 
@@ -66,6 +78,8 @@ class Reservation(models.Model):
         blank=True
     )
     notes = models.TextField(verbose_name='메모', blank=True)
+    # 낙관적 동시성 제어 버전 (저장할 때마다 1씩 증가)
+    version = models.PositiveIntegerField(default=1, verbose_name='버전')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
@@ -74,16 +88,140 @@ class Reservation(models.Model):
         verbose_name_plural = 'PT 예약들'
         ordering = ['-date', '-start_time']
         unique_together = ['trainer', 'date', 'start_time']
+        indexes = [
+            # 트레이너 기간별 활성 예약 조회 (가용성/점유 비트 계산)
+            models.Index(fields=['trainer', 'date', 'reservation_status'], name='resv_trainer_date_status_idx'),
+            # 지점 기간별 예약 조회 (지점 목록/대시보드)
+            models.Index(fields=['branch', 'date'], name='resv_branch_date_idx'),
+            # 트레이너 대기 요청함 (상태별 접수 순 커서 조회/배지 수)
+            models.Index(fields=['trainer', 'reservation_status', 'created_at'], name='resv_trainer_inbox_idx'),
+        ]
 
     def __str__(self):
         return f"{self.member.name} - {self.trainer.name} ({self.date} {self.start_time})"
 
+    def save(self, *args, **kwargs):
+        """저장 시 트레이너 지점 기록"""
+        if self.trainer_id and (self.branch_id is None or self.tracker.has_changed('trainer')):
+            self.branch_id = self.trainer.branch_id
+        super().save(*args, **kwargs)
+
     def get_duration_display(self):
         """PT 시간 표시"""
         return f"{self.duration}분"
     
     # 필드 변경 추적
-    tracker = FieldTracker(fields=['reservation_status'])
+    tracker = FieldTracker(fields=['reservation_status', 'trainer', 'branch', 'date', 'start_time', 'end_time'])
+
+
+class TrainerDayLock(models.Model):
+    """트레이너-날짜 예약 잠금 모델
+    
+    같은 트레이너의 같은 날짜 예약 생성만 직렬화하기 위해 select_for_update 대상이 되는 행
+    """
+    trainer = models.ForeignKey(
+        Trainer, 
+        on_delete=models.CASCADE, 
+        verbose_name='트레이너'
+    )
+    date = models.DateField(verbose_name='날짜')
+    locked_at = models.DateTimeField(auto_now=True, verbose_name='최근 잠금일시')
+
+    class Meta:
+        verbose_name = '트레이너 날짜 잠금'
+        verbose_name_plural = '트레이너 날짜 잠금들'
+        unique_together = ['trainer', 'date']
+
+    def __str__(self):
+        return f"{self.trainer_id} - {self.date}"
+
+
+class TrainerDayOccupancy(models.Model):
+    """트레이너 일별 점유 비트마스크 모델
+    
+    하루를 30분 슬롯 48개로 나누어 비트 i 가 [i*30분, (i+1)*30분) 슬롯을 나타낸다.
+    근무/차단/예약 비트를 따로 저장해 변경된 원본에 해당하는 비트만 갱신한다.
+    """
+    trainer = models.ForeignKey(
+        Trainer, 
+        on_delete=models.CASCADE, 
+        verbose_name='트레이너'
+    )
+    date = models.DateField(verbose_name='날짜')
+    schedule_mask = models.BigIntegerField(default=0, verbose_name='근무 슬롯')
+    schedule_aligned = models.BooleanField(default=True, verbose_name='근무 시간 30분 단위 여부')
+    blocked_mask = models.BigIntegerField(default=0, verbose_name='차단 슬롯')
+    reserved_mask = models.BigIntegerField(default=0, verbose_name='예약 슬롯')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        verbose_name = '트레이너 일별 점유'
+        verbose_name_plural = '트레이너 일별 점유들'
+        unique_together = ['trainer', 'date']
+
+    def __str__(self):
+        return f"{self.trainer_id} - {self.date}"
+    
+    @property
+    def free_mask(self):
+        """예약 가능한 슬롯 비트"""
+        return self.schedule_mask & ~(self.blocked_mask | self.reserved_mask)
+    
+    def is_free(self, mask: int) -> bool:
+        """주어진 슬롯 비트가 모두 예약 가능한지 확인"""
+        return bool(mask) and self.free_mask & mask == mask
+
+
+class TodayBoard(models.Model):
+    """지점 당일 예약 보드 모델 (프런트 데스크 화면용 투영)
+    
+    하루에 한 번 생성한 뒤 예약/PT 기록 변경 시 바뀐 항목만 새 버전으로 갱신한다.
+    버전은 지점별로 계속 증가하며, base_version 은 보드를 만든 시점의 버전이다.
+    """
+    branch = models.ForeignKey(
+        Branch, 
+        on_delete=models.CASCADE, 
+        verbose_name='지점'
+    )
+    date = models.DateField(verbose_name='날짜')
+    base_version = models.PositiveBigIntegerField(default=1, verbose_name='생성 버전')
+    version = models.PositiveBigIntegerField(default=1, verbose_name='현재 버전')
+    built_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일시')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
+
+    class Meta:
+        verbose_name = '당일 예약 보드'
+        verbose_name_plural = '당일 예약 보드들'
+        unique_together = ['branch', 'date']
+
+    def __str__(self):
+        return f"{self.branch_id} - {self.date} (v{self.version})"
+
+
+class TodayBoardEntry(models.Model):
+    """당일 예약 보드 항목 모델 (예약 1건, 삭제/이동된 예약은 removed 로 남김)"""
+    board = models.ForeignKey(
+        TodayBoard, 
+        on_delete=models.CASCADE, 
+        related_name='entries',
+        verbose_name='보드'
+    )
+    reservation_id = models.BigIntegerField(verbose_name='예약 ID')
+    version = models.PositiveBigIntegerField(verbose_name='변경 버전')
+    removed = models.BooleanField(default=False, verbose_name='제거 여부')
+    data = models.JSONField(default=dict, verbose_name='표시 데이터')
+
+    class Meta:
+        verbose_name = '당일 예약 보드 항목'
+        verbose_name_plural = '당일 예약 보드 항목들'
+        unique_together = ['board', 'reservation_id']
+        indexes = [
+            # 버전 이후 변경분 조회
+            models.Index(fields=['board', 'version'], name='board_entry_version_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.board_id} - {self.reservation_id} (v{self.version})"
 
 
 class PTRecord(models.Model):
@@ -103,6 +241,14 @@ class PTRecord(models.Model):
         on_delete=models.CASCADE, 
         verbose_name='회원'
     )
+    # 트레이너 지점 (저장 시 기록)
+    branch = models.ForeignKey(
+        Branch, 
+        on_delete=models.CASCADE, 
+        verbose_name='지점',
+        null=True, 
+        blank=True
+    )
     workout_date = models.DateField(verbose_name='운동 날짜')
     workout_time = models.TimeField(verbose_name='운동 시간')
     duration = models.PositiveIntegerField(verbose_name='실제 운동 시간 (분)')
@@ -117,12 +263,24 @@ class PTRecord(models.Model):
         verbose_name = 'PT 수행 내역'
         verbose_name_plural = 'PT 수행 내역들'
         ordering = ['-workout_date', '-workout_time']
+        indexes = [
+            # 트레이너 월별 완료 세션 집계 (급여/대시보드)
+            models.Index(fields=['trainer', 'workout_date', 'is_completed'], name='ptrec_trainer_date_done_idx'),
+            # 지점 기간별 PT 수행 내역 조회 (매출/대시보드)
+            models.Index(fields=['branch', 'workout_date'], name='ptrec_branch_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.member.name} - {self.trainer.name} ({self.workout_date})"
+
+    def save(self, *args, **kwargs):
+        """저장 시 트레이너 지점 기록"""
+        if self.trainer_id and (self.branch_id is None or self.tracker.has_changed('trainer')):
+            self.branch_id = self.trainer.branch_id
+        super().save(*args, **kwargs)
     
     # 필드 변경 추적
-    tracker = FieldTracker(fields=['is_completed'])
+    tracker = FieldTracker(fields=['is_completed', 'trainer', 'branch', 'workout_date'])
 
 
 class PTRecordImage(models.Model):
@@ -197,3 +355,39 @@ class ReservationChangeLog(models.Model):
     def __str__(self):
         return f"{self.reservation} - {self.get_change_type_display()}"
 
+
+class IdempotencyKey(models.Model):
+    """멱등성 키 모델
+    
+    Idempotency-Key 헤더로 재시도된 POST 요청에 처음 응답을 그대로 돌려주기 위한
+    요청 지문과 응답 저장소
+    """
+    key = models.CharField(max_length=255, verbose_name='멱등성 키')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, 
+        on_delete=models.CASCADE, 
+        verbose_name='요청자'
+    )
+    fingerprint = models.CharField(max_length=64, verbose_name='요청 지문')
+    path = models.CharField(max_length=255, verbose_name='요청 경로')
+    status_code = models.PositiveSmallIntegerField(verbose_name='응답 상태 코드', null=True, blank=True)
+    response_body = models.JSONField(
+        verbose_name='응답 본문',
+        encoder=DjangoJSONEncoder,
+        null=True, 
+        blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    completed_at = models.DateTimeField(verbose_name='완료일', null=True, blank=True)
+
+    class Meta:
+        verbose_name = '멱등성 키'
+        verbose_name_plural = '멱등성 키들'
+        unique_together = ['user', 'key']
+        indexes = [
+            # 만료 키 정리
+            models.Index(fields=['created_at'], name='idem_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.key}"
@@ -0,0 +1,379 @@
+from collections import defaultdict
+from datetime import date, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.branches.closures import closure_calendar
+from apps.trainers.models import Trainer, TrainerScheduleOverride, TrainerBlockedTime
+from .availability import (
+    ACTIVE_RESERVATION_STATUSES,
+    MINUTES_PER_DAY,
+    Interval,
+    WorkSchedule,
+    fetch_schedules,
+    fetch_weekly_schedules,
+    merge_intervals,
+    to_minutes,
+    end_to_minutes,
+    from_minutes,
+)
+from .models import Reservation, TrainerDayLock, TrainerDayOccupancy
+
+
+# 비트 1개 = 30분 슬롯, 하루 48비트
+OCCUPANCY_SLOT_MINUTES = 30
+SLOTS_PER_DAY = MINUTES_PER_DAY // OCCUPANCY_SLOT_MINUTES
+# 예약 시 행을 저장하는 기간 (오늘부터 일수, 매일 재생성 범위와 같음)
+OCCUPANCY_HORIZON_DAYS = 30
+
+
+def span_mask(start: int, end: int) -> int:
+    """[start, end) 와 조금이라도 겹치는 슬롯 비트"""
+    first = start // OCCUPANCY_SLOT_MINUTES
+    last = -(-end // OCCUPANCY_SLOT_MINUTES)
+    if last <= first:
+        return 0
+    return ((1 << last) - 1) ^ ((1 << first) - 1)
+
+
+def covered_mask(start: int, end: int) -> int:
+    """[start, end) 에 완전히 포함되는 슬롯 비트"""
+    first = -(-start // OCCUPANCY_SLOT_MINUTES)
+    last = end // OCCUPANCY_SLOT_MINUTES
+    if last <= first:
+        return 0
+    return ((1 << last) - 1) ^ ((1 << first) - 1)
+
+
+def is_aligned(start: int, end: int) -> bool:
+    """구간 경계가 모두 30분 단위인지 확인"""
+    return start % OCCUPANCY_SLOT_MINUTES == 0 and end % OCCUPANCY_SLOT_MINUTES == 0
+
+
+def time_mask(start_time: time, end_time: time) -> Optional[int]:
+    """30분 단위 시간대의 슬롯 비트 (단위가 맞지 않으면 None)"""
+    start = to_minutes(start_time)
+    end = end_to_minutes(end_time)
+    if end <= start or not is_aligned(start, end):
+        return None
+    return span_mask(start, end)
+
+
+def busy_mask(intervals: Iterable[Interval]) -> int:
+    """점유 구간 목록의 비트마스크"""
+    mask = 0
+    for start, end in intervals:
+        mask |= span_mask(start, end)
+    return mask
+
+
+def schedule_masks(windows: Iterable[Interval]):
+    """근무 구간 목록의 (비트마스크, 30분 단위 정렬 여부)"""
+    mask = 0
+    aligned = True
+    for start, end in merge_intervals(windows):
+        mask |= covered_mask(start, end)
+        aligned = aligned and is_aligned(start, end)
+    return mask, aligned
+
+
+def iter_bits(mask: int):
+    """켜진 비트 위치를 낮은 순서대로 반환"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def lock_trainer_days(trainer_id: int, dates: Iterable[date]):
+    """트레이너-날짜 잠금 획득 (트랜잭션 안에서 호출)"""
+    lock_trainers_days([trainer_id], dates)
+
+
+def lock_trainers_days(trainer_ids: Iterable[int], dates: Iterable[date]):
+    """여러 트레이너의 트레이너-날짜 잠금 획득 (트랜잭션 안에서 호출)
+
+    잠금 행이 없으면 생성한 뒤 (트레이너, 날짜) 순서대로 select_for_update 로 잠가 교착 상태를 피한다.
+    select_for_update 를 지원하지 않는 SQLite 에서는 뒤이은 UPDATE 가 쓰기 잠금 역할을 한다.
+    """
+    trainer_ids = sorted(set(trainer_ids))
+    dates = sorted(set(dates))
+    if not trainer_ids or not dates:
+        return
+    TrainerDayLock.objects.bulk_create(
+        [TrainerDayLock(trainer_id=trainer_id, date=day) for trainer_id in trainer_ids for day in dates],
+        ignore_conflicts=True
+    )
+    locks = TrainerDayLock.objects.select_for_update().filter(
+        trainer_id__in=trainer_ids,
+        date__in=dates
+    ).order_by('trainer_id', 'date')
+    list(locks.values_list('id', flat=True))
+    locks.update(locked_at=timezone.now())
+
+
+def horizon_dates(today: Optional[date] = None) -> List[date]:
+    """예약 시 점유 행을 저장하는 날짜 (오늘 ~ OCCUPANCY_HORIZON_DAYS 일 뒤)"""
+    today = today or timezone.localdate()
+    return [today + timedelta(days=offset) for offset in range(OCCUPANCY_HORIZON_DAYS + 1)]
+
+
+class _ScheduleMasks:
+    """근무 구간 비트마스크 (요일/예외 날짜별로 한 번만 계산)"""
+
+    def __init__(self, schedule: WorkSchedule):
+        self.schedule = schedule
+        self._masks = {}
+
+    def get(self, day: date):
+        key = self.schedule.key(day)
+        if key not in self._masks:
+            self._masks[key] = schedule_masks(self.schedule.windows(day))
+        return self._masks[key]
+
+
+def _day_intervals(queryset) -> Dict[int, Dict[date, List[Interval]]]:
+    """(trainer_id, date, start_time, end_time) 행을 트레이너/날짜별 구간으로 묶음"""
+    intervals = defaultdict(lambda: defaultdict(list))
+    for trainer_id, day, start_time, end_time in queryset:
+        intervals[trainer_id][day].append((to_minutes(start_time), end_to_minutes(end_time)))
+    return intervals
+
+
+def _blocked_intervals(trainer_ids: Sequence[int], dates: Sequence[date]):
+    return _day_intervals(TrainerBlockedTime.objects.filter(
+        trainer_id__in=trainer_ids,
+        date__range=[min(dates), max(dates)]
+    ).values_list('trainer_id', 'date', 'start_time', 'end_time'))
+
+
+def _reserved_intervals(trainer_ids: Sequence[int], dates: Sequence[date]):
+    return _day_intervals(Reservation.objects.filter(
+        trainer_id__in=trainer_ids,
+        date__range=[min(dates), max(dates)],
+        reservation_status__in=ACTIVE_RESERVATION_STATUSES
+    ).values_list('trainer_id', 'date', 'start_time', 'end_time'))
+
+
+def compute_occupancy(
+    trainer_ids: Sequence[int],
+    dates: Sequence[date],
+    closures=None
+) -> List[TrainerDayOccupancy]:
+    """원본 테이블에서 트레이너-날짜별 점유 비트마스크 계산 (저장하지 않음, 쿼리 4회)
+
+    closures 를 주면 휴무 캘린더 캐시 대신 그 휴무로 근무 비트를 계산한다.
+    """
+    trainer_ids = list(trainer_ids)
+    dates = sorted(set(dates))
+    if not trainer_ids or not dates:
+        return []
+
+    schedules = fetch_schedules(trainer_ids, dates[0], dates[-1], closures)
+    blocked = _blocked_intervals(trainer_ids, dates)
+    reserved = _reserved_intervals(trainer_ids, dates)
+
+    rows = []
+    for trainer_id in trainer_ids:
+        masks = _ScheduleMasks(schedules[trainer_id])
+        for day in dates:
+            mask, aligned = masks.get(day)
+            rows.append(TrainerDayOccupancy(
+                trainer_id=trainer_id,
+                date=day,
+                schedule_mask=mask,
+                schedule_aligned=aligned,
+                blocked_mask=busy_mask(blocked.get(trainer_id, {}).get(day, ())),
+                reserved_mask=busy_mask(reserved.get(trainer_id, {}).get(day, ()))
+            ))
+    return rows
+
+
+def get_day_occupancy(
+    trainer_id: int,
+    dates: Sequence[date],
+    materialize: bool = False
+) -> Dict[date, TrainerDayOccupancy]:
+    """날짜별 점유 비트마스크 조회
+
+    저장된 행이 있으면 1회 조회로 끝나고, 없는 날짜만 원본 테이블에서 계산한다.
+    materialize=True 는 트레이너-날짜 잠금을 잡은 상태에서만 사용해 계산한 행을 저장한다.
+    원본(예약/차단 시간/근무 일정)을 바꾸는 쪽도 같은 잠금을 잡고 행을 갱신하므로 잠금 안에서 저장한 행은
+    동시 변경을 놓치지 않는다. 요일 근무 일정 변경은 저장 기간만 잠그므로 그 기간 안의 날짜만 저장한다.
+    """
+    dates = sorted(set(dates))
+    occupancy = {
+        row.date: row
+        for row in TrainerDayOccupancy.objects.filter(trainer_id=trainer_id, date__in=dates)
+    }
+    missing = [day for day in dates if day not in occupancy]
+    if missing:
+        # 저장할 근무 비트가 오래된 휴무 캐시로 계산되지 않도록 잠금 안에서 해당 날짜의 휴무만 원본에서 읽음
+        closures = closure_calendar.snapshot(missing) if materialize else None
+        rows = compute_occupancy([trainer_id], missing, closures)
+        if materialize:
+            horizon = set(horizon_dates())
+            TrainerDayOccupancy.objects.bulk_create(
+                [row for row in rows if row.date in horizon],
+                ignore_conflicts=True
+            )
+        occupancy.update({row.date: row for row in rows})
+    return occupancy
+
+
+def is_time_free(trainer_id: int, day: date, start_time: time, end_time: time, materialize: bool = False) -> Optional[bool]:
+    """비트 AND 로 시간대 예약 가능 여부 판정 (30분 단위가 아니면 None)"""
+    mask = time_mask(start_time, end_time)
+    if mask is None:
+        return None
+    return get_day_occupancy(trainer_id, [day], materialize)[day].is_free(mask)
+
+
+def refresh_reserved(trainer_id: int, dates: Iterable[date]):
+    """예약 변경 후 저장된 행의 예약 비트 갱신"""
+    _refresh(trainer_id, dates, 'reserved_mask', _reserved_intervals)
+
+
+def refresh_blocked(trainer_id: int, dates: Iterable[date]):
+    """차단 시간 변경 후 저장된 행의 차단 비트 갱신"""
+    _refresh(trainer_id, dates, 'blocked_mask', _blocked_intervals)
+
+
+def _refresh(trainer_id: int, dates: Iterable[date], field: str, fetch):
+    dates = sorted(set(dates))
+    if not dates:
+        return
+
+    with transaction.atomic():
+        # 예약과 같은 트레이너-날짜 잠금을 잡아, 잠금 안에서 행을 새로 저장 중인 예약이 커밋된 뒤에 갱신
+        lock_trainer_days(trainer_id, dates)
+        # 저장된 행만 잠근 뒤 원본을 다시 읽어 동시 갱신 시 마지막 커밋 기준으로 맞춤
+        rows = list(
+            TrainerDayOccupancy.objects.select_for_update().filter(trainer_id=trainer_id, date__in=dates)
+        )
+        if not rows:
+            return
+
+        intervals = fetch([trainer_id], [row.date for row in rows]).get(trainer_id, {})
+        now = timezone.now()
+        for row in rows:
+            setattr(row, field, busy_mask(intervals.get(row.date, ())))
+            row.updated_at = now
+        TrainerDayOccupancy.objects.bulk_update(rows, [field, 'updated_at'])
+
+
+def refresh_schedule(trainer_id: int, days_of_week: Optional[Iterable[int]] = None):
+    """근무 일정 변경 후 저장된 행의 근무 비트 갱신
+
+    요일별 UPDATE 1회로 갱신하고, 예외 일정/지점 휴무가 있는 날짜는 제외한 뒤 날짜별로 다시 계산한다.
+    예약이 행을 저장하는 기간의 트레이너-날짜 잠금을 먼저 잡아 저장 중인 행도 갱신 대상에 포함되게 한다.
+    """
+    days_of_week = set(range(7) if days_of_week is None else days_of_week)
+    # 기간 경계의 날짜가 바뀌는 경우를 위해 앞뒤 하루씩 더 잠금
+    today = timezone.localdate()
+    horizon = [today + timedelta(days=offset) for offset in range(-1, OCCUPANCY_HORIZON_DAYS + 2)]
+    with transaction.atomic():
+        lock_trainer_days(trainer_id, [day for day in horizon if day.weekday() in days_of_week])
+        _refresh_weekly_schedule(trainer_id, days_of_week)
+
+
+def _refresh_weekly_schedule(trainer_id: int, days_of_week):
+    weekly, branches = fetch_weekly_schedules([trainer_id])
+    weekly = weekly.get(trainer_id, {})
+    override_dates = TrainerScheduleOverride.objects.filter(trainer_id=trainer_id).values('date')
+    closed_dates = sorted(
+        day for day in closure_calendar.dates(branches.get(trainer_id)) if day.weekday() in days_of_week
+    )
+    for day_of_week in days_of_week:
+        mask, aligned = schedule_masks(weekly.get(day_of_week, ()))
+        TrainerDayOccupancy.objects.filter(
+            trainer_id=trainer_id,
+            # Django week_day 는 일요일=1, 월요일=2 ... 토요일=7
+            date__week_day=(day_of_week + 1) % 7 + 1
+        ).exclude(date__in=override_dates).exclude(date__in=closed_dates).update(
+            schedule_mask=mask, schedule_aligned=aligned
+        )
+    refresh_schedule_dates([trainer_id], closed_dates)
+
+
+def refresh_schedule_dates(trainer_ids: Sequence[int], dates: Iterable[date]):
+    """예외 일정/지점 휴무 변경 후 저장된 행의 근무 비트 갱신 (트레이너-날짜 잠금 후)"""
+    dates = sorted(set(dates))
+    if not trainer_ids or not dates:
+        return
+
+    with transaction.atomic():
+        lock_trainers_days(trainer_ids, dates)
+        rows = list(
+            TrainerDayOccupancy.objects.select_for_update().filter(trainer_id__in=trainer_ids, date__in=dates)
+        )
+        if not rows:
+            return
+
+        schedules = fetch_schedules(sorted({row.trainer_id for row in rows}), dates[0], dates[-1])
+        masks = {trainer_id: _ScheduleMasks(schedule) for trainer_id, schedule in schedules.items()}
+        now = timezone.now()
+        for row in rows:
+            row.schedule_mask, row.schedule_aligned = masks[row.trainer_id].get(row.date)
+            row.updated_at = now
+        TrainerDayOccupancy.objects.bulk_update(rows, ['schedule_mask', 'schedule_aligned', 'updated_at'])
+
+
+def refresh_branch_schedule_dates(branch_id: Optional[int], dates: Iterable[date]):
+    """지점 휴무 변경 후 지점 트레이너들의 저장된 행 근무 비트 갱신 (지점이 없으면 전 지점)
+
+    아직 행이 없는 트레이너도 같은 날짜에 예약하며 행을 저장하는 중일 수 있으므로 지점 트레이너 전체를 잠근다.
+    """
+    dates = sorted(set(dates))
+    if not dates:
+        return
+    trainers = Trainer.objects.all()
+    if branch_id is not None:
+        trainers = trainers.filter(branch_id=branch_id)
+    refresh_schedule_dates(list(trainers.values_list('id', flat=True)), dates)
+
+
+def rebuild_occupancy(trainer_ids: Sequence[int], start_date: date, end_date: date) -> int:
+    """기간 내 점유 비트마스크 재계산 후 저장 (없는 행 생성, 있는 행 덮어쓰기, 기간 휴무는 시작 시 원본에서 한 번 읽음)"""
+    dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    closures = closure_calendar.snapshot(dates)
+    count = 0
+    for trainer_id in trainer_ids:
+        with transaction.atomic():
+            lock_trainer_days(trainer_id, dates)
+            rows = compute_occupancy([trainer_id], dates, closures)
+            TrainerDayOccupancy.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['trainer', 'date'],
+                update_fields=['schedule_mask', 'schedule_aligned', 'blocked_mask', 'reserved_mask', 'updated_at']
+            )
+            count += len(rows)
+    return count
+
+
+def build_occupancy_slot_grid(occupancy: Dict[date, TrainerDayOccupancy]) -> List[Dict[str, object]]:
+    """점유 비트마스크로 30분 슬롯 그리드 생성 (build_slot_grid 와 같은 형식)"""
+    grid = []
+    for day in sorted(occupancy):
+        row = occupancy[day]
+        free = row.free_mask
+        slots = []
+        for bit in iter_bits(row.schedule_mask):
+            available = bool(free >> bit & 1)
+            slots.append({
+                'start_time': from_minutes(bit * OCCUPANCY_SLOT_MINUTES).strftime('%H:%M'),
+                'end_time': from_minutes((bit + 1) * OCCUPANCY_SLOT_MINUTES).strftime('%H:%M'),
+                'available': available,
+                'status': 'free' if available else 'busy',
+            })
+        grid.append({
+            'date': day.isoformat(),
+            'day_of_week': day.weekday(),
+            'is_working': bool(row.schedule_mask),
+            'available_count': sum(1 for slot in slots if slot['available']),
+            'slots': slots,
+        })
+    return grid
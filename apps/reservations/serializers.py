@@ -11,7 +11,11 @@ class ReservationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Reservation
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('branch', 'version', 'created_at', 'updated_at')
+        # 종료 시간은 생성 시 PT 시간으로 계산
+        extra_kwargs = {'end_time': {'required': False}}
+        # (트레이너, 날짜, 시작 시간) 중복은 잠금 후 충돌 검사에서 409 로 처리 (겹치는 시간대와 같은 응답)
+        validators = []
 
 class PTRecordSerializer(serializers.ModelSerializer):
     """PT 기록 시리얼라이저"""
@@ -22,7 +26,7 @@ class PTRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = PTRecord
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('branch', 'created_at', 'updated_at')
 
 class PTRecordImageSerializer(serializers.ModelSerializer):
     """PT 기록 이미지 시리얼라이저"""
@@ -55,7 +59,7 @@ class ReservationDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Reservation
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at')
+        read_only_fields = ('branch', 'version', 'created_at', 'updated_at')
 
 class PTRecordDetailSerializer(serializers.ModelSerializer):
     """PT 기록 상세 정보 시리얼라이저"""
@@ -67,4 +71,4 @@ class PTRecordDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = PTRecord
         fields = '__all__'
-        read_only_fields = ('created_at', 'updated_at') 
\ No newline at end of file
+        read_only_fields = ('branch', 'created_at', 'updated_at') 
\ No newline at end of file
@@ -1,12 +1,52 @@
+import calendar
 from datetime import datetime, date, timedelta
 from typing import List, Optional, Dict, Any
-from django.db import transaction
+from time import sleep
+from django.db import transaction, IntegrityError, OperationalError
 from django.utils import timezone
-from django.db.models import Q
-from .models import Reservation, PTRecord, ReservationChangeLog
+from django.db.models import F, Value, TextField, Case, When
+from django.db.models.functions import Concat
+from .models import Reservation, PTRecord
+from .audit import change_log_writer
+from .today_board import today_board_service
 from apps.members.models import Member, MemberPTRegistration
-from apps.trainers.models import Trainer, TrainerSchedule, TrainerBlockedTime
+from apps.trainers.models import Trainer
+from apps.branches.closures import closure_calendar
 from apps.notifications.services import notification_service
+from apps.dashboards.daily_stats import daily_stats_service
+from .availability import (
+    TrainerAvailability,
+    build_slot_grid,
+    validate_slot_minutes,
+    DEFAULT_SLOT_MINUTES,
+    MAX_SLOT_GRID_DAYS
+)
+from .occupancy import (
+    OCCUPANCY_SLOT_MINUTES,
+    lock_trainer_days,
+    is_time_free,
+    get_day_occupancy,
+    build_occupancy_slot_grid,
+    refresh_reserved
+)
+from .branch_availability import BranchOccupancyMatrix
+
+
+# 잠금 경합 시 재시도 설정
+LOCK_RETRY_ATTEMPTS = 5
+LOCK_RETRY_DELAY = 0.05
+
+# 일괄 상태 변경: 변경 상태별 허용되는 이전 상태
+BULK_TRANSITIONS = {
+    'confirmed': ['pending'],
+    'rejected': ['pending'],
+    'cancelled': ['pending', 'confirmed'],
+}
+MAX_BULK_TRANSITION = 200
+
+
+class ReservationConflictError(ValueError):
+    """예약 시간대 충돌 오류"""
 
 
 class ReservationService:
@@ -38,48 +78,116 @@ class ReservationService:
         end_datetime = start_datetime + timedelta(minutes=duration)
         end_time = end_datetime.time()
         
-        # 예약 가능 여부 확인
-        if not self._is_time_available(trainer, date, start_time, end_time):
-            raise ValueError("해당 시간대는 예약할 수 없습니다.")
-        
         # 회원의 PT 등록 확인
         if pt_registration and pt_registration.remaining_sessions <= 0:
             raise ValueError("남은 PT 횟수가 없습니다.")
         
+        # 반복 예약 날짜까지 같은 잠금 범위에 포함
+        lock_dates = [date]
+        if repeat_type != 'none' and repeat_end_date:
+            lock_dates += self._expand_repeat_dates(date, repeat_type, repeat_end_date)
+        
+        # SQLite 는 동시 쓰기 시 'database is locked' 로 실패할 수 있으므로 최상위 트랜잭션에서만 재시도
+        for attempt in range(LOCK_RETRY_ATTEMPTS):
+            try:
+                return self._book_reservation(
+                    member, trainer, date, start_time, end_time, duration,
+                    pt_registration, repeat_type, repeat_end_date, notes, lock_dates
+                )
+            except OperationalError:
+                if transaction.get_connection().in_atomic_block or attempt == LOCK_RETRY_ATTEMPTS - 1:
+                    raise
+                sleep(LOCK_RETRY_DELAY * (attempt + 1))
+    
+    def _book_reservation(
+        self,
+        member: Member,
+        trainer: Trainer,
+        date: date,
+        start_time,
+        end_time,
+        duration: int,
+        pt_registration: Optional[MemberPTRegistration],
+        repeat_type: str,
+        repeat_end_date: Optional[date],
+        notes: str,
+        lock_dates: List[date]
+    ) -> Reservation:
+        """잠금 범위 안에서 충돌 검사 후 예약 생성"""
+        # 지점 휴무는 프로세스 내 휴무 캘린더로 먼저 확인 (쿼리 없음)
+        if closure_calendar.is_closed(trainer.branch_id, date, start_time, end_time):
+            raise ReservationConflictError("지점 휴무 시간대에는 예약할 수 없습니다.")
+        
         with transaction.atomic():
+            lock_trainer_days(trainer.id, lock_dates)
+            
+            # 다른 프로세스에서 방금 등록한 휴무가 캐시에 없을 수 있으므로 잠금 안에서 예약 날짜의 휴무만 원본으로 다시 확인
+            closures = closure_calendar.snapshot(lock_dates, [trainer.branch_id])
+            if closures.is_closed(trainer.branch_id, date, start_time, end_time):
+                raise ReservationConflictError("지점 휴무 시간대에는 예약할 수 없습니다.")
+            
+            # 단일 예약은 점유 비트마스크 AND 로 충돌 검사 (30분 단위가 아니면 None)
+            availability = None
+            is_free = None
+            if len(lock_dates) == 1:
+                is_free = is_time_free(trainer.id, date, start_time, end_time, materialize=True)
+            if is_free is None:
+                # 잠금 획득 후 반복 예약 기간까지 가용성을 한 번에 로드해 충돌 검사
+                availability = TrainerAvailability.load(trainer, date, max(lock_dates))
+                is_free = availability.is_available(date, start_time, end_time)
+            if not is_free:
+                raise ReservationConflictError("해당 시간대는 예약할 수 없습니다.")
+            
             # 예약 생성
-            reservation = Reservation.objects.create(
-                member=member,
-                trainer=trainer,
-                pt_registration=pt_registration,
-                date=date,
-                start_time=start_time,
-                end_time=end_time,
-                duration=duration,
-                repeat_type=repeat_type,
-                repeat_end_date=repeat_end_date,
-                notes=notes
-            )
+            try:
+                with transaction.atomic():
+                    reservation = Reservation.objects.create(
+                        member=member,
+                        trainer=trainer,
+                        pt_registration=pt_registration,
+                        date=date,
+                        start_time=start_time,
+                        end_time=end_time,
+                        duration=duration,
+                        repeat_type=repeat_type,
+                        repeat_end_date=repeat_end_date,
+                        notes=notes
+                    )
+            except IntegrityError:
+                # 같은 시작 시간의 취소/거절 예약이 유니크 제약에 걸린 경우
+                raise ReservationConflictError("해당 시간대는 예약할 수 없습니다.")
+            if availability is not None:
+                availability.reserve(date, start_time, end_time)
             
             # 반복 예약 생성
             if repeat_type != 'none' and repeat_end_date:
-                self._create_repeat_reservations(reservation)
+                reservation.repeat_summary = self._create_repeat_reservations(
+                    reservation, availability, changed_by=f"{member.name} (회원)", closures=closures
+                )
             
             # 변경 로그 기록
-            ReservationChangeLog.objects.create(
+            change_log_writer.record(
                 reservation=reservation,
                 change_type='created',
                 changed_by=f"{member.name} (회원)",
                 new_status='pending'
             )
             
-            # 트레이너에게 알림 전송
-            notification_service.send_reservation_notification(
-                reservation=reservation,
-                notification_type='reservation_request',
-                recipient_type='trainer',
-                recipient_id=trainer.id
-            )
+            # 트레이너에게 알림 전송 (반복 예약은 시리즈당 1건)
+            repeat_summary = getattr(reservation, 'repeat_summary', None)
+            if repeat_summary and repeat_summary['created']:
+                notification_service.send_repeat_reservation_notification(
+                    reservation=reservation,
+                    created_count=repeat_summary['created'],
+                    skipped_count=len(repeat_summary['skipped'])
+                )
+            else:
+                notification_service.send_reservation_notification(
+                    reservation=reservation,
+                    notification_type='reservation_request',
+                    recipient_type='trainer',
+                    recipient_id=trainer.id
+                )
             
             return reservation
     
@@ -90,10 +198,10 @@ class ReservationService:
         
         with transaction.atomic():
             reservation.reservation_status = 'confirmed'
-            reservation.save()
+            reservation.save(update_fields=['reservation_status', 'updated_at'])
             
             # 변경 로그 기록
-            ReservationChangeLog.objects.create(
+            change_log_writer.record(
                 reservation=reservation,
                 change_type='confirmed',
                 changed_by=confirmed_by,
@@ -119,10 +227,10 @@ class ReservationService:
         with transaction.atomic():
             reservation.reservation_status = 'rejected'
             reservation.notes = f"거절 사유: {reason}\n\n{reservation.notes}"
-            reservation.save()
+            reservation.save(update_fields=['reservation_status', 'notes', 'updated_at'])
             
             # 변경 로그 기록
-            ReservationChangeLog.objects.create(
+            change_log_writer.record(
                 reservation=reservation,
                 change_type='rejected',
                 changed_by=rejected_by,
@@ -150,10 +258,10 @@ class ReservationService:
             previous_status = reservation.reservation_status
             reservation.reservation_status = 'cancelled'
             reservation.notes = f"취소 사유: {reason}\n\n{reservation.notes}"
-            reservation.save()
+            reservation.save(update_fields=['reservation_status', 'notes', 'updated_at'])
             
             # 변경 로그 기록
-            ReservationChangeLog.objects.create(
+            change_log_writer.record(
                 reservation=reservation,
                 change_type='cancelled',
                 changed_by=cancelled_by,
@@ -184,6 +292,126 @@ class ReservationService:
             
             return reservation
     
+    def bulk_transition(
+        self,
+        reservation_ids: List[int],
+        target_status: str,
+        changed_by: str,
+        reason: str = '',
+        queryset=None
+    ) -> Dict[str, Any]:
+        """여러 예약 상태 일괄 변경 (확정/거절/취소)
+        
+        대상 예약을 한 번에 잠금 조회해 검증한 뒤 UPDATE 1회로 상태를 바꾸고,
+        변경 로그와 알림은 bulk_create 로 기록한다. 알림 전송은 커밋 후 1개 태스크로 처리한다.
+        """
+        if target_status not in BULK_TRANSITIONS:
+            raise ValueError("변경할 수 없는 상태입니다.")
+        try:
+            reservation_ids = list(dict.fromkeys(int(reservation_id) for reservation_id in reservation_ids))
+        except (TypeError, ValueError):
+            raise ValueError("예약 ID 목록이 올바르지 않습니다.")
+        if not reservation_ids:
+            raise ValueError("예약 ID 목록이 필요합니다.")
+        if len(reservation_ids) > MAX_BULK_TRANSITION:
+            raise ValueError(f"한 번에 최대 {MAX_BULK_TRANSITION}건까지 변경할 수 있습니다.")
+        
+        allowed_statuses = BULK_TRANSITIONS[target_status]
+        queryset = Reservation.objects.all() if queryset is None else queryset
+        
+        with transaction.atomic():
+            reservations = {
+                reservation.id: reservation
+                for reservation in queryset.select_for_update(of=('self',)).select_related(
+                    'member', 'trainer'
+                ).filter(id__in=reservation_ids)
+            }
+            
+            results = []
+            targets = []
+            for reservation_id in reservation_ids:
+                reservation = reservations.get(reservation_id)
+                if reservation is None:
+                    results.append({'id': reservation_id, 'result': 'not_found'})
+                elif reservation.reservation_status not in allowed_statuses:
+                    results.append({
+                        'id': reservation_id,
+                        'result': 'invalid_status',
+                        'status': reservation.reservation_status
+                    })
+                else:
+                    results.append({
+                        'id': reservation_id,
+                        'result': 'updated',
+                        'previous_status': reservation.reservation_status,
+                        'status': target_status
+                    })
+                    targets.append(reservation)
+            
+            if targets:
+                self._apply_bulk_transition(targets, target_status, changed_by, reason)
+        
+        return {
+            'status': target_status,
+            'requested': len(reservation_ids),
+            'updated': len(targets),
+            'results': results,
+        }
+    
+    def _apply_bulk_transition(self, reservations: List[Reservation], target_status: str, changed_by: str, reason: str):
+        """검증된 예약 목록에 상태 변경/변경 로그/알림 일괄 적용"""
+        updates = {
+            'reservation_status': target_status,
+            'version': F('version') + 1,
+            'updated_at': timezone.now()
+        }
+        # 거절/취소 사유는 단건 처리와 같이 메모 앞에 기록
+        if target_status == 'rejected':
+            updates['notes'] = Concat(Value(f"거절 사유: {reason}\n\n"), F('notes'), output_field=TextField())
+        elif target_status == 'cancelled':
+            updates['notes'] = Concat(Value(f"취소 사유: {reason}\n\n"), F('notes'), output_field=TextField())
+        
+        # 시그널을 거치지 않는 UPDATE 이므로 변경 로그/알림/점유 비트는 아래에서 직접 처리
+        Reservation.objects.filter(id__in=[reservation.id for reservation in reservations]).update(**updates)
+        
+        change_log_writer.record_many(
+            dict(
+                reservation=reservation,
+                change_type=target_status,
+                changed_by=changed_by,
+                previous_status=reservation.reservation_status,
+                new_status=target_status,
+                reason=reason
+            )
+            for reservation in reservations
+        )
+        
+        # 거절/취소된 예약의 시간대 반환
+        if target_status not in ('pending', 'confirmed'):
+            released = {}
+            for reservation in reservations:
+                released.setdefault(reservation.trainer_id, set()).add(reservation.date)
+            for trainer_id, dates in released.items():
+                refresh_reserved(trainer_id, dates)
+        
+        # 알림 수신자 (단건 처리와 같은 규칙)
+        if target_status == 'cancelled':
+            recipients = [
+                (reservation, 'member', reservation.member_id)
+                if changed_by == reservation.trainer.name
+                else (reservation, 'trainer', reservation.trainer_id)
+                for reservation in reservations
+                if reservation.reservation_status == 'confirmed'
+            ]
+        else:
+            recipients = [(reservation, 'member', reservation.member_id) for reservation in reservations]
+        notification_service.send_reservation_notifications(f"reservation_{target_status}", recipients)
+        daily_stats_service.record_reservation_transition(reservations, target_status)
+        
+        for reservation in reservations:
+            reservation.reservation_status = target_status
+        today_board_service.patch_today(reservations)
+    
     def complete_pt_session(self, reservation: Reservation, trainer: Trainer, **kwargs) -> PTRecord:
         """PT 세션 완료"""
         if reservation.reservation_status != 'confirmed':
@@ -192,7 +420,7 @@ class ReservationService:
         with transaction.atomic():
             # 예약 상태 변경
             reservation.reservation_status = 'completed'
-            reservation.save()
+            reservation.save(update_fields=['reservation_status', 'updated_at'])
             
             # PT 수행 내역 생성
             pt_record = PTRecord.objects.create(
@@ -209,7 +437,7 @@ class ReservationService:
             )
             
             # 변경 로그 기록
-            ReservationChangeLog.objects.create(
+            change_log_writer.record(
                 reservation=reservation,
                 change_type='completed',
                 changed_by=trainer.name,
@@ -217,149 +445,338 @@ class ReservationService:
                 new_status='completed'
             )
             
-            # PT 등록의 남은 횟수 감소
-            if reservation.pt_registration:
-                pt_registration = reservation.pt_registration
-                pt_registration.remaining_sessions = max(0, pt_registration.remaining_sessions - 1)
-                pt_registration.save()
+            # PT 등록의 남은 횟수 감소 (조건부 UPDATE 로 동시 완료 시에도 차감 유실 없음)
+            if reservation.pt_registration_id:
+                self.consume_sessions({reservation.pt_registration_id: 1})
             
             # 완료 알림 전송
             notification_service.send_pt_completion_notification(pt_record)
             
             return pt_record
     
-    def _is_time_available(self, trainer: Trainer, date: date, start_time, end_time) -> bool:
-        """시간대 예약 가능 여부 확인"""
-        # 해당 날짜의 요일
-        day_of_week = date.weekday()
+    def complete_pt_sessions(
+        self,
+        trainer: Trainer,
+        sessions: List[Dict[str, Any]],
+        queryset=None
+    ) -> Dict[str, Any]:
+        """트레이너의 PT 세션 일괄 완료 (하루 마감 처리)
         
-        # 트레이너 일정 확인
+        sessions 는 {'id': 예약 ID, 'content', 'duration', 'member_condition', 'trainer_notes'} 목록.
+        대상 예약을 한 번에 잠금 조회해 검증한 뒤 상태 UPDATE 1회, PT 수행 내역 bulk_create 1회,
+        PT 등록별 차감 횟수마다 조건부 UPDATE 1회로 처리한다.
+        """
         try:
-            schedule = TrainerSchedule.objects.get(
-                trainer=trainer,
-                day_of_week=day_of_week,
-                is_available=True
+            sessions = {int(session['id']): session for session in sessions}
+        except (TypeError, KeyError, ValueError):
+            raise ValueError("완료할 세션 목록이 올바르지 않습니다.")
+        if not sessions:
+            raise ValueError("완료할 세션 목록이 필요합니다.")
+        if len(sessions) > MAX_BULK_TRANSITION:
+            raise ValueError(f"한 번에 최대 {MAX_BULK_TRANSITION}건까지 완료할 수 있습니다.")
+        
+        queryset = Reservation.objects.all() if queryset is None else queryset
+        
+        with transaction.atomic():
+            reservations = {
+                reservation.id: reservation
+                for reservation in queryset.select_for_update(of=('self',)).select_related(
+                    'member'
+                ).filter(id__in=list(sessions), trainer=trainer)
+            }
+            recorded = set(
+                PTRecord.objects.filter(reservation_id__in=list(reservations)).values_list('reservation_id', flat=True)
             )
             
-            # 일정 시간대와 겹치는지 확인
-            if start_time < schedule.start_time or end_time > schedule.end_time:
-                return False
-        except TrainerSchedule.DoesNotExist:
-            return False
-        
-        # 차단된 시간 확인
-        blocked_times = TrainerBlockedTime.objects.filter(
-            trainer=trainer,
-            date=date
+            results = []
+            targets = []
+            for reservation_id in sessions:
+                reservation = reservations.get(reservation_id)
+                if reservation is None:
+                    results.append({'id': reservation_id, 'result': 'not_found'})
+                elif reservation.reservation_status != 'confirmed':
+                    results.append({
+                        'id': reservation_id,
+                        'result': 'invalid_status',
+                        'status': reservation.reservation_status
+                    })
+                elif reservation_id in recorded:
+                    results.append({'id': reservation_id, 'result': 'already_recorded'})
+                else:
+                    results.append({'id': reservation_id, 'result': 'completed'})
+                    targets.append(reservation)
+            
+            if targets:
+                self._apply_session_completion(trainer, targets, sessions)
+        
+        return {
+            'trainer_id': trainer.id,
+            'requested': len(sessions),
+            'completed': len(targets),
+            'results': results,
+        }
+    
+    def _apply_session_completion(
+        self,
+        trainer: Trainer,
+        reservations: List[Reservation],
+        sessions: Dict[int, Dict[str, Any]]
+    ):
+        """검증된 예약 목록에 완료 처리/PT 수행 내역/세션 차감/변경 로그/알림 일괄 적용"""
+        # 시그널을 거치지 않는 UPDATE 이므로 변경 로그/알림/점유 비트는 아래에서 직접 처리
+        Reservation.objects.filter(id__in=[reservation.id for reservation in reservations]).update(
+            reservation_status='completed',
+            version=F('version') + 1,
+            updated_at=timezone.now()
         )
         
-        for blocked_time in blocked_times:
-            if (start_time < blocked_time.end_time and end_time > blocked_time.start_time):
-                return False
+        pt_records = PTRecord.objects.bulk_create([
+            PTRecord(
+                reservation=reservation,
+                trainer=trainer,
+                member=reservation.member,
+                branch_id=trainer.branch_id,
+                workout_date=reservation.date,
+                workout_time=reservation.start_time,
+                duration=sessions[reservation.id].get('duration') or reservation.duration,
+                content=sessions[reservation.id].get('content', ''),
+                member_condition=sessions[reservation.id].get('member_condition', ''),
+                trainer_notes=sessions[reservation.id].get('trainer_notes', ''),
+                is_completed=True
+            )
+            for reservation in reservations
+        ])
+        
+        session_counts = {}
+        for reservation in reservations:
+            if reservation.pt_registration_id:
+                session_counts[reservation.pt_registration_id] = session_counts.get(reservation.pt_registration_id, 0) + 1
+        self.consume_sessions(session_counts)
         
-        # 기존 예약과 겹치는지 확인
-        existing_reservations = Reservation.objects.filter(
-            trainer=trainer,
-            date=date,
-            reservation_status__in=['pending', 'confirmed']
+        change_log_writer.record_many(
+            dict(
+                reservation=reservation,
+                change_type='completed',
+                changed_by=trainer.name,
+                previous_status='confirmed',
+                new_status='completed'
+            )
+            for reservation in reservations
         )
         
-        for existing in existing_reservations:
-            if (start_time < existing.end_time and end_time > existing.start_time):
-                return False
+        refresh_reserved(trainer.id, {reservation.date for reservation in reservations})
+        notification_service.send_pt_completion_notifications(pt_records)
+        daily_stats_service.record_reservation_transition(reservations, 'completed')
+        daily_stats_service.record_created_pt_records(pt_records)
+        
+        for reservation in reservations:
+            reservation.reservation_status = 'completed'
+        today_board_service.patch_today(reservations)
+    
+    def consume_sessions(self, session_counts: Dict[int, int]) -> int:
+        """PT 등록별 남은 횟수 차감 (PT 등록 ID → 차감 횟수)
+        
+        remaining_sessions 를 읽어 파이썬에서 빼지 않고 조건부 UPDATE 로 차감해 동시 완료 시에도
+        차감이 유실되지 않는다. 남은 횟수는 0 아래로 내려가지 않으며, 0 이 되면 활성 등록을 완료로 바꾼다.
+        차감 횟수가 같은 등록끼리 UPDATE 1회로 처리하고 차감된 등록 수를 반환한다.
+        """
+        by_count = {}
+        for registration_id, count in session_counts.items():
+            if count > 0:
+                by_count.setdefault(count, []).append(registration_id)
         
-        return True
+        updated = 0
+        for count, registration_ids in by_count.items():
+            # SET 절의 조건은 모두 변경 전 값으로 평가됨
+            updated += MemberPTRegistration.objects.filter(
+                id__in=registration_ids,
+                remaining_sessions__gt=0
+            ).update(
+                remaining_sessions=Case(
+                    When(remaining_sessions__gt=count, then=F('remaining_sessions') - count),
+                    default=Value(0)
+                ),
+                registration_status=Case(
+                    When(
+                        remaining_sessions__lte=count,
+                        registration_status='active',
+                        then=Value('completed')
+                    ),
+                    default=F('registration_status')
+                ),
+                version=F('version') + 1,
+                updated_at=timezone.now()
+            )
+        return updated
+    
+    def _is_time_available(self, trainer: Trainer, date: date, start_time, end_time) -> bool:
+        """시간대 예약 가능 여부 확인"""
+        is_free = is_time_free(trainer.id, date, start_time, end_time)
+        if is_free is None:
+            return TrainerAvailability.load(trainer, date).is_available(date, start_time, end_time)
+        return is_free
     
-    def _create_repeat_reservations(self, original_reservation: Reservation):
-        """반복 예약 생성"""
-        if original_reservation.repeat_type == 'none':
-            return
+    def _expand_repeat_dates(self, first_date: date, repeat_type: str, end_date: date) -> List[date]:
+        """반복 유형에 따른 반복 날짜 계산 (첫 예약일 제외)"""
+        dates = []
         
-        current_date = original_reservation.date + timedelta(days=1)
-        end_date = original_reservation.repeat_end_date
+        if repeat_type == 'daily':
+            # 매일
+            step = timedelta(days=1)
+        elif repeat_type == 'weekly':
+            # 매주 같은 요일
+            step = timedelta(weeks=1)
+        elif repeat_type == 'monthly':
+            # 매월 같은 날짜 (해당 날짜가 없는 달은 건너뜀)
+            year, month = first_date.year, first_date.month
+            while True:
+                month += 1
+                if month > 12:
+                    year, month = year + 1, 1
+                if date(year, month, 1) > end_date:
+                    break
+                if first_date.day <= calendar.monthrange(year, month)[1]:
+                    current_date = date(year, month, first_date.day)
+                    if current_date <= end_date:
+                        dates.append(current_date)
+            return dates
+        else:
+            return dates
         
+        current_date = first_date + step
         while current_date <= end_date:
-            if original_reservation.repeat_type == 'daily':
-                # 매일
-                if self._is_time_available(
-                    original_reservation.trainer,
-                    current_date,
-                    original_reservation.start_time,
-                    original_reservation.end_time
-                ):
-                    Reservation.objects.create(
-                        member=original_reservation.member,
-                        trainer=original_reservation.trainer,
-                        pt_registration=original_reservation.pt_registration,
-                        date=current_date,
-                        start_time=original_reservation.start_time,
-                        end_time=original_reservation.end_time,
-                        duration=original_reservation.duration,
-                        repeat_type='none',  # 반복 예약은 개별 예약으로 생성
-                        notes=original_reservation.notes
-                    )
-                current_date += timedelta(days=1)
-                
-            elif original_reservation.repeat_type == 'weekly':
-                # 매주 같은 요일
-                if current_date.weekday() == original_reservation.date.weekday():
-                    if self._is_time_available(
-                        original_reservation.trainer,
-                        current_date,
-                        original_reservation.start_time,
-                        original_reservation.end_time
-                    ):
-                        Reservation.objects.create(
-                            member=original_reservation.member,
-                            trainer=original_reservation.trainer,
-                            pt_registration=original_reservation.pt_registration,
-                            date=current_date,
-                            start_time=original_reservation.start_time,
-                            end_time=original_reservation.end_time,
-                            duration=original_reservation.duration,
-                            repeat_type='none',
-                            notes=original_reservation.notes
-                        )
-                current_date += timedelta(days=1)
+            dates.append(current_date)
+            current_date += step
+        return dates
     
-    def get_trainer_available_times(self, trainer: Trainer, date: date) -> List[Dict[str, Any]]:
-        """트레이너의 예약 가능 시간대 조회"""
-        available_times = []
+    def _create_repeat_reservations(
+        self,
+        original_reservation: Reservation,
+        availability: Optional[TrainerAvailability] = None,
+        changed_by: str = 'system',
+        closures=None
+    ) -> Dict[str, Any]:
+        """반복 예약 일괄 생성
         
-        # 해당 날짜의 요일
-        day_of_week = date.weekday()
+        반복 날짜를 먼저 모두 계산하고, 미리 로드한 가용성과 기존 예약 키로
+        충돌을 판정한 뒤 남은 예약을 bulk_create 로 한 번에 저장한다.
+        closures 는 잠금 안에서 읽은 휴무이며, 없으면 휴무 캘린더로 판정한다.
+        bulk_create 는 post_save 시그널을 발생시키지 않으므로 변경 로그도 일괄 기록한다.
+        """
+        summary = {'requested': 0, 'created': 0, 'skipped': []}
+        if original_reservation.repeat_type == 'none' or not original_reservation.repeat_end_date:
+            return summary
         
-        try:
-            schedule = TrainerSchedule.objects.get(
-                trainer=trainer,
-                day_of_week=day_of_week,
-                is_available=True
+        repeat_dates = self._expand_repeat_dates(
+            original_reservation.date,
+            original_reservation.repeat_type,
+            original_reservation.repeat_end_date
+        )
+        summary['requested'] = len(repeat_dates)
+        if not repeat_dates:
+            return summary
+        
+        # 반복 기간 전체의 가용성을 한 번에 로드
+        if availability is None or availability.end_date < repeat_dates[-1]:
+            availability = TrainerAvailability.load(
+                original_reservation.trainer, repeat_dates[0], repeat_dates[-1]
             )
+        
+        start_time = original_reservation.start_time
+        end_time = original_reservation.end_time
+        
+        # 취소/거절된 예약도 (트레이너, 날짜, 시작 시간) 유니크 제약에 걸리므로 함께 확인
+        taken_dates = set(
+            Reservation.objects.filter(
+                trainer=original_reservation.trainer,
+                date__in=repeat_dates,
+                start_time=start_time
+            ).values_list('date', flat=True)
+        )
+        
+        branch_id = original_reservation.branch_id
+        closures = closures or closure_calendar
+        reservations = []
+        for current_date in repeat_dates:
+            if current_date in taken_dates:
+                summary['skipped'].append({'date': current_date.isoformat(), 'reason': 'duplicate'})
+                continue
+            if closures.is_closed(branch_id, current_date, start_time, end_time):
+                summary['skipped'].append({'date': current_date.isoformat(), 'reason': 'closed'})
+                continue
+            if not availability.is_available(current_date, start_time, end_time):
+                summary['skipped'].append({'date': current_date.isoformat(), 'reason': 'conflict'})
+                continue
             
-            # 30분 단위로 시간대 생성
-            current_time = schedule.start_time
-            while current_time < schedule.end_time:
-                end_time = (datetime.combine(date, current_time) + timedelta(minutes=30)).time()
-                
-                if self._is_time_available(trainer, date, current_time, end_time):
-                    available_times.append({
-                        'start_time': current_time.strftime('%H:%M'),
-                        'end_time': end_time.strftime('%H:%M'),
-                        'available': True
-                    })
-                else:
-                    available_times.append({
-                        'start_time': current_time.strftime('%H:%M'),
-                        'end_time': end_time.strftime('%H:%M'),
-                        'available': False
-                    })
-                
-                current_time = end_time
-                
-        except TrainerSchedule.DoesNotExist:
-            pass
+            reservations.append(Reservation(
+                member=original_reservation.member,
+                trainer=original_reservation.trainer,
+                branch_id=original_reservation.branch_id,
+                pt_registration=original_reservation.pt_registration,
+                date=current_date,
+                start_time=start_time,
+                end_time=end_time,
+                duration=original_reservation.duration,
+                repeat_type='none',  # 반복 예약은 개별 예약으로 생성
+                notes=original_reservation.notes
+            ))
+            availability.reserve(current_date, start_time, end_time)
+        
+        if reservations:
+            created = Reservation.objects.bulk_create(reservations)
+            # bulk_create 는 시그널을 보내지 않으므로 점유 비트 직접 갱신
+            refresh_reserved(original_reservation.trainer_id, [reservation.date for reservation in created])
+            today_board_service.patch_today(created)
+            daily_stats_service.record_created_reservations(created)
+            
+            # 변경 로그 일괄 기록
+            change_log_writer.record_many(
+                dict(
+                    reservation=reservation,
+                    change_type='created',
+                    changed_by=changed_by,
+                    new_status=reservation.reservation_status,
+                    reason=f"반복 예약 ({original_reservation.get_repeat_type_display()})"
+                )
+                for reservation in created
+            )
+            summary['created'] = len(created)
+        
+        return summary
+    
+    def get_trainer_available_times(
+        self,
+        trainer: Trainer,
+        date: date,
+        slot_minutes: int = DEFAULT_SLOT_MINUTES
+    ) -> List[Dict[str, Any]]:
+        """트레이너의 예약 가능 시간대 조회"""
+        return self.get_trainer_slot_grid(trainer, date, date, slot_minutes)[0]['slots']
+    
+    def get_trainer_slot_grid(
+        self,
+        trainer: Trainer,
+        start_date: date,
+        end_date: Optional[date] = None,
+        slot_minutes: int = DEFAULT_SLOT_MINUTES
+    ) -> List[Dict[str, Any]]:
+        """트레이너의 기간별 슬롯 그리드 조회 (점유 비트마스크 1회 조회, 없으면 쿼리 3회)"""
+        end_date = end_date or start_date
+        if end_date < start_date:
+            raise ValueError("종료일은 시작일 이후여야 합니다.")
+        if (end_date - start_date).days + 1 > MAX_SLOT_GRID_DAYS:
+            raise ValueError(f"최대 {MAX_SLOT_GRID_DAYS}일까지 조회할 수 있습니다.")
+        
+        slot_minutes = validate_slot_minutes(slot_minutes)
+        if slot_minutes == OCCUPANCY_SLOT_MINUTES:
+            # 30분 슬롯은 점유 비트마스크로 생성 (근무 시간이 30분 단위가 아닌 날이 있으면 제외)
+            dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+            occupancy = get_day_occupancy(trainer.id, dates)
+            if all(row.schedule_aligned for row in occupancy.values()):
+                return build_occupancy_slot_grid(occupancy)
         
-        return available_times
+        availability = TrainerAvailability.load(trainer, start_date, end_date)
+        return build_slot_grid(availability, start_date, end_date, slot_minutes)
     
     def get_member_reservations(
         self, 
@@ -403,9 +820,7 @@ class ReservationService:
         status: Optional[str] = None
     ) -> List[Reservation]:
         """지점의 예약 목록 조회"""
-        queryset = Reservation.objects.filter(
-            Q(member__branch_id=branch_id) | Q(trainer__branch_id=branch_id)
-        )
+        queryset = Reservation.objects.filter(branch_id=branch_id)
         
         if date:
             queryset = queryset.filter(date=date)
@@ -414,6 +829,76 @@ class ReservationService:
         
         return queryset.order_by('date', 'start_time')
 
+    
+    def search_branch_availability(
+        self,
+        branch_id: int,
+        start_date: date,
+        end_date: Optional[date] = None,
+        start_time=None,
+        end_time=None,
+        duration: Optional[int] = None,
+        slot_minutes: int = DEFAULT_SLOT_MINUTES
+    ) -> Dict[str, Any]:
+        """지점 전체 트레이너 가용 시간 검색
+        
+        활성 트레이너 전원의 기간 가용성을 트레이너 × 슬롯 행렬로 만든 뒤
+        빈 슬롯, 가장 빠른 예약 가능 시각, 시간대 전체가 비어 있는 트레이너를 계산한다.
+        """
+        end_date = end_date or start_date
+        if end_date < start_date:
+            raise ValueError("종료일은 시작일 이후여야 합니다.")
+        if (end_date - start_date).days + 1 > MAX_SLOT_GRID_DAYS:
+            raise ValueError(f"최대 {MAX_SLOT_GRID_DAYS}일까지 조회할 수 있습니다.")
+        
+        if isinstance(start_time, str):
+            start_time = datetime.strptime(start_time, '%H:%M').time()
+        if isinstance(end_time, str):
+            end_time = datetime.strptime(end_time, '%H:%M').time()
+        if bool(start_time) != bool(end_time):
+            raise ValueError("시작 시간과 종료 시간을 함께 지정해야 합니다.")
+        
+        trainers = list(
+            Trainer.objects.filter(
+                branch_id=branch_id,
+                employment_status='active'
+            ).order_by('name').values('id', 'name')
+        )
+        matrix = BranchOccupancyMatrix.build(trainers, start_date, end_date, slot_minutes)
+        
+        # PT 시간 기본값: 지정 시간대 길이 또는 슬롯 1개
+        if not duration:
+            if start_time and end_time:
+                duration = (
+                    datetime.combine(start_date, end_time) - datetime.combine(start_date, start_time)
+                ).seconds // 60
+            else:
+                duration = matrix.slot_minutes
+        
+        result = {
+            'branch_id': branch_id,
+            'start': start_date,
+            'end': end_date,
+            'slot_minutes': matrix.slot_minutes,
+            'trainer_count': len(trainers),
+            'free_slots': matrix.free_slot_counts(start_time, end_time),
+            'earliest_available': matrix.earliest_available(duration, start_time, end_time),
+        }
+        
+        if start_time and end_time:
+            result['start_time'] = start_time.strftime('%H:%M')
+            result['end_time'] = end_time.strftime('%H:%M')
+            result['fully_free_trainers'] = [
+                {
+                    'date': (start_date + timedelta(days=offset)).isoformat(),
+                    'trainers': matrix.fully_free_trainers(
+                        start_date + timedelta(days=offset), start_time, end_time
+                    ),
+                }
+                for offset in range((end_date - start_date).days + 1)
+            ]
+        
+        return result
 
 # 싱글톤 인스턴스
 reservation_service = ReservationService() 
\ No newline at end of file
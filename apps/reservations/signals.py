@@ -1,29 +1,33 @@
+from datetime import date
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from apps.reservations.models import Reservation, PTRecord, ReservationChangeLog
-from apps.notifications.tasks import (
-    send_reservation_request_notification,
-    send_reservation_status_notification,
-    send_pt_completion_notification
+from apps.reservations.models import Reservation, PTRecord
+from apps.reservations.audit import change_log_writer, SYSTEM_ACTOR
+from apps.reservations.today_board import today_board_service
+from apps.reservations.occupancy import (
+    refresh_reserved, refresh_blocked, refresh_schedule, refresh_schedule_dates,
+    refresh_branch_schedule_dates
 )
+from apps.branches.models import BranchClosure
+from apps.branches.closures import closure_calendar
+from apps.trainers.models import TrainerSchedule, TrainerScheduleOverride, TrainerBlockedTime
+from apps.notifications.dispatch import task_dispatcher, TaskIntent, ReservationNotificationIntent
 
 
 @receiver(post_save, sender=Reservation)
 def handle_reservation_save(sender, instance, created, **kwargs):
     """예약 저장 시 처리"""
     if created:
-        # 새 예약 생성 시 트레이너에게 알림 (개발 환경에서는 동기 실행)
-        try:
-            send_reservation_request_notification.delay(instance.id)
-        except:
-            # Redis 연결 실패 시 무시
-            pass
+        # 새 예약 생성 시 트레이너에게 알림 (커밋 시 묶어서 발행)
+        task_dispatcher.enqueue(ReservationNotificationIntent(
+            instance.id, True, instance.reservation_status, instance.reservation_status
+        ))
         
-        # 변경 로그 기록
-        ReservationChangeLog.objects.create(
+        # 변경 로그 기록 (서비스가 실제 변경자로 기록하면 1건으로 병합)
+        change_log_writer.record(
             reservation=instance,
             change_type='created',
-            changed_by='system',
+            changed_by=SYSTEM_ACTOR,
             new_status=instance.reservation_status
         )
     else:
@@ -32,19 +36,17 @@ def handle_reservation_save(sender, instance, created, **kwargs):
             old_status = instance.tracker.previous('reservation_status')
             new_status = instance.reservation_status
             
-            # 상태가 변경된 경우에만 알림 전송
+            # 상태가 변경된 경우에만 알림 전송 (같은 트랜잭션의 생성/변경은 마지막 상태로 병합)
             if old_status != new_status:
-                try:
-                    send_reservation_status_notification.delay(instance.id, new_status)
-                except:
-                    # Redis 연결 실패 시 무시
-                    pass
+                task_dispatcher.enqueue(ReservationNotificationIntent(
+                    instance.id, False, old_status, new_status
+                ))
                 
-                # 변경 로그 기록
-                ReservationChangeLog.objects.create(
+                # 변경 로그 기록 (서비스/뷰가 실제 변경자로 기록하면 1건으로 병합)
+                change_log_writer.record(
                     reservation=instance,
                     change_type='modified',
-                    changed_by='system',
+                    changed_by=SYSTEM_ACTOR,
                     previous_status=old_status,
                     new_status=new_status
                 )
@@ -55,30 +57,140 @@ def handle_pt_record_save(sender, instance, created, **kwargs):
     """PT 기록 저장 시 처리"""
     if created and instance.is_completed:
         # PT 완료 시 알림
-        try:
-            send_pt_completion_notification.delay(instance.id)
-        except:
-            # Redis 연결 실패 시 무시
-            pass
+        task_dispatcher.enqueue(TaskIntent(
+            'apps.notifications.tasks.send_pt_completion_notification', [instance.id]
+        ))
     
     elif not created and instance.tracker.has_changed('is_completed'):
         # PT 완료 상태가 변경된 경우
         if instance.is_completed:
-            try:
-                send_pt_completion_notification.delay(instance.id)
-            except:
-                # Redis 연결 실패 시 무시
-                pass
+            task_dispatcher.enqueue(TaskIntent(
+                'apps.notifications.tasks.send_pt_completion_notification', [instance.id]
+            ))
+
+
+def _changed_days(instance, created):
+    """점유 비트 갱신이 필요한 (trainer_id, date) 목록 (변경 전 값 포함)"""
+    days = {(instance.trainer_id, instance.date)}
+    if not created:
+        previous_trainer = instance.tracker.previous('trainer')
+        previous_date = instance.tracker.previous('date')
+        if previous_trainer is not None and previous_date is not None:
+            days.add((previous_trainer, previous_date))
+    return days
+
+
+@receiver(post_save, sender=Reservation)
+def refresh_reservation_occupancy(sender, instance, created, **kwargs):
+    """예약 저장 시 점유 비트 갱신"""
+    if created or instance.tracker.changed():
+        for trainer_id, day in _changed_days(instance, created):
+            refresh_reserved(trainer_id, [day])
+
+
+@receiver(post_delete, sender=Reservation)
+def refresh_deleted_reservation_occupancy(sender, instance, **kwargs):
+    """예약 삭제 시 점유 비트 갱신"""
+    refresh_reserved(instance.trainer_id, [instance.date])
+
+
+@receiver(post_save, sender=TrainerBlockedTime)
+def refresh_blocked_time_occupancy(sender, instance, created, **kwargs):
+    """차단 시간 저장 시 점유 비트 갱신"""
+    if created or instance.tracker.changed():
+        for trainer_id, day in _changed_days(instance, created):
+            refresh_blocked(trainer_id, [day])
+
+
+@receiver(post_delete, sender=TrainerBlockedTime)
+def refresh_deleted_blocked_time_occupancy(sender, instance, **kwargs):
+    """차단 시간 삭제 시 점유 비트 갱신"""
+    refresh_blocked(instance.trainer_id, [instance.date])
+
+
+@receiver(post_save, sender=TrainerSchedule)
+def refresh_schedule_occupancy(sender, instance, created, **kwargs):
+    """근무 일정 저장 시 점유 비트 갱신"""
+    if created or instance.tracker.changed():
+        refresh_schedule(instance.trainer_id, [instance.day_of_week])
+        previous_trainer = instance.tracker.previous('trainer')
+        previous_day = instance.tracker.previous('day_of_week')
+        if not created and (previous_trainer, previous_day) != (instance.trainer_id, instance.day_of_week):
+            refresh_schedule(previous_trainer, [previous_day])
+
+
+@receiver(post_delete, sender=TrainerSchedule)
+def refresh_deleted_schedule_occupancy(sender, instance, **kwargs):
+    """근무 일정 삭제 시 점유 비트 갱신"""
+    refresh_schedule(instance.trainer_id, [instance.day_of_week])
+
+
+@receiver(post_save, sender=TrainerScheduleOverride)
+def refresh_schedule_override_occupancy(sender, instance, created, **kwargs):
+    """예외 일정 저장 시 점유 비트 갱신"""
+    if created or instance.tracker.changed():
+        for trainer_id, day in _changed_days(instance, created):
+            refresh_schedule_dates([trainer_id], [day])
+
+
+@receiver(post_delete, sender=TrainerScheduleOverride)
+def refresh_deleted_schedule_override_occupancy(sender, instance, **kwargs):
+    """예외 일정 삭제 시 점유 비트 갱신"""
+    refresh_schedule_dates([instance.trainer_id], [instance.date])
+
+
+@receiver(post_save, sender=BranchClosure)
+def refresh_branch_closure_occupancy(sender, instance, created, **kwargs):
+    """지점 휴무 저장 시 휴무 캘린더 캐시 비우고 점유 비트 갱신"""
+    closure_calendar.invalidate_on_commit()
+    if created or instance.tracker.changed():
+        refresh_branch_schedule_dates(instance.branch_id, [instance.date])
+        if not created:
+            previous_branch = instance.tracker.previous('branch')
+            previous_date = instance.tracker.previous('date')
+            if previous_date is not None and (previous_branch, previous_date) != (instance.branch_id, instance.date):
+                refresh_branch_schedule_dates(previous_branch, [previous_date])
+
+
+@receiver(post_delete, sender=BranchClosure)
+def refresh_deleted_branch_closure_occupancy(sender, instance, **kwargs):
+    """지점 휴무 삭제 시 휴무 캘린더 캐시 비우고 점유 비트 갱신"""
+    closure_calendar.invalidate_on_commit()
+    refresh_branch_schedule_dates(instance.branch_id, [instance.date])
+
+
+def _on_today(instance, created):
+    """변경 전후 날짜 중 오늘이 있는지 (당일 보드 갱신 대상)"""
+    today = date.today()
+    if instance.date == today:
+        return True
+    return not created and instance.tracker.previous('date') == today
+
+
+@receiver(post_save, sender=Reservation)
+def patch_today_board(sender, instance, created, **kwargs):
+    """오늘 예약 저장 시 당일 보드 갱신"""
+    if _on_today(instance, created):
+        previous_branch = None if created else instance.tracker.previous('branch')
+        today_board_service.patch([instance.id], branch_ids=[instance.branch_id, previous_branch])
 
 
 @receiver(post_delete, sender=Reservation)
-def handle_reservation_delete(sender, instance, **kwargs):
-    """예약 삭제 시 처리"""
-    # 변경 로그 기록
-    ReservationChangeLog.objects.create(
-        reservation=instance,
-        change_type='cancelled',
-        changed_by='system',
-        previous_status=instance.reservation_status,
-        reason='예약 삭제'
-    ) 
\ No newline at end of file
+def patch_deleted_today_board(sender, instance, **kwargs):
+    """오늘 예약 삭제 시 당일 보드에서 제거"""
+    if instance.date == date.today():
+        today_board_service.patch([instance.id], branch_ids=[instance.branch_id])
+
+
+@receiver(post_save, sender=PTRecord)
+def patch_pt_record_today_board(sender, instance, created, **kwargs):
+    """오늘 PT 기록 저장 시 당일 보드의 완료 여부 갱신"""
+    if instance.workout_date == date.today():
+        today_board_service.patch([instance.reservation_id])
+
+
+@receiver(post_delete, sender=PTRecord)
+def patch_deleted_pt_record_today_board(sender, instance, **kwargs):
+    """오늘 PT 기록 삭제 시 당일 보드 갱신"""
+    if instance.workout_date == date.today():
+        today_board_service.patch([instance.reservation_id])
@@ -0,0 +1,256 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from apps.branches.models import Branch
+from .models import Reservation, TodayBoard, TodayBoardEntry
+
+
+# 항목을 비워 둘 지난 보드 보관 일수 (보드 행은 지점 버전 유지를 위해 남김)
+BOARD_RETENTION_DAYS = 7
+
+
+def board_entry_data(reservation: Reservation) -> Dict[str, Any]:
+    """보드에 표시할 예약 정보 (회원/트레이너/프로그램/지점 이름 포함)"""
+    pt_record = getattr(reservation, 'ptrecord', None)
+    registration = reservation.pt_registration
+    return {
+        'id': reservation.id,
+        'start_time': reservation.start_time.strftime('%H:%M'),
+        'end_time': reservation.end_time.strftime('%H:%M'),
+        'duration': reservation.duration,
+        'reservation_status': reservation.reservation_status,
+        'member_id': reservation.member_id,
+        'member_name': reservation.member.name,
+        'trainer_id': reservation.trainer_id,
+        'trainer_name': reservation.trainer.name,
+        'program_name': registration.pt_program.name if registration else None,
+        'branch_name': reservation.branch.name if reservation.branch else None,
+        'pt_record_id': pt_record.id if pt_record else None,
+        'pt_completed': bool(pt_record and pt_record.is_completed),
+    }
+
+
+def _board_reservations():
+    return Reservation.objects.select_related(
+        'member', 'trainer', 'branch', 'pt_registration__pt_program', 'ptrecord'
+    )
+
+
+def _lock_branches(branch_ids: Iterable[int]) -> List[int]:
+    """보드 생성/갱신을 직렬화하는 지점 행 잠금 (잠근 지점 ID 반환)
+
+    FOR NO KEY UPDATE 로 잠가 지점을 참조하는 행의 생성(FOR KEY SHARE)은 막지 않는다.
+    """
+    return list(
+        Branch.objects.select_for_update(no_key=True).filter(id__in=branch_ids).order_by('id').values_list('id', flat=True)
+    )
+
+
+class TodayBoardService:
+    """지점 당일 예약 보드 서비스
+
+    보드는 지점-날짜별로 한 번 만들고, 예약/PT 기록이 바뀌면 해당 항목만 새 버전으로 덮어쓴다.
+    클라이언트는 마지막으로 받은 버전을 보내 그 이후 바뀐 항목만 받는다.
+    """
+
+    def __init__(self):
+        pass
+
+    def get_board(self, branch_id: int, day: Optional[date] = None) -> TodayBoard:
+        """지점 당일 보드 (없으면 생성)"""
+        day = day or date.today()
+        board = TodayBoard.objects.filter(branch_id=branch_id, date=day).first()
+        return board or self.build(branch_id, day)
+
+    def build(self, branch_id: int, day: date) -> TodayBoard:
+        """지점 당일 보드 생성 (이미 있으면 그대로 반환, 없는 지점이면 Branch.DoesNotExist)
+
+        patch 와 같은 지점 행 잠금을 잡은 뒤 예약을 읽으므로, 보드 생성 중에 바뀐 예약은
+        생성이 끝난 뒤 patch 가 반영하거나 생성 전에 커밋되어 스냅샷에 포함된다.
+        """
+        with transaction.atomic():
+            if not _lock_branches([branch_id]):
+                raise Branch.DoesNotExist
+
+            existing = TodayBoard.objects.filter(branch_id=branch_id, date=day).first()
+            if existing is not None:
+                return existing
+
+            # 지점 보드 버전은 이전 날짜 보드에 이어서 증가 (이전 버전을 가진 클라이언트는 전체 수신)
+            previous = TodayBoard.objects.filter(branch_id=branch_id).aggregate(version=Max('version'))['version'] or 0
+            try:
+                with transaction.atomic():
+                    board = TodayBoard.objects.create(
+                        branch_id=branch_id,
+                        date=day,
+                        base_version=previous + 1,
+                        version=previous + 1
+                    )
+            except IntegrityError:
+                # 동시에 다른 요청이 먼저 생성
+                return TodayBoard.objects.get(branch_id=branch_id, date=day)
+
+            TodayBoardEntry.objects.bulk_create([
+                TodayBoardEntry(
+                    board=board,
+                    reservation_id=reservation.id,
+                    version=board.version,
+                    data=board_entry_data(reservation)
+                )
+                for reservation in _board_reservations().filter(branch_id=branch_id, date=day)
+            ])
+        return board
+
+    def changes(self, branch_id: int, since: Optional[int] = None, day: Optional[date] = None) -> Dict[str, Any]:
+        """since 버전 이후 변경분 (since 가 없거나 다른 날짜 보드의 버전이면 전체)
+
+        최신 버전을 이미 가진 클라이언트는 보드 행 조회 1회로 끝난다.
+        """
+        board = self.get_board(branch_id, day)
+        result = {
+            'branch_id': branch_id,
+            'date': board.date.isoformat(),
+            'version': board.version,
+            'full': False,
+            'entries': [],
+            'removed': [],
+        }
+
+        if since is not None and board.base_version <= since <= board.version:
+            if since == board.version:
+                return result
+            entries = board.entries.filter(version__gt=since)
+        else:
+            result['full'] = True
+            entries = board.entries.filter(removed=False)
+
+        for removed, reservation_id, data in entries.values_list('removed', 'reservation_id', 'data'):
+            if removed:
+                result['removed'].append(reservation_id)
+            else:
+                result['entries'].append(data)
+        result['entries'].sort(key=lambda entry: (entry['start_time'], entry['id']))
+        return result
+
+    def patch(
+        self,
+        reservation_ids: Iterable[int],
+        day: Optional[date] = None,
+        branch_ids: Iterable[Optional[int]] = ()
+    ) -> int:
+        """예약 변경을 당일 보드에 반영 (생성된 보드만, 반영된 항목 수 반환)
+
+        다른 날짜/지점으로 옮겨졌거나 삭제된 예약은 기존 보드에 제거 항목으로 남긴다.
+        branch_ids 에는 이동/삭제 전 지점을 넘긴다.
+        관련 지점 행을 먼저 잠가 보드 생성과 직렬화한다. 생성 중인 보드가 있으면 커밋을 기다린 뒤 반영하고,
+        보드가 없으면 이후 생성되는 보드가 이 트랜잭션의 커밋을 기다려 변경을 스냅샷에 포함한다.
+        """
+        day = day or date.today()
+        reservation_ids = set(reservation_ids)
+        if not reservation_ids:
+            return 0
+
+        reservations = {
+            reservation.id: reservation
+            for reservation in _board_reservations().filter(id__in=reservation_ids, date=day)
+        }
+        branch_ids = {reservation.branch_id for reservation in reservations.values()} | set(branch_ids)
+        branch_ids.discard(None)
+        if not branch_ids and not TodayBoardEntry.objects.filter(
+            board__date=day,
+            reservation_id__in=reservation_ids,
+            removed=False
+        ).exists():
+            return 0
+
+        with transaction.atomic():
+            _lock_branches(branch_ids)
+
+            # 잠금 후(생성 중이던 보드가 커밋된 뒤) 기존 항목 위치를 읽음
+            placed = dict(
+                TodayBoardEntry.objects.filter(
+                    board__date=day,
+                    reservation_id__in=reservation_ids,
+                    removed=False
+                ).values_list('reservation_id', 'board_id')
+            )
+            # 같은 지점 보드의 동시 갱신은 보드 행 잠금으로 직렬화 (id 순서로 잠가 교착 방지)
+            boards = {
+                board.id: board
+                for board in TodayBoard.objects.select_for_update().filter(
+                    Q(date=day, branch_id__in=branch_ids) | Q(id__in=set(placed.values()))
+                ).order_by('id')
+            }
+            if not boards:
+                return 0
+            boards_by_branch = {board.branch_id: board for board in boards.values()}
+
+            entries: List[TodayBoardEntry] = []
+            for reservation_id in reservation_ids:
+                reservation = reservations.get(reservation_id)
+                board = boards_by_branch.get(reservation.branch_id) if reservation else None
+                if board is not None:
+                    entries.append(TodayBoardEntry(
+                        board_id=board.id,
+                        reservation_id=reservation_id,
+                        data=board_entry_data(reservation)
+                    ))
+                previous_board_id = placed.get(reservation_id)
+                if previous_board_id in boards and (board is None or board.id != previous_board_id):
+                    entries.append(TodayBoardEntry(
+                        board_id=previous_board_id,
+                        reservation_id=reservation_id,
+                        removed=True
+                    ))
+            if not entries:
+                return 0
+
+            touched = {entry.board_id for entry in entries}
+            now = timezone.now()
+            for board_id in touched:
+                boards[board_id].version += 1
+                boards[board_id].updated_at = now
+            for entry in entries:
+                entry.version = boards[entry.board_id].version
+
+            TodayBoard.objects.bulk_update([boards[board_id] for board_id in touched], ['version', 'updated_at'])
+            TodayBoardEntry.objects.bulk_create(
+                entries,
+                update_conflicts=True,
+                unique_fields=['board', 'reservation_id'],
+                update_fields=['version', 'removed', 'data']
+            )
+        return len(entries)
+
+    def patch_today(self, reservations: Iterable[Reservation]) -> int:
+        """시그널을 거치지 않은 일괄 변경 중 오늘 예약만 보드에 반영"""
+        today = date.today()
+        return self.patch(
+            [reservation.id for reservation in reservations if reservation.date == today],
+            today
+        )
+
+    def prebuild(self, day: Optional[date] = None) -> int:
+        """활성 지점 전체의 당일 보드 미리 생성"""
+        day = day or date.today()
+        existing = set(TodayBoard.objects.filter(date=day).values_list('branch_id', flat=True))
+        count = 0
+        for branch_id in Branch.objects.filter(is_active=True).values_list('id', flat=True):
+            if branch_id not in existing:
+                self.build(branch_id, day)
+                count += 1
+        return count
+
+    def cleanup(self, day: Optional[date] = None) -> int:
+        """보관 기간이 지난 보드 항목 삭제"""
+        cutoff = (day or date.today()) - timedelta(days=BOARD_RETENTION_DAYS)
+        deleted, _ = TodayBoardEntry.objects.filter(board__date__lt=cutoff).delete()
+        return deleted
+
+
+# 싱글톤 인스턴스
+today_board_service = TodayBoardService()
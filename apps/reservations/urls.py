@@ -4,7 +4,8 @@ from .views import (
     ReservationViewSet,
     PTRecordViewSet,
     PTRecordImageViewSet,
-    ReservationChangeLogViewSet
+    ReservationChangeLogViewSet,
+    calendar_feed
 )
 
 app_name = 'reservations'
@@ -17,4 +18,5 @@ router.register(r'change-logs', ReservationChangeLogViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('calendar/<str:token>.ics', calendar_feed, name='calendar-feed'),
 ]
@@ -2,9 +2,16 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import IntegrityError, transaction
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
 from django.db.models import Count, Sum, Q
 from datetime import date, timedelta
 from .models import Reservation, PTRecord, PTRecordImage, ReservationChangeLog
+from apps.branches.models import Branch
+from apps.trainers.models import Trainer
+from apps.members.models import Member
 from .serializers import (
     ReservationSerializer,
     PTRecordSerializer,
@@ -19,9 +26,30 @@ from .permissions import (
     PTRecordImagePermission,
     ReservationChangeLogPermission
 )
+from .availability import DEFAULT_SLOT_MINUTES
+from .services import reservation_service, ReservationConflictError
+from .audit import change_log_writer
+from .today_board import today_board_service
+from .idempotency import idempotent
+from .ics import resolve_feed_token, trainer_calendar_response, member_calendar_response
+from clamood_gym.concurrency import VersionedViewSetMixin
+from clamood_gym.stats import StatsQuery, count, breakdown
 
-class ReservationViewSet(viewsets.ModelViewSet):
-    """예약 API 뷰셋"""
+# 통계 액션 지표 (각각 aggregate() 1회)
+RESERVATION_STATS = StatsQuery(
+    total_reservations=count(),
+    confirmed_reservations=count(Q(reservation_status='confirmed')),
+    completed_reservations=count(Q(reservation_status='completed')),
+    cancelled_reservations=count(Q(reservation_status='cancelled')),
+    status_distribution=breakdown('reservation_status'),
+)
+PT_RECORD_STATS = StatsQuery(
+    total_records=count(),
+    completed_records=count(Q(is_completed=True)),
+)
+
+class ReservationViewSet(VersionedViewSetMixin, viewsets.ModelViewSet):
+    """예약 API 뷰셋 (수정/확정/취소 시 버전 충돌이면 409)"""
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = [ReservationPermission]
@@ -37,7 +65,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
         if user.admin_type == 'headquarters':
             return Reservation.objects.all()
         else:
-            return Reservation.objects.filter(member__branch=user.branch)
+            return Reservation.objects.filter(branch=user.branch)
     
     def get_serializer_class(self):
         """액션에 따른 시리얼라이저 선택"""
@@ -45,30 +73,96 @@ class ReservationViewSet(viewsets.ModelViewSet):
             return ReservationDetailSerializer
         return ReservationSerializer
     
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """예약 생성 (트레이너-날짜 잠금 후 시간대 충돌 검사)"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        try:
+            reservation = reservation_service.create_reservation(
+                member=data['member'],
+                trainer=data['trainer'],
+                date=data['date'],
+                start_time=data['start_time'],
+                duration=data.get('duration', 30),
+                pt_registration=data.get('pt_registration'),
+                repeat_type=data.get('repeat_type', 'none'),
+                repeat_end_date=data.get('repeat_end_date'),
+                notes=data.get('notes', '')
+            )
+        except ReservationConflictError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = self.get_serializer(reservation)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    def perform_update(self, serializer):
+        """예약 수정 (같은 시작 시간의 예약과 겹치면 409)"""
+        try:
+            with transaction.atomic():
+                super().perform_update(serializer)
+        except IntegrityError:
+            raise ReservationConflictError("해당 시간대는 예약할 수 없습니다.")
+    
+    def handle_exception(self, exc):
+        if isinstance(exc, ReservationConflictError):
+            return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+        return super().handle_exception(exc)
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """예약 통계 정보"""
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total_reservations': queryset.count(),
-            'confirmed_reservations': queryset.filter(reservation_status='confirmed').count(),
-            'completed_reservations': queryset.filter(reservation_status='completed').count(),
-            'cancelled_reservations': queryset.filter(reservation_status='cancelled').count(),
-            'today_reservations': queryset.filter(date=date.today()).count(),
-            'upcoming_reservations': queryset.filter(date__gte=date.today()).count(),
-            'status_distribution': queryset.values('reservation_status').annotate(count=Count('id')),
-        }
+        today = date.today()
+        stats = RESERVATION_STATS.collect(
+            self.get_queryset(),
+            today_reservations=count(Q(date=today)),
+            upcoming_reservations=count(Q(date__gte=today)),
+        )
         
         return Response(stats)
     
     @action(detail=False, methods=['get'])
     def today(self, request):
         """오늘 예약 조회"""
-        today_reservations = self.get_queryset().filter(date=date.today()).order_by('start_time')
+        today_reservations = self.get_queryset().filter(date=date.today()).select_related(
+            'member__branch', 'trainer', 'pt_registration__pt_program'
+        ).order_by('start_time')
         serializer = self.get_serializer(today_reservations, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'], url_path='today-board')
+    def today_board(self, request):
+        """지점 당일 예약 보드 (프런트 데스크 화면용)
+        
+        ?since=<마지막으로 받은 version> 을 보내면 그 이후 변경된 예약(entries)과
+        제거된 예약 ID(removed)만 반환한다. since 가 없거나 다른 날짜의 버전이면 full=true 로 전체를 반환한다.
+        """
+        user = request.user
+        params = request.query_params
+        
+        if user.admin_type == 'headquarters':
+            branch_id = params.get('branch_id')
+            if not branch_id:
+                return Response(
+                    {'error': 'branch_id 파라미터가 필요합니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            branch_id = user.branch_id
+        
+        try:
+            since = int(params['since']) if params.get('since') else None
+            result = today_board_service.changes(int(branch_id), since)
+        except ValueError:
+            return Response({'error': '잘못된 요청 파라미터입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        except Branch.DoesNotExist:
+            return Response({'error': '지점을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result)
+    
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """다가오는 예약 조회"""
@@ -78,44 +172,133 @@ class ReservationViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(upcoming_reservations, many=True)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def branch_availability(self, request):
+        """지점 트레이너 가용 시간 검색
+        
+        ?start=YYYY-MM-DD&end=YYYY-MM-DD&start_time=19:00&end_time=20:00&duration=60&slot=30
+        """
+        user = request.user
+        params = request.query_params
+        
+        if user.admin_type == 'headquarters':
+            branch_id = params.get('branch_id')
+            if not branch_id:
+                return Response(
+                    {'error': 'branch_id 파라미터가 필요합니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        else:
+            branch_id = user.branch_id
+        
+        try:
+            start_date = date.fromisoformat(params.get('start') or date.today().isoformat())
+            end_date = date.fromisoformat(params['end']) if params.get('end') else start_date
+            result = reservation_service.search_branch_availability(
+                branch_id=int(branch_id),
+                start_date=start_date,
+                end_date=end_date,
+                start_time=params.get('start_time'),
+                end_time=params.get('end_time'),
+                duration=int(params['duration']) if params.get('duration') else None,
+                slot_minutes=int(params.get('slot', DEFAULT_SLOT_MINUTES))
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(result)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request):
+        """예약 상태 일괄 변경 (확정/거절/취소)"""
+        reservation_ids = request.data.get('ids')
+        if not isinstance(reservation_ids, list):
+            return Response(
+                {'error': 'ids 는 예약 ID 목록이어야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            result = reservation_service.bulk_transition(
+                reservation_ids=reservation_ids,
+                target_status=request.data.get('status'),
+                changed_by=str(request.user),
+                reason=request.data.get('reason', ''),
+                queryset=self.get_queryset()
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(result)
+    
+    @action(detail=False, methods=['post'], url_path='complete-sessions')
+    @idempotent
+    def complete_sessions(self, request):
+        """트레이너 PT 세션 일괄 완료"""
+        sessions = request.data.get('sessions')
+        if not isinstance(sessions, list):
+            return Response(
+                {'error': 'sessions 는 완료할 세션 목록이어야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            trainer = Trainer.objects.get(id=int(request.data.get('trainer')))
+        except (TypeError, ValueError, Trainer.DoesNotExist):
+            return Response({'error': '트레이너를 찾을 수 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            result = reservation_service.complete_pt_sessions(
+                trainer=trainer,
+                sessions=sessions,
+                queryset=self.get_queryset()
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(result)
+    
     @action(detail=True, methods=['post'])
     def confirm(self, request, pk=None):
         """예약 확정"""
-        reservation = self.get_object()
-        reservation.reservation_status = 'confirmed'
-        reservation.save()
-        
-        # 변경 로그 기록
-        ReservationChangeLog.objects.create(
-            reservation=reservation,
-            change_type='status_change',
-            changed_by=request.user,
-            previous_status='pending',
-            new_status='confirmed',
-            reason='관리자가 예약을 확정했습니다.'
-        )
+        reservation = self.get_versioned_object()
+        previous_status = reservation.reservation_status
+        with transaction.atomic():
+            reservation.reservation_status = 'confirmed'
+            reservation.save(update_fields=['reservation_status', 'updated_at'])
+            
+            # 변경 로그 기록 (시그널 로그와 1건으로 병합)
+            change_log_writer.record(
+                reservation=reservation,
+                change_type='confirmed',
+                changed_by=request.user,
+                previous_status=previous_status,
+                new_status='confirmed',
+                reason='관리자가 예약을 확정했습니다.'
+            )
         
-        return Response({'message': '예약이 확정되었습니다.'})
+        return Response({'message': '예약이 확정되었습니다.', 'version': reservation.version})
     
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         """예약 취소"""
-        reservation = self.get_object()
+        reservation = self.get_versioned_object()
         previous_status = reservation.reservation_status
-        reservation.reservation_status = 'cancelled'
-        reservation.save()
-        
-        # 변경 로그 기록
-        ReservationChangeLog.objects.create(
-            reservation=reservation,
-            change_type='status_change',
-            changed_by=request.user,
-            previous_status=previous_status,
-            new_status='cancelled',
-            reason=request.data.get('reason', '관리자가 예약을 취소했습니다.')
-        )
+        with transaction.atomic():
+            reservation.reservation_status = 'cancelled'
+            reservation.save(update_fields=['reservation_status', 'updated_at'])
+            
+            # 변경 로그 기록 (시그널 로그와 1건으로 병합)
+            change_log_writer.record(
+                reservation=reservation,
+                change_type='cancelled',
+                changed_by=request.user,
+                previous_status=previous_status,
+                new_status='cancelled',
+                reason=request.data.get('reason', '관리자가 예약을 취소했습니다.')
+            )
         
-        return Response({'message': '예약이 취소되었습니다.'})
+        return Response({'message': '예약이 취소되었습니다.', 'version': reservation.version})
 
 class PTRecordViewSet(viewsets.ModelViewSet):
     """PT 기록 API 뷰셋"""
@@ -134,7 +317,7 @@ class PTRecordViewSet(viewsets.ModelViewSet):
         if user.admin_type == 'headquarters':
             return PTRecord.objects.all()
         else:
-            return PTRecord.objects.filter(member__branch=user.branch)
+            return PTRecord.objects.filter(branch=user.branch)
     
     def get_serializer_class(self):
         """액션에 따른 시리얼라이저 선택"""
@@ -146,23 +329,23 @@ class PTRecordViewSet(viewsets.ModelViewSet):
     def stats(self, request):
         """PT 기록 통계 정보"""
         queryset = self.get_queryset()
+        today = date.today()
         
-        stats = {
-            'total_records': queryset.count(),
-            'completed_records': queryset.filter(is_completed=True).count(),
-            'today_records': queryset.filter(workout_date=date.today()).count(),
-            'this_week_records': queryset.filter(
-                workout_date__gte=date.today() - timedelta(days=7)
-            ).count(),
-            'trainer_performance': queryset.values('trainer__name').annotate(
-                total_records=Count('id'),
-                completed_records=Count('id', filter=Q(is_completed=True))
-            ),
-        }
+        stats = PT_RECORD_STATS.collect(
+            queryset,
+            today_records=count(Q(workout_date=today)),
+            this_week_records=count(Q(workout_date__gte=today - timedelta(days=7))),
+        )
+        # 트레이너별 집계는 트레이너 목록이 정해져 있지 않아 GROUP BY 로 따로 조회
+        stats['trainer_performance'] = queryset.order_by().values('trainer__name').annotate(
+            total_records=Count('id'),
+            completed_records=Count('id', filter=Q(is_completed=True))
+        )
         
         return Response(stats)
     
     @action(detail=True, methods=['post'])
+    @idempotent
     def complete(self, request, pk=None):
         """PT 기록 완료 처리"""
         record = self.get_object()
@@ -188,7 +371,7 @@ class PTRecordImageViewSet(viewsets.ModelViewSet):
         if user.admin_type == 'headquarters':
             return PTRecordImage.objects.all()
         else:
-            return PTRecordImage.objects.filter(pt_record__member__branch=user.branch)
+            return PTRecordImage.objects.filter(pt_record__branch=user.branch)
 
 class ReservationChangeLogViewSet(viewsets.ReadOnlyModelViewSet):
     """예약 변경 로그 API 뷰셋 (읽기 전용)"""
@@ -207,7 +390,7 @@ class ReservationChangeLogViewSet(viewsets.ReadOnlyModelViewSet):
         if user.admin_type == 'headquarters':
             return ReservationChangeLog.objects.all()
         else:
-            return ReservationChangeLog.objects.filter(reservation__member__branch=user.branch)
+            return ReservationChangeLog.objects.filter(reservation__branch=user.branch)
     
     @action(detail=False, methods=['get'])
     def recent(self, request):
@@ -215,3 +398,17 @@ class ReservationChangeLogViewSet(viewsets.ReadOnlyModelViewSet):
         recent_logs = self.get_queryset().order_by('-created_at')[:50]
         serializer = self.get_serializer(recent_logs, many=True)
         return Response(serializer.data)
+
+
+@require_GET
+def calendar_feed(request, token):
+    """캘린더 구독 피드 (서명 토큰으로 접근, 캘린더 앱은 인증 헤더를 보낼 수 없음)"""
+    resolved = resolve_feed_token(token)
+    if resolved is None:
+        raise Http404
+    
+    kind, object_id, version = resolved
+    # 재발급으로 버전이 바뀐 이전 URL 은 없는 피드로 처리
+    if kind == 'trainer':
+        return trainer_calendar_response(request, get_object_or_404(Trainer, id=object_id, calendar_token_version=version))
+    return member_calendar_response(request, get_object_or_404(Member, id=object_id, calendar_token_version=version))
@@ -189,7 +189,7 @@ def update_branch_revenue():
 def calculate_branch_pt_revenue(branch, year, month):
     """지점 PT 매출 계산"""
     pt_records = PTRecord.objects.filter(
-        trainer__branch=branch,
+        branch=branch,
         workout_date__year=year,
         workout_date__month=month,
         is_completed=True
@@ -2,7 +2,7 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Sum, Avg
+from django.db.models import Count, Sum, Q
 from datetime import date
 from .models import Salary, IncentiveDetail, AdditionalRevenue, OtherCost, BranchRevenue
 from .serializers import (
@@ -21,6 +21,23 @@ from .permissions import (
     OtherCostPermission,
     BranchRevenuePermission
 )
+from clamood_gym.stats import StatsQuery, count, total, average
+
+# 통계 액션 지표 (각각 aggregate() 1회)
+SALARY_STATS = StatsQuery(
+    total_salaries=count(),
+    paid_salaries=count(Q(payment_status='paid')),
+    pending_salaries=count(Q(payment_status='pending')),
+    total_paid_amount=total('total_salary', Q(payment_status='paid')),
+    average_salary=average('total_salary'),
+)
+BRANCH_REVENUE_STATS = StatsQuery(
+    total_revenues=count(),
+    total_pt_revenue=total('pt_revenue'),
+    total_membership_revenue=total('membership_revenue'),
+    total_additional_revenue=total('additional_revenue'),
+    total_revenue_sum=total('total_revenue'),
+)
 
 class SalaryViewSet(viewsets.ModelViewSet):
     """급여 API 뷰셋"""
@@ -52,19 +69,12 @@ class SalaryViewSet(viewsets.ModelViewSet):
         """급여 통계 정보"""
         queryset = self.get_queryset()
         
-        stats = {
-            'total_salaries': queryset.count(),
-            'paid_salaries': queryset.filter(payment_status='paid').count(),
-            'pending_salaries': queryset.filter(payment_status='pending').count(),
-            'total_paid_amount': queryset.filter(payment_status='paid').aggregate(
-                total=Sum('total_salary')
-            )['total'] or 0,
-            'average_salary': queryset.aggregate(avg=Avg('total_salary'))['avg'] or 0,
-            'monthly_distribution': queryset.values('year', 'month').annotate(
-                count=Count('id'),
-                total_amount=Sum('total_salary')
-            ).order_by('-year', '-month'),
-        }
+        stats = SALARY_STATS.collect(queryset)
+        # 월별 분포는 월 목록이 정해져 있지 않아 GROUP BY 로 따로 조회
+        stats['monthly_distribution'] = queryset.values('year', 'month').annotate(
+            count=Count('id'),
+            total_amount=Sum('total_salary')
+        ).order_by('-year', '-month')
         
         return Response(stats)
     
@@ -178,18 +188,13 @@ class BranchRevenueViewSet(viewsets.ModelViewSet):
         """지점 매출 통계 정보"""
         queryset = self.get_queryset()
         
-        stats = {
-            'total_revenues': queryset.count(),
-            'total_pt_revenue': queryset.aggregate(total=Sum('pt_revenue'))['total'] or 0,
-            'total_membership_revenue': queryset.aggregate(total=Sum('membership_revenue'))['total'] or 0,
-            'total_additional_revenue': queryset.aggregate(total=Sum('additional_revenue'))['total'] or 0,
-            'total_revenue_sum': queryset.aggregate(total=Sum('total_revenue'))['total'] or 0,
-            'monthly_distribution': queryset.values('year', 'month').annotate(
-                total_revenue=Sum('total_revenue'),
-                total_pt_revenue=Sum('pt_revenue'),
-                total_membership_revenue=Sum('membership_revenue')
-            ).order_by('-year', '-month'),
-        }
+        stats = BRANCH_REVENUE_STATS.collect(queryset)
+        # 월별 분포는 월 목록이 정해져 있지 않아 GROUP BY 로 따로 조회
+        stats['monthly_distribution'] = queryset.values('year', 'month').annotate(
+            total_revenue=Sum('total_revenue'),
+            total_pt_revenue=Sum('pt_revenue'),
+            total_membership_revenue=Sum('membership_revenue')
+        ).order_by('-year', '-month')
         
         return Response(stats)
     
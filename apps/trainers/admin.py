@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Trainer, TrainerIncentive, TrainerSchedule, TrainerBlockedTime
+from .models import Trainer, TrainerIncentive, TrainerSchedule, TrainerScheduleOverride, TrainerBlockedTime
 
 
 @admin.register(Trainer)
@@ -66,7 +66,7 @@ class TrainerScheduleAdmin(admin.ModelAdmin):
     list_display = ['trainer', 'day_of_week', 'start_time', 'end_time', 'is_available']
     list_filter = ['trainer__branch', 'day_of_week', 'is_available']
     search_fields = ['trainer__name']
-    ordering = ['trainer__name', 'day_of_week']
+    ordering = ['trainer__name', 'day_of_week', 'start_time']
     readonly_fields = ['created_at', 'updated_at']
     
     fieldsets = (
@@ -83,6 +83,28 @@ class TrainerScheduleAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(TrainerScheduleOverride)
+class TrainerScheduleOverrideAdmin(admin.ModelAdmin):
+    list_display = ['trainer', 'date', 'start_time', 'end_time', 'is_available', 'reason']
+    list_filter = ['trainer__branch', 'is_available', 'date']
+    search_fields = ['trainer__name', 'reason']
+    ordering = ['-date', 'start_time']
+    readonly_fields = ['created_at', 'updated_at']
+    
+    fieldsets = (
+        ('트레이너', {
+            'fields': ('trainer',)
+        }),
+        ('예외 일정', {
+            'fields': ('date', 'start_time', 'end_time', 'is_available', 'reason')
+        }),
+        ('시간 정보', {
+            'fields': ('created_at', 'updated_at'),
+            'classes': ('collapse',)
+        }),
+    )
+
+
 @admin.register(TrainerBlockedTime)
 class TrainerBlockedTimeAdmin(admin.ModelAdmin):
     list_display = ['trainer', 'date', 'start_time', 'end_time', 'reason', 'created_at']
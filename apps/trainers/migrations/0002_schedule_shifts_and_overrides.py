@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainerScheduleOverride',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='날짜')),
+                ('start_time', models.TimeField(blank=True, null=True, verbose_name='시작 시간')),
+                ('end_time', models.TimeField(blank=True, null=True, verbose_name='종료 시간')),
+                ('is_available', models.BooleanField(default=True, verbose_name='근무 가능')),
+                ('reason', models.CharField(blank=True, max_length=200, verbose_name='사유')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '트레이너 예외 일정',
+                'verbose_name_plural': '트레이너 예외 일정들',
+                'ordering': ['date', 'start_time'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='trainerschedule',
+            options={'ordering': ['trainer', 'day_of_week', 'start_time'], 'verbose_name': '트레이너 일정', 'verbose_name_plural': '트레이너 일정들'},
+        ),
+        migrations.AlterUniqueTogether(
+            name='trainerschedule',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='trainerschedule',
+            index=models.Index(fields=['trainer', 'day_of_week'], name='sched_trainer_day_idx'),
+        ),
+        migrations.AddField(
+            model_name='trainerscheduleoverride',
+            name='trainer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='trainers.trainer', verbose_name='트레이너'),
+        ),
+        migrations.AddIndex(
+            model_name='trainerscheduleoverride',
+            index=models.Index(fields=['trainer', 'date'], name='sched_override_date_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-18 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trainers', '0002_schedule_shifts_and_overrides'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainer',
+            name='calendar_token_version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='캘린더 토큰 버전'),
+        ),
+    ]
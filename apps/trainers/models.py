@@ -1,4 +1,5 @@
 from django.db import models
+from model_utils import FieldTracker
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from apps.branches.models import Branch
 
@@ -77,6 +78,8 @@ class Trainer(models.Model):
         default=0
     )
     notes = models.TextField(verbose_name='메모', blank=True)
+    # 캘린더 구독 토큰 버전 (구독 URL 재발급 시 1 증가, 이전 URL 무효화)
+    calendar_token_version = models.PositiveIntegerField(default=1, editable=False, verbose_name='캘린더 토큰 버전')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
 
@@ -138,7 +141,7 @@ class TrainerIncentive(models.Model):
 
 
 class TrainerSchedule(models.Model):
-    """트레이너 일정 모델"""
+    """트레이너 일정 모델 (같은 요일에 여러 근무 구간 등록 가능)"""
     DAY_OF_WEEK_CHOICES = [
         (0, '월요일'),
         (1, '화요일'),
@@ -167,11 +170,53 @@ class TrainerSchedule(models.Model):
     class Meta:
         verbose_name = '트레이너 일정'
         verbose_name_plural = '트레이너 일정들'
-        unique_together = ['trainer', 'day_of_week']
-        ordering = ['trainer', 'day_of_week']
+        ordering = ['trainer', 'day_of_week', 'start_time']
+        indexes = [
+            models.Index(fields=['trainer', 'day_of_week'], name='sched_trainer_day_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.trainer.name} - {self.get_day_of_week_display()}"
+        return f"{self.trainer.name} - {self.get_day_of_week_display()} {self.start_time}-{self.end_time}"
+    
+    # 필드 변경 추적
+    tracker = FieldTracker(fields=['trainer', 'day_of_week', 'start_time', 'end_time', 'is_available'])
+
+
+class TrainerScheduleOverride(models.Model):
+    """트레이너 날짜별 예외 일정 모델
+
+    예외 일정이 있는 날짜는 요일 근무 구간 대신 해당 날짜의 예외 일정만 적용한다.
+    근무 가능(is_available=True) 행은 그날의 근무 구간이 되고,
+    근무 불가 행만 있는 날짜는 휴무로 처리한다.
+    """
+    trainer = models.ForeignKey(
+        Trainer, 
+        on_delete=models.CASCADE, 
+        verbose_name='트레이너'
+    )
+    date = models.DateField(verbose_name='날짜')
+    start_time = models.TimeField(verbose_name='시작 시간', null=True, blank=True)
+    end_time = models.TimeField(verbose_name='종료 시간', null=True, blank=True)
+    is_available = models.BooleanField(default=True, verbose_name='근무 가능')
+    reason = models.CharField(max_length=200, verbose_name='사유', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+
+    class Meta:
+        verbose_name = '트레이너 예외 일정'
+        verbose_name_plural = '트레이너 예외 일정들'
+        ordering = ['date', 'start_time']
+        indexes = [
+            models.Index(fields=['trainer', 'date'], name='sched_override_date_idx'),
+        ]
+
+    def __str__(self):
+        if not self.is_available:
+            return f"{self.trainer.name} - {self.date} 휴무"
+        return f"{self.trainer.name} - {self.date} {self.start_time}-{self.end_time}"
+    
+    # 필드 변경 추적
+    tracker = FieldTracker(fields=['trainer', 'date', 'start_time', 'end_time', 'is_available'])
 
 
 class TrainerBlockedTime(models.Model):
@@ -194,4 +239,7 @@ class TrainerBlockedTime(models.Model):
 
     def __str__(self):
         return f"{self.trainer.name} - {self.date} {self.start_time}-{self.end_time}"
+    
+    # 필드 변경 추적
+    tracker = FieldTracker(fields=['trainer', 'date', 'start_time', 'end_time'])
 
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Trainer, TrainerIncentive, TrainerSchedule, TrainerBlockedTime
+from .models import Trainer, TrainerIncentive, TrainerSchedule, TrainerScheduleOverride, TrainerBlockedTime
+from apps.reservations.availability import to_minutes, end_to_minutes
 
 class TrainerSerializer(serializers.ModelSerializer):
     """트레이너 시리얼라이저"""
@@ -33,6 +34,56 @@ class TrainerScheduleSerializer(serializers.ModelSerializer):
         """요일 이름 반환"""
         days = ['월', '화', '수', '목', '금', '토', '일']
         return days[obj.day_of_week] if 0 <= obj.day_of_week < 7 else ''
+    
+    def validate(self, attrs):
+        """근무 시간 및 같은 요일의 다른 근무 구간과 겹침 검증"""
+        trainer = attrs.get('trainer', getattr(self.instance, 'trainer', None))
+        day_of_week = attrs.get('day_of_week', getattr(self.instance, 'day_of_week', None))
+        start_time = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        is_available = attrs.get('is_available', getattr(self.instance, 'is_available', True))
+        
+        start = to_minutes(start_time)
+        end = end_to_minutes(end_time)
+        if end <= start:
+            raise serializers.ValidationError("종료 시간은 시작 시간 이후여야 합니다.")
+        
+        if is_available:
+            shifts = TrainerSchedule.objects.filter(
+                trainer=trainer,
+                day_of_week=day_of_week,
+                is_available=True
+            )
+            if self.instance is not None:
+                shifts = shifts.exclude(id=self.instance.id)
+            for shift_start, shift_end in shifts.values_list('start_time', 'end_time'):
+                if to_minutes(shift_start) < end and start < end_to_minutes(shift_end):
+                    raise serializers.ValidationError(
+                        f"같은 요일의 다른 근무 구간({shift_start:%H:%M}-{shift_end:%H:%M})과 겹칩니다."
+                    )
+        return attrs
+
+class TrainerScheduleOverrideSerializer(serializers.ModelSerializer):
+    """트레이너 예외 일정 시리얼라이저"""
+    trainer_name = serializers.CharField(source='trainer.name', read_only=True)
+    
+    class Meta:
+        model = TrainerScheduleOverride
+        fields = '__all__'
+        read_only_fields = ('created_at', 'updated_at')
+    
+    def validate(self, attrs):
+        """근무 가능 예외 일정은 시작/종료 시간 필수"""
+        is_available = attrs.get('is_available', getattr(self.instance, 'is_available', True))
+        start_time = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end_time = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        
+        if is_available:
+            if start_time is None or end_time is None:
+                raise serializers.ValidationError("근무 가능 예외 일정은 시작/종료 시간이 필요합니다.")
+            if end_to_minutes(end_time) <= to_minutes(start_time):
+                raise serializers.ValidationError("종료 시간은 시작 시간 이후여야 합니다.")
+        return attrs
 
 class TrainerBlockedTimeSerializer(serializers.ModelSerializer):
     """트레이너 차단 시간 시리얼라이저"""
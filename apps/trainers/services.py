@@ -0,0 +1,195 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Trainer, TrainerBlockedTime
+from apps.reservations.models import Reservation
+from apps.reservations.availability import (
+    ACTIVE_RESERVATION_STATUSES,
+    IntervalIndex,
+    to_minutes,
+    end_to_minutes
+)
+from apps.reservations.occupancy import lock_trainer_days, refresh_blocked
+from apps.reservations.services import reservation_service, MAX_BULK_TRANSITION
+from apps.notifications.services import notification_service
+
+
+# 한 번에 차단할 수 있는 최대 일수
+MAX_BLOCK_DAYS = 366
+
+
+class TrainerBlockedTimeService:
+    """트레이너 차단 시간 서비스 (예약 충돌 분석/일괄 차단)"""
+
+    def __init__(self):
+        pass
+
+    def expand_ranges(self, trainer: Trainer, ranges: Sequence[Dict[str, Any]]) -> List[TrainerBlockedTime]:
+        """기간 목록을 날짜별 차단 시간으로 펼침 (저장 전)
+
+        각 기간은 {'start_date', 'end_date', 'start_time', 'end_time', 'weekdays', 'reason'}.
+        end_date 가 없으면 하루, 시간이 없으면 종일(00:00~24:00), weekdays(0=월요일)가 있으면 해당 요일만 차단한다.
+        """
+        blocks = []
+        for entry in ranges:
+            try:
+                start_date = self._parse_date(entry['start_date'])
+                end_date = self._parse_date(entry.get('end_date') or entry['start_date'])
+                start_time = self._parse_time(entry.get('start_time')) or time(0, 0)
+                end_time = self._parse_time(entry.get('end_time')) or time(0, 0)
+                weekdays = {int(day) for day in entry['weekdays']} if entry.get('weekdays') else None
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("차단 기간 형식이 올바르지 않습니다.")
+
+            if end_date < start_date:
+                raise ValueError("종료일은 시작일 이후여야 합니다.")
+            if end_to_minutes(end_time) <= to_minutes(start_time):
+                raise ValueError("종료 시간은 시작 시간 이후여야 합니다.")
+
+            current_date = start_date
+            while current_date <= end_date:
+                if weekdays is None or current_date.weekday() in weekdays:
+                    blocks.append(TrainerBlockedTime(
+                        trainer=trainer,
+                        date=current_date,
+                        start_time=start_time,
+                        end_time=end_time,
+                        reason=entry.get('reason', '')
+                    ))
+                current_date += timedelta(days=1)
+
+        if len({block.date for block in blocks}) > MAX_BLOCK_DAYS:
+            raise ValueError(f"한 번에 최대 {MAX_BLOCK_DAYS}일까지 차단할 수 있습니다.")
+        return blocks
+
+    def find_conflicts(self, blocks: Iterable[TrainerBlockedTime]) -> List[Reservation]:
+        """차단 시간과 겹치는 대기/확정 예약 (차단 일수와 관계없이 쿼리 1회)"""
+        intervals = defaultdict(list)
+        for block in blocks:
+            intervals[(block.trainer_id, block.date)].append(
+                (to_minutes(block.start_time), end_to_minutes(block.end_time))
+            )
+        if not intervals:
+            return []
+
+        dates_by_trainer = defaultdict(set)
+        for trainer_id, day in intervals:
+            dates_by_trainer[trainer_id].add(day)
+        condition = Q()
+        for trainer_id, dates in dates_by_trainer.items():
+            condition |= Q(trainer_id=trainer_id, date__in=sorted(dates))
+
+        candidates = Reservation.objects.filter(
+            condition,
+            reservation_status__in=ACTIVE_RESERVATION_STATUSES
+        ).select_related('member', 'trainer').order_by('date', 'start_time')
+
+        # 같은 날짜의 차단 구간은 병합해 이진 탐색으로 겹침 판정
+        indexes = {key: IntervalIndex(value) for key, value in intervals.items()}
+        return [
+            reservation for reservation in candidates
+            if indexes[(reservation.trainer_id, reservation.date)].overlaps(
+                to_minutes(reservation.start_time), end_to_minutes(reservation.end_time)
+            )
+        ]
+
+    def group_by_member(self, reservations: Sequence[Reservation]) -> List[Dict[str, Any]]:
+        """충돌 예약을 회원별로 묶음"""
+        members = {}
+        for reservation in reservations:
+            entry = members.setdefault(reservation.member_id, {
+                'member_id': reservation.member_id,
+                'member_name': reservation.member.name,
+                'reservations': [],
+            })
+            entry['reservations'].append({
+                'id': reservation.id,
+                'date': reservation.date,
+                'start_time': reservation.start_time,
+                'end_time': reservation.end_time,
+                'status': reservation.reservation_status,
+            })
+        return list(members.values())
+
+    def analyze(self, blocks: Sequence[TrainerBlockedTime]) -> Dict[str, Any]:
+        """차단 시 영향받는 예약 분석"""
+        conflicts = self.find_conflicts(blocks)
+        return {
+            'conflict_count': len(conflicts),
+            'members': self.group_by_member(conflicts),
+        }
+
+    def block(
+        self,
+        trainer: Trainer,
+        blocks: Sequence[TrainerBlockedTime],
+        cancel_conflicts: bool = False,
+        reason: str = ''
+    ) -> Dict[str, Any]:
+        """차단 시간 일괄 생성 + 충돌 예약 분석 (선택적으로 일괄 취소)
+
+        차단할 날짜의 트레이너-날짜 잠금을 먼저 잡아 분석과 생성 사이에 예약이 끼어들지 않게 하고,
+        차단 시간은 bulk_create 1회로 저장한다. 충돌 예약 취소는 일괄 상태 변경으로 처리해
+        알림도 커밋 시 한 번에 전송한다.
+        """
+        dates = {block.date for block in blocks}
+        if not dates:
+            raise ValueError("차단할 날짜가 없습니다.")
+
+        with transaction.atomic():
+            lock_trainer_days(trainer.id, dates)
+            created = TrainerBlockedTime.objects.bulk_create(blocks)
+            # bulk_create 는 시그널을 보내지 않으므로 점유 비트 직접 갱신
+            refresh_blocked(trainer.id, dates)
+
+            conflicts = self.find_conflicts(created)
+            result = {
+                'created': len(created),
+                'blocked_time_ids': [block.id for block in created],
+                'conflict_count': len(conflicts),
+                'members': self.group_by_member(conflicts),
+                'cancelled': 0,
+            }
+
+            if cancel_conflicts and conflicts:
+                conflict_map = {reservation.id: reservation for reservation in conflicts}
+                conflict_ids = list(conflict_map)
+                cancelled_pending = []
+                for offset in range(0, len(conflict_ids), MAX_BULK_TRANSITION):
+                    # 트레이너 사정으로 취소된 예약은 회원에게 알림
+                    outcome = reservation_service.bulk_transition(
+                        conflict_ids[offset:offset + MAX_BULK_TRANSITION],
+                        'cancelled',
+                        changed_by=trainer.name,
+                        reason=reason or '트레이너 일정 차단'
+                    )
+                    result['cancelled'] += outcome['updated']
+                    # 분석 후 상태가 바뀌었을 수 있으므로 실제로 취소된 예약의 취소 전 상태로 판단
+                    cancelled_pending += [
+                        conflict_map[row['id']]
+                        for row in outcome['results']
+                        if row['result'] == 'updated' and row['previous_status'] == 'pending'
+                    ]
+
+                # 일괄 취소는 확정 예약만 회원에게 알리므로 대기 예약 회원에게도 알림 (커밋 시 함께 전송)
+                notification_service.send_reservation_notifications('reservation_cancelled', [
+                    (reservation, 'member', reservation.member_id) for reservation in cancelled_pending
+                ])
+
+        return result
+
+    def _parse_date(self, value) -> date:
+        return value if isinstance(value, date) else datetime.strptime(value, '%Y-%m-%d').date()
+
+    def _parse_time(self, value) -> Optional[time]:
+        if not value:
+            return None
+        return value if isinstance(value, time) else datetime.strptime(value, '%H:%M').time()
+
+
+# 싱글톤 인스턴스
+blocked_time_service = TrainerBlockedTimeService()
@@ -4,6 +4,7 @@ from .views import (
     TrainerViewSet,
     TrainerIncentiveViewSet,
     TrainerScheduleViewSet,
+    TrainerScheduleOverrideViewSet,
     TrainerBlockedTimeViewSet
 )
 
@@ -13,6 +14,7 @@ router = DefaultRouter()
 router.register(r'trainers', TrainerViewSet)
 router.register(r'incentives', TrainerIncentiveViewSet)
 router.register(r'schedules', TrainerScheduleViewSet)
+router.register(r'schedule-overrides', TrainerScheduleOverrideViewSet)
 router.register(r'blocked-times', TrainerBlockedTimeViewSet)
 
 urlpatterns = [
@@ -1,14 +1,17 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
+from django.urls import reverse
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Sum, Avg
+from django.db.models import Count, Q
 from datetime import date, timedelta
-from .models import Trainer, TrainerIncentive, TrainerSchedule, TrainerBlockedTime
+from .models import Trainer, TrainerIncentive, TrainerSchedule, TrainerScheduleOverride, TrainerBlockedTime
 from .serializers import (
     TrainerSerializer,
     TrainerIncentiveSerializer,
     TrainerScheduleSerializer,
+    TrainerScheduleOverrideSerializer,
     TrainerBlockedTimeSerializer,
     TrainerDetailSerializer,
     TrainerScheduleDetailSerializer
@@ -19,6 +22,29 @@ from .permissions import (
     TrainerSchedulePermission,
     TrainerBlockedTimePermission
 )
+from apps.reservations.availability import DEFAULT_SLOT_MINUTES
+from apps.reservations.services import reservation_service
+from apps.reservations.inbox import pending_inbox_service, PendingInboxPagination
+from apps.reservations.serializers import ReservationSerializer
+from .services import blocked_time_service
+from apps.reservations.ics import ICSRenderer, feed_token, rotate_feed_token, trainer_calendar_response
+from clamood_gym.stats import StatsQuery, count, total, average, breakdown
+
+# 통계 액션 지표 (각각 aggregate() 1회)
+TRAINER_STATS = StatsQuery(
+    total_trainers=count(),
+    active_trainers=count(Q(employment_status='active')),
+    gender_distribution=breakdown('gender'),
+    average_salary=average('base_salary'),
+    total_salary=total('base_salary'),
+)
+TRAINER_INCENTIVE_STATS = StatsQuery(
+    total_incentives=count(),
+    active_incentives=count(Q(is_active=True)),
+    incentive_types=breakdown('incentive_type'),
+    average_fixed_amount=average('fixed_amount', Q(incentive_type='fixed')),
+    average_percentage_rate=average('percentage_rate', Q(incentive_type='percentage')),
+)
 
 class TrainerViewSet(viewsets.ModelViewSet):
     """트레이너 API 뷰셋"""
@@ -50,14 +76,9 @@ class TrainerViewSet(viewsets.ModelViewSet):
         """트레이너 통계 정보"""
         queryset = self.get_queryset()
         
-        stats = {
-            'total_trainers': queryset.count(),
-            'active_trainers': queryset.filter(employment_status='active').count(),
-            'gender_distribution': queryset.values('gender').annotate(count=Count('id')),
-            'experience_distribution': queryset.values('experience_years').annotate(count=Count('id')),
-            'average_salary': queryset.aggregate(avg_salary=Avg('base_salary'))['avg_salary'] or 0,
-            'total_salary': queryset.aggregate(total_salary=Sum('base_salary'))['total_salary'] or 0,
-        }
+        stats = TRAINER_STATS.collect(queryset)
+        # 경력 연수는 값 범위가 정해져 있지 않아 GROUP BY 로 따로 조회
+        stats['experience_distribution'] = queryset.order_by().values('experience_years').annotate(count=Count('id'))
         
         return Response(stats)
     
@@ -79,35 +100,77 @@ class TrainerViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def availability(self, request, pk=None):
-        """트레이너 가용 시간 조회"""
-        trainer = self.get_object()
-        target_date = request.query_params.get('date', date.today())
-        
-        # 해당 날짜의 요일
-        if isinstance(target_date, str):
-            target_date = date.fromisoformat(target_date)
+        """트레이너 가용 시간 조회 (슬롯 그리드)
         
-        day_of_week = target_date.weekday()
+        ?date=YYYY-MM-DD 또는 ?start=YYYY-MM-DD&end=YYYY-MM-DD, ?slot=분
+        """
+        trainer = self.get_object()
+        params = request.query_params
         
-        # 해당 요일의 일정
         try:
-            schedule = trainer.trainerschedule_set.get(day_of_week=day_of_week)
-        except TrainerSchedule.DoesNotExist:
-            return Response({'available': False, 'message': '해당 요일에는 일정이 없습니다.'})
-        
-        # 해당 날짜의 차단 시간
-        blocked_times = trainer.trainerblockedtime_set.filter(date=target_date)
+            start_date = date.fromisoformat(
+                params.get('start') or params.get('date') or date.today().isoformat()
+            )
+            end_date = date.fromisoformat(params['end']) if params.get('end') else start_date
+            slot_minutes = int(params.get('slot', DEFAULT_SLOT_MINUTES))
+            grid = reservation_service.get_trainer_slot_grid(
+                trainer, start_date, end_date, slot_minutes
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         availability = {
-            'date': target_date,
-            'day_of_week': day_of_week,
-            'schedule': TrainerScheduleSerializer(schedule).data,
-            'blocked_times': TrainerBlockedTimeSerializer(blocked_times, many=True).data,
-            'available': schedule.is_available and not blocked_times.exists()
+            'trainer_id': trainer.id,
+            'start': start_date,
+            'end': end_date,
+            'slot_minutes': slot_minutes,
+            'available': any(day['available_count'] > 0 for day in grid),
+            'days': grid,
         }
         
+        # 단일 날짜 조회 시 기존 응답 형식(요일 일정, 차단 시간) 유지
+        if start_date == end_date:
+            day_of_week = start_date.weekday()
+            schedule = trainer.trainerschedule_set.filter(day_of_week=day_of_week).order_by('start_time').first()
+            blocked_times = trainer.trainerblockedtime_set.filter(date=start_date)
+            availability['date'] = start_date
+            availability['day_of_week'] = day_of_week
+            availability['schedule'] = TrainerScheduleSerializer(schedule).data if schedule else None
+            availability['blocked_times'] = TrainerBlockedTimeSerializer(blocked_times, many=True).data
+            availability['slots'] = grid[0]['slots']
+            if schedule is None:
+                availability['message'] = '해당 요일에는 일정이 없습니다.'
+        
         return Response(availability)
 
+    @action(detail=True, methods=['get'])
+    def inbox(self, request, pk=None):
+        """트레이너 대기 요청함 (접수 순, ?cursor=&page_size= 커서 페이지네이션)"""
+        trainer = self.get_object()
+        paginator = PendingInboxPagination()
+        page = paginator.paginate_queryset(pending_inbox_service.queryset(trainer.id), request)
+        serializer = ReservationSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['get'], url_path='inbox/count')
+    def inbox_count(self, request, pk=None):
+        """트레이너 대기 요청 수 (배지 표시용)"""
+        trainer = self.get_object()
+        return Response({'trainer_id': trainer.id, 'pending_count': pending_inbox_service.count(trainer.id)})
+    
+    @action(detail=True, methods=['get'], renderer_classes=[JSONRenderer, ICSRenderer])
+    def calendar(self, request, pk=None):
+        """트레이너 예약 캘린더 (ICS, If-None-Match 지원)"""
+        return trainer_calendar_response(request, self.get_object())
+    
+    @action(detail=True, methods=['get', 'post'], url_path='calendar-link')
+    def calendar_link(self, request, pk=None):
+        """트레이너 캘린더 구독 URL (로그인 없이 캘린더 앱에서 구독, POST 는 재발급 후 이전 URL 무효화)"""
+        trainer = self.get_object()
+        token = rotate_feed_token('trainer', trainer) if request.method == 'POST' else feed_token('trainer', trainer)
+        url = reverse('reservations:calendar-feed', args=[token])
+        return Response({'url': request.build_absolute_uri(url)})
+
 class TrainerIncentiveViewSet(viewsets.ModelViewSet):
     """트레이너 인센티브 API 뷰셋"""
     queryset = TrainerIncentive.objects.all()
@@ -130,19 +193,7 @@ class TrainerIncentiveViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """인센티브 통계 정보"""
-        queryset = self.get_queryset()
-        
-        stats = {
-            'total_incentives': queryset.count(),
-            'active_incentives': queryset.filter(is_active=True).count(),
-            'incentive_types': queryset.values('incentive_type').annotate(count=Count('id')),
-            'average_fixed_amount': queryset.filter(incentive_type='fixed').aggregate(
-                avg_amount=Avg('fixed_amount')
-            )['avg_amount'] or 0,
-            'average_percentage_rate': queryset.filter(incentive_type='percentage').aggregate(
-                avg_rate=Avg('percentage_rate')
-            )['avg_rate'] or 0,
-        }
+        stats = TRAINER_INCENTIVE_STATS.collect(self.get_queryset())
         
         return Response(stats)
 
@@ -155,7 +206,7 @@ class TrainerScheduleViewSet(viewsets.ModelViewSet):
     filterset_fields = ['day_of_week', 'is_available', 'trainer']
     search_fields = ['trainer__name']
     ordering_fields = ['day_of_week', 'start_time', 'end_time']
-    ordering = ['trainer__name', 'day_of_week']
+    ordering = ['trainer__name', 'day_of_week', 'start_time']
     
     def get_queryset(self):
         """사용자 권한에 따른 쿼리셋 필터링"""
@@ -190,6 +241,33 @@ class TrainerScheduleViewSet(viewsets.ModelViewSet):
         
         return Response(weekly_schedule)
 
+class TrainerScheduleOverrideViewSet(viewsets.ModelViewSet):
+    """트레이너 예외 일정 API 뷰셋"""
+    queryset = TrainerScheduleOverride.objects.all()
+    serializer_class = TrainerScheduleOverrideSerializer
+    permission_classes = [TrainerSchedulePermission]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filterset_fields = ['trainer', 'date', 'is_available']
+    search_fields = ['trainer__name', 'reason']
+    ordering_fields = ['date', 'start_time', 'end_time']
+    ordering = ['date', 'start_time']
+    
+    def get_queryset(self):
+        """사용자 권한에 따른 쿼리셋 필터링"""
+        user = self.request.user
+        if user.admin_type == 'headquarters':
+            return TrainerScheduleOverride.objects.all()
+        else:
+            return TrainerScheduleOverride.objects.filter(trainer__branch=user.branch)
+    
+    @action(detail=False, methods=['get'])
+    def upcoming(self, request):
+        """다가오는 예외 일정 조회"""
+        today = date.today()
+        upcoming_overrides = self.get_queryset().filter(date__gte=today).order_by('date', 'start_time')
+        serializer = self.get_serializer(upcoming_overrides, many=True)
+        return Response(serializer.data)
+
 class TrainerBlockedTimeViewSet(viewsets.ModelViewSet):
     """트레이너 차단 시간 API 뷰셋"""
     queryset = TrainerBlockedTime.objects.all()
@@ -209,6 +287,63 @@ class TrainerBlockedTimeViewSet(viewsets.ModelViewSet):
         else:
             return TrainerBlockedTime.objects.filter(trainer__branch=user.branch)
     
+    def create(self, request, *args, **kwargs):
+        """차단 시간 생성 (겹치는 예약 분석, cancel_conflicts=true 면 일괄 취소)"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        try:
+            result = blocked_time_service.block(
+                trainer=data['trainer'],
+                blocks=[TrainerBlockedTime(**data)],
+                cancel_conflicts=self._flag(request.data.get('cancel_conflicts')),
+                reason=data.get('reason', '')
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        blocked_time = TrainerBlockedTime.objects.get(id=result['blocked_time_ids'][0])
+        response = dict(self.get_serializer(blocked_time).data)
+        response['conflicts'] = {
+            'conflict_count': result['conflict_count'],
+            'members': result['members'],
+            'cancelled': result['cancelled'],
+        }
+        return Response(response, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['post'])
+    def impact(self, request):
+        """차단 예정 기간과 겹치는 예약 분석 (저장하지 않음)"""
+        try:
+            trainer = self._get_trainer(request)
+            blocks = blocked_time_service.expand_ranges(trainer, self._ranges(request))
+        except (Trainer.DoesNotExist, ValueError) as e:
+            return Response({'error': self._error_message(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        result = blocked_time_service.analyze(blocks)
+        result['trainer_id'] = trainer.id
+        result['blocked_days'] = len({block.date for block in blocks})
+        return Response(result)
+    
+    @action(detail=False, methods=['post'], url_path='bulk-block')
+    def bulk_block(self, request):
+        """기간 일괄 차단 (휴가 등)"""
+        try:
+            trainer = self._get_trainer(request)
+            blocks = blocked_time_service.expand_ranges(trainer, self._ranges(request))
+            result = blocked_time_service.block(
+                trainer=trainer,
+                blocks=blocks,
+                cancel_conflicts=self._flag(request.data.get('cancel_conflicts')),
+                reason=request.data.get('reason', '')
+            )
+        except (Trainer.DoesNotExist, ValueError) as e:
+            return Response({'error': self._error_message(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        result['trainer_id'] = trainer.id
+        return Response(result, status=status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """다가오는 차단 시간 조회"""
@@ -216,3 +351,30 @@ class TrainerBlockedTimeViewSet(viewsets.ModelViewSet):
         upcoming_blocked = self.get_queryset().filter(date__gte=today).order_by('date', 'start_time')
         serializer = self.get_serializer(upcoming_blocked, many=True)
         return Response(serializer.data)
+    
+    def _get_trainer(self, request):
+        """요청한 트레이너 (지점 어드민은 본인 지점 트레이너만)"""
+        trainers = Trainer.objects.all()
+        if request.user.admin_type != 'headquarters':
+            trainers = trainers.filter(branch=request.user.branch)
+        try:
+            return trainers.get(id=int(request.data.get('trainer')))
+        except (TypeError, ValueError):
+            raise Trainer.DoesNotExist
+    
+    def _ranges(self, request):
+        """차단 기간 목록 (ranges 가 없으면 본문 자체를 기간 1개로 사용)"""
+        ranges = request.data.get('ranges')
+        if ranges is None:
+            return [request.data]
+        if not isinstance(ranges, list):
+            raise ValueError("ranges 는 차단 기간 목록이어야 합니다.")
+        return ranges
+    
+    def _flag(self, value):
+        return value in (True, 'true', 'True', '1', 1)
+    
+    def _error_message(self, error):
+        if isinstance(error, Trainer.DoesNotExist):
+            return '트레이너를 찾을 수 없습니다.'
+        return str(error)
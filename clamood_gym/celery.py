@@ -76,6 +76,42 @@ app.conf.beat_schedule = {
         'schedule': 604800.0,  # 7일
     },
     
+    # 매일 새벽 3시에 트레이너 점유 비트마스크 재생성
+    'rebuild-trainer-occupancy': {
+        'task': 'apps.notifications.tasks.rebuild_trainer_occupancy',
+        'schedule': 86400.0,  # 24시간
+    },
+    
+    # 매일 새벽 지점 일별 통계 재집계
+    'reconcile-daily-branch-stats': {
+        'task': 'apps.notifications.tasks.reconcile_daily_branch_stats',
+        'schedule': 86400.0,  # 24시간
+    },
+    
+    # 매일 지점 당일 예약 보드 생성
+    'build-today-boards': {
+        'task': 'apps.notifications.tasks.build_today_boards',
+        'schedule': 86400.0,  # 24시간
+    },
+    
+    # 매시간 응답 기한이 지난 대기 예약 요청 만료
+    'expire-stale-pending-reservations': {
+        'task': 'apps.notifications.tasks.expire_stale_pending_reservations',
+        'schedule': 3600.0,  # 1시간
+    },
+    
+    # 매시간 만료된 멱등성 키 정리
+    'cleanup-expired-idempotency-keys': {
+        'task': 'apps.notifications.tasks.cleanup_expired_idempotency_keys',
+        'schedule': 3600.0,  # 1시간
+    },
+    
+    # 매분 아웃박스에 보관된 알림 태스크 처리
+    'flush-notification-outbox': {
+        'task': 'apps.notifications.tasks.flush_notification_outbox',
+        'schedule': 60.0,  # 1분
+    },
+    
     # 매시간 실패한 알림 재전송
     'retry-failed-notifications': {
         'task': 'apps.notifications.tasks.retry_failed_notifications',
@@ -0,0 +1,126 @@
+from django import forms
+from django.contrib import messages
+from django.http import HttpResponseRedirect
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+class StaleObjectError(ValueError):
+    """다른 요청이 먼저 수정한 행을 저장하려 할 때 발생하는 오류"""
+
+    def __init__(self, instance):
+        super().__init__("다른 사용자가 먼저 수정했습니다. 최신 정보를 확인한 뒤 다시 시도하세요.")
+        self.instance = instance
+
+    def current(self):
+        """데이터베이스의 현재 행 (삭제되었으면 None)"""
+        model = type(self.instance)
+        return model._default_manager.filter(pk=self.instance.pk).first()
+
+
+class OptimisticLockMixin:
+    """version 컬럼 기반 낙관적 동시성 제어 모델 믹스인
+
+    기존 행 저장 시 UPDATE 에 `WHERE version = 읽은 버전` 조건을 붙이고 버전을 1 올린다.
+    읽은 뒤 다른 요청이 먼저 저장했다면 0행이 갱신되므로 덮어쓰지 않고 StaleObjectError 를 발생시킨다.
+    update_fields 로 일부 필드만 저장해도 버전은 항상 함께 올라간다.
+    모델에 `version = models.PositiveIntegerField(default=1)` 필드가 있어야 한다.
+    """
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        version_field = self._meta.get_field('version')
+        expected = self.version
+        values = [value for value in values if value[0] is not version_field]
+        values.append((version_field, None, expected + 1))
+
+        updated = super()._do_update(
+            base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update
+        )
+        if updated:
+            self.version = expected + 1
+        elif base_qs.filter(pk=pk_val).exists():
+            raise StaleObjectError(self)
+        return updated
+
+    def check_version(self, expected: int):
+        """클라이언트가 보낸 버전이 현재 버전과 다르면 StaleObjectError"""
+        if expected != self.version:
+            raise StaleObjectError(self)
+
+
+class VersionedViewSetMixin:
+    """낙관적 동시성 제어 뷰셋 믹스인
+
+    수정 요청의 If-Match 헤더 또는 본문 version 값을 현재 버전과 비교하고,
+    충돌하면 409 와 함께 현재 상태를 반환한다. 버전을 보내지 않으면 조회 시점의 버전으로 검사한다.
+    """
+
+    def expected_version(self):
+        """요청이 기대하는 버전 (If-Match 우선, 없으면 None)"""
+        if_match = self.request.headers.get('If-Match')
+        expected = if_match.strip().removeprefix('W/').strip('"') if if_match else self.request.data.get('version')
+        if expected in (None, ''):
+            return None
+        try:
+            return int(expected)
+        except (TypeError, ValueError):
+            raise ValidationError({'version': '버전 값이 올바르지 않습니다.'})
+
+    def get_versioned_object(self):
+        """기대 버전을 검사한 객체 조회"""
+        instance = self.get_object()
+        expected = self.expected_version()
+        if expected is not None:
+            instance.check_version(expected)
+        return instance
+
+    def perform_update(self, serializer):
+        expected = self.expected_version()
+        if expected is not None:
+            serializer.instance.check_version(expected)
+        serializer.save()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, StaleObjectError):
+            current = exc.current()
+            if current is None:
+                return Response({'error': '이미 삭제된 항목입니다.'}, status=status.HTTP_404_NOT_FOUND)
+            return Response(
+                {'error': str(exc), 'current': self.get_serializer(current).data},
+                status=status.HTTP_409_CONFLICT,
+                headers={'ETag': f'"{current.version}"'}
+            )
+        return super().handle_exception(exc)
+
+
+class VersionedAdminForm(forms.ModelForm):
+    """관리자 수정 폼 (폼을 연 시점의 버전을 숨은 필드로 보내 충돌 검사)"""
+    version = forms.IntegerField(widget=forms.HiddenInput, required=False)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        version = cleaned_data.get('version')
+        if self.instance.pk is None:
+            cleaned_data['version'] = self.instance.version
+        elif version is None or version != self.instance.version:
+            raise forms.ValidationError(
+                "다른 사용자가 먼저 수정했습니다. 페이지를 새로 고친 뒤 다시 저장하세요."
+            )
+        return cleaned_data
+
+
+class VersionedAdminMixin:
+    """낙관적 동시성 제어 관리자 믹스인
+
+    폼 검사 뒤 저장 전에 다른 요청이 먼저 저장해 StaleObjectError 가 나면
+    저장을 롤백하고 오류 메시지와 함께 수정 화면으로 되돌린다.
+    """
+    form = VersionedAdminForm
+
+    def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
+        try:
+            return super().changeform_view(request, object_id, form_url, extra_context)
+        except StaleObjectError as exc:
+            self.message_user(request, str(exc), level=messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
@@ -57,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.reservations.middleware.ChangeLogBufferMiddleware',
 ]
 
 ROOT_URLCONF = 'clamood_gym.urls'
@@ -177,6 +178,21 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# Cache settings
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.redis.RedisCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://localhost:6379/1'),
+        'KEY_PREFIX': 'clamood',
+    }
+}
+
+# Dashboard cache settings
+DASHBOARD_CACHE_ENABLED = os.environ.get('DASHBOARD_CACHE_ENABLED', 'True').lower() == 'true'
+DASHBOARD_CACHE_FRESH_SECONDS = int(os.environ.get('DASHBOARD_CACHE_FRESH_SECONDS', 60))
+DASHBOARD_CACHE_STALE_SECONDS = int(os.environ.get('DASHBOARD_CACHE_STALE_SECONDS', 600))
+DASHBOARD_CACHE_LOCK_SECONDS = int(os.environ.get('DASHBOARD_CACHE_LOCK_SECONDS', 30))
+
 # Celery settings
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
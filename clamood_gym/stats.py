@@ -0,0 +1,129 @@
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from django.db.models import Avg, Count, Q, Subquery, Sum, OuterRef, Value
+from django.db.models.functions import Coalesce
+
+
+class Stat:
+    """집계 지표 1개 (집계식 1개로 컴파일되어 aggregate() 에 합쳐짐)"""
+
+    def __init__(self, expression, default: Any = 0):
+        self.expression = expression
+        self.default = default
+
+    def compile(self, name: str, model) -> Dict[str, Any]:
+        return {name: self.expression}
+
+    def result(self, name: str, values: Dict[str, Any], model) -> Any:
+        value = values[name]
+        return self.default if value is None else value
+
+
+class Breakdown(Stat):
+    """값별 건수 목록 (values().annotate(count=...) 결과와 같은 형식)
+
+    값 목록을 주지 않으면 필드 choices 를 사용하고, 빈 값을 허용하는 필드는 ''/None 도 센다.
+    값 목록을 {조회 값: 표시 값} 딕셔너리로 주면 결과에는 표시 값을 쓴다.
+    값마다 조건부 COUNT 1개로 컴파일되므로 GROUP BY 조회를 따로 하지 않는다.
+    건수가 0 인 값은 GROUP BY 결과처럼 목록에서 뺀다.
+    """
+
+    def __init__(self, field: str, values: Union[Iterable[Any], Dict[Any, Any], None] = None,
+                 filter: Optional[Q] = None, distinct: bool = False, label: Optional[str] = None):
+        super().__init__(None, default=[])
+        self.field = field
+        if values is None or isinstance(values, dict):
+            self.values = values
+        else:
+            self.values = {value: value for value in values}
+        self.filter = filter
+        self.distinct = distinct
+        self.label = label or field
+
+    def _values(self, model) -> Dict[Any, Any]:
+        if self.values is not None:
+            return self.values
+        field = model._meta.get_field(self.field)
+        values = {value: value for value, _ in field.choices}
+        if field.blank and '' not in values and field.get_internal_type() == 'CharField':
+            values[''] = ''
+        if field.null:
+            values[None] = None
+        return values
+
+    def compile(self, name: str, model) -> Dict[str, Any]:
+        aggregates = {}
+        for index, value in enumerate(self._values(model)):
+            condition = Q(**{self.field: value})
+            if self.filter is not None:
+                condition &= self.filter
+            aggregates[f'{name}__{index}'] = Count('pk', filter=condition, distinct=self.distinct)
+        return aggregates
+
+    def result(self, name: str, values: Dict[str, Any], model) -> List[Dict[str, Any]]:
+        rows = []
+        for index, label in enumerate(self._values(model).values()):
+            count = values[f'{name}__{index}']
+            if count:
+                rows.append({self.label: label, 'count': count})
+        return rows
+
+
+def count(filter: Optional[Q] = None, distinct: bool = False) -> Stat:
+    """조건에 맞는 행 수"""
+    return Stat(Count('pk', filter=filter, distinct=distinct))
+
+
+def total(field: str, filter: Optional[Q] = None) -> Stat:
+    """조건에 맞는 행의 합계 (없으면 0)"""
+    return Stat(Sum(field, filter=filter))
+
+
+def average(field: str, filter: Optional[Q] = None) -> Stat:
+    """조건에 맞는 행의 평균 (없으면 0)"""
+    return Stat(Avg(field, filter=filter))
+
+
+def breakdown(field: str, values: Union[Iterable[Any], Dict[Any, Any], None] = None, **kwargs) -> Breakdown:
+    """값별 건수 목록"""
+    return Breakdown(field, values, **kwargs)
+
+
+def related_stat(queryset, link: str, aggregate, outer: str = 'pk', default: Any = 0):
+    """바깥 행에 연결된 행의 집계 스칼라 서브쿼리 (annotate 용)
+
+    queryset 의 link 필드가 바깥 행의 outer 필드와 같은 행을 집계한다.
+    예: related_stat(Member.objects.all(), 'branch', Count('pk'))
+    연결 행끼리 JOIN 하지 않으므로 여러 연관 테이블을 한 번에 세어도 행이 곱해지지 않는다.
+    """
+    subquery = queryset.filter(**{link: OuterRef(outer)}).order_by().values(link).annotate(
+        value=aggregate
+    ).values('value')
+    output_field = subquery.query.annotations['value'].output_field
+    return Coalesce(Subquery(subquery), Value(default), output_field=output_field)
+
+
+class StatsQuery:
+    """선언한 지표를 aggregate() 1회로 계산하는 통계 쿼리
+
+        MEMBER_STATS = StatsQuery(
+            total_members=count(),
+            active_members=count(Q(membership_status='active')),
+            gender_distribution=breakdown('gender'),
+        )
+        MEMBER_STATS.collect(queryset)  # 쿼리 1회
+
+    지표마다 COUNT/SUM/AVG(... FILTER (WHERE ...)) 식 하나로 컴파일되어 같은 행을 한 번만 읽는다.
+    """
+
+    def __init__(self, **stats: Stat):
+        self.stats = stats
+
+    def collect(self, queryset, **extra: Stat) -> Dict[str, Any]:
+        """queryset 에 대한 지표 값 (요청마다 달라지는 지표는 extra 로 추가)"""
+        stats = {**self.stats, **extra}
+        aggregates = {}
+        for name, stat in stats.items():
+            aggregates.update(stat.compile(name, queryset.model))
+        values = queryset.order_by().aggregate(**aggregates)
+        return {name: stat.result(name, values, queryset.model) for name, stat in stats.items()}
@@ -0,0 +1,86 @@
+import itertools
+import threading
+import weakref
+from typing import Any, Callable, List, Optional, Tuple
+
+from django.db import transaction
+
+
+class _CommitCallback:
+    """세이브포인트 버퍼 1개의 커밋 콜백
+
+    세이브포인트나 트랜잭션이 롤백되면 Django 가 등록된 콜백을 버리므로,
+    버퍼 목록에서는 약한 참조로만 들고 있어 참조가 끊기면 롤백된 것으로 본다.
+    """
+
+    __slots__ = ('owner', 'items', '__weakref__')
+
+    def __init__(self, owner: 'SavepointBuffers'):
+        self.owner = owner
+        self.items = []
+
+    def __call__(self):
+        self.owner._commit(self)
+
+
+class SavepointBuffers:
+    """세이브포인트 단위 커밋 대기 버퍼 (스레드별)
+
+    현재 세이브포인트(없으면 트랜잭션)마다 버퍼를 따로 두고, 버퍼를 처음 만들 때
+    그 세이브포인트 안에서 transaction.on_commit 으로 콜백을 등록한다.
+    롤백된 세이브포인트의 항목은 콜백과 함께 버려지고, 트랜잭션이 커밋되면
+    살아남은 항목 전체를 추가한 순서대로 committed(items) 로 한 번 넘긴다.
+    """
+
+    def __init__(self, committed: Callable[[List[Any]], None]):
+        self._committed = committed
+        self._sequence = itertools.count()
+        self._local = threading.local()
+
+    def add(self, item: Any, using: Optional[str] = None):
+        """현재 세이브포인트 버퍼에 항목 추가 (트랜잭션 안에서만 호출)"""
+        connection = transaction.get_connection(using)
+        key = self._key(connection)
+        pending = self._live_callbacks()
+        callback = next((callback for callback_key, callback in pending if callback_key == key), None)
+        if callback is None:
+            callback = _CommitCallback(self)
+            transaction.on_commit(callback, using=using)
+            self._local.pending.append((key, weakref.ref(callback)))
+        callback.items.append((next(self._sequence), item))
+
+    def _live_callbacks(self) -> List[Tuple[Any, _CommitCallback]]:
+        """아직 실행되지 않았고 롤백되지도 않은 콜백 목록 (롤백된 콜백은 정리)"""
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = []
+        live = [(key, ref) for key, ref in pending if ref() is not None]
+        pending[:] = live
+        return [(key, ref()) for key, ref in live]
+
+    def _key(self, connection) -> Tuple[object, Optional[str]]:
+        """(가장 바깥 atomic 블록, 가장 안쪽 세이브포인트 ID)
+
+        savepoint=False 인 블록은 롤백 시 바깥 세이브포인트까지 롤백되므로 바깥 세이브포인트로 묶는다.
+        """
+        savepoint_id = next((sid for sid in reversed(connection.savepoint_ids) if sid is not None), None)
+        return connection.atomic_blocks[0], savepoint_id
+
+    def _commit(self, callback: _CommitCallback):
+        """커밋된 버퍼를 모았다가 이 트랜잭션의 마지막 콜백에서 한 번에 전달"""
+        committed = getattr(self._local, 'committed', None)
+        if committed is None:
+            committed = self._local.committed = []
+        committed.extend(callback.items)
+        callback.items = []
+
+        self._local.pending = [
+            (key, ref) for key, ref in self._local.pending if ref() is not None and ref() is not callback
+        ]
+        if self._local.pending:
+            # 같은 트랜잭션에서 커밋된 다른 세이브포인트의 콜백이 뒤에 남아 있음
+            return
+
+        self._local.committed = []
+        committed.sort(key=lambda entry: entry[0])
+        self._committed([item for _, item in committed])